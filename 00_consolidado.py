@@ -0,0 +1,65 @@
+"""
+00_consolidado.py
+Extração combinada: uma única consulta ao Insights (nível campanha, diária)
+alimenta campanhas.csv, cpv_diario.csv e funil.csv — substitui as três
+consultas separadas de 01, 02 e 06.
+
+Gera: campanhas.csv, cpv_diario.csv, funil.csv (mesmas colunas de 01/02/06)
+
+O CPV de hoje (CPV_HOJE) vem da mesma consulta à parte do 02_cpv_diario.py.
+
+Nota: o alcance do funil é a soma do alcance diário por campanha e, por não
+      ser aditivo, fica acima do alcance único que 06_funil.py retorna.
+"""
+
+import importlib
+
+from insights import buscar_paginas
+
+DATE_PRESET = "last_30d"
+
+# União dos campos usados por 01, 02 e 06
+FIELDS = [
+    "campaign_name",
+    "date_start",
+    "spend",
+    "impressions",
+    "reach",
+    "clicks",
+    "ctr",
+    "actions",
+    "cost_per_action_type",
+]
+
+campanhas  = importlib.import_module("01_campanhas")
+cpv_diario = importlib.import_module("02_cpv_diario")
+funil      = importlib.import_module("06_funil")
+
+
+def main():
+    params = {
+        "level": "campaign",
+        "date_preset": DATE_PRESET,
+        "time_increment": 1,          # 1 = breakdown diário
+    }
+
+    print(f"Consultando insights diarios por campanha ({DATE_PRESET})...")
+    # Cada página alimenta os três acumuladores e é descartada em seguida
+    por_campanha, por_dia, totais = {}, {}, {}
+    n = 0
+    for pagina in buscar_paginas(FIELDS, params, consulta="00_consolidado"):
+        campanhas.acumular(por_campanha, pagina)
+        cpv_diario.acumular(por_dia, pagina)
+        funil.acumular(totais, pagina)
+        n += len(pagina)
+    print(f"     {n} linhas campanha x dia recebidas\n")
+
+    cpv_diario.acumular_hoje(por_dia)
+
+    campanhas.salvar(campanhas.finalizar(por_campanha))
+    cpv_diario.salvar(cpv_diario.finalizar(por_dia))
+    funil.salvar(funil.finalizar(totais))
+
+
+if __name__ == "__main__":
+    main()
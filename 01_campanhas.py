@@ -6,35 +6,82 @@ Gera: campanhas.csv
 Colunas: campanha, gasto, impressoes, cliques, ctr, cpv, conversoes
 """
 
-import csv
-from pathlib import Path
-from config import account
+from insights import buscar
+import acoes
+import dados
 
-OUTPUT = Path(__file__).parent / "campanhas.csv"
+OUTPUT = dados.caminho("campanhas.csv")
 DATE_PRESET = "last_30d"
 
 
-def get_action_value(actions, action_type):
-    """Extrai o valor de um tipo de ação da lista retornada pela API."""
-    if not actions:
-        return 0.0
-    for a in actions:
-        if a.get("action_type") == action_type:
-            return float(a.get("value", 0))
-    return 0.0
+def montar_linhas(insights):
+    """
+    Converte as linhas do Insights em linhas do campanhas.csv, somando por
+    campanha. Com uma linha por campanha (período inteiro) usa ctr e CPV da
+    API; com linhas diárias (time_increment=1) recalcula a partir das somas.
+    """
+    return finalizar(acumular({}, insights))
 
 
-def get_cpv(cost_per_action, actions):
+def acumular(por_campanha, insights):
     """
-    Retorna CPV (custo por visualização de vídeo).
-    Usa cost_per_action_type[video_view] se disponível,
-    caso contrário calcula spend / video_views.
+    Soma as linhas (ex.: uma página da API) no acumulador por campanha e o
+    devolve. A memória cresce com o número de campanhas, não de linhas.
     """
-    if cost_per_action:
-        for a in cost_per_action:
-            if a.get("action_type") == "video_view":
-                return float(a.get("value", 0))
-    return 0.0
+    for row in insights:
+        campanha    = row.get("campaign_name", "Desconhecida")
+        actions     = acoes.da_linha(row)
+        cost_per_ac = acoes.da_linha(row, "cost_per_action_type")
+
+        c = por_campanha.setdefault(campanha, {
+            "linhas": 0, "gasto": 0.0, "impressoes": 0, "cliques": 0,
+            "video_views": 0.0, "purchase": 0.0, "lead": 0.0,
+            "complete_registration": 0.0, "ctr": 0.0, "cpv": 0.0,
+        })
+        c["linhas"]      += 1
+        c["gasto"]       += float(row.get("spend", 0))
+        c["impressoes"]  += int(row.get("impressions", 0))
+        c["cliques"]     += int(row.get("clicks", 0))
+        c["video_views"] += actions.get("video_view", 0.0)
+        for tipo in ("purchase", "lead", "complete_registration"):
+            c[tipo] += actions.get(tipo, 0.0)
+        c["ctr"] = float(row.get("ctr", 0))
+        c["cpv"] = cost_per_ac.get("video_view", 0.0)   # CPV da API (usado com 1 linha por campanha)
+    return por_campanha
+
+
+def finalizar(por_campanha):
+    """Linhas do campanhas.csv a partir do acumulador de acumular()."""
+    rows = []
+    for campanha, c in por_campanha.items():
+        if c["linhas"] == 1:
+            ctr, cpv = c["ctr"], c["cpv"]
+        else:
+            ctr = c["cliques"] / c["impressoes"] * 100 if c["impressoes"] else 0.0
+            cpv = c["gasto"] / c["video_views"] if c["video_views"] else 0.0
+        conversoes = int(c["purchase"] or c["lead"] or c["complete_registration"])
+
+        rows.append({
+            "campanha":   campanha,
+            "gasto":      round(c["gasto"], 2),
+            "impressoes": c["impressoes"],
+            "cliques":    c["cliques"],
+            "ctr":        round(ctr, 4),
+            "cpv":        round(cpv, 6),
+            "conversoes": conversoes,
+        })
+    return rows
+
+
+def salvar(rows):
+    if not rows:
+        print("[AVISO] Nenhum dado retornado pela API.")
+        return
+
+    dados.salvar(OUTPUT, rows, list(rows[0].keys()))
+
+    total_gasto = sum(r["gasto"] for r in rows)
+    print(f"[OK] {OUTPUT.name} salvo — {len(rows)} campanhas | Gasto total: R$ {total_gasto:,.2f}")
 
 
 def main():
@@ -54,44 +101,9 @@ def main():
     }
 
     print(f"Consultando insights por campanha ({DATE_PRESET})...")
-    insights = account.get_insights(fields=fields, params=params)
-
-    rows = []
-    for row in insights:
-        campanha    = row.get("campaign_name", "Desconhecida")
-        gasto       = float(row.get("spend", 0))
-        impressoes  = int(row.get("impressions", 0))
-        cliques     = int(row.get("clicks", 0))
-        ctr         = float(row.get("ctr", 0))
-        actions     = row.get("actions", [])
-        cost_per_ac = row.get("cost_per_action_type", [])
-
-        cpv         = get_cpv(cost_per_ac, actions)
-        conversoes  = int(get_action_value(actions, "purchase") or
-                         get_action_value(actions, "lead") or
-                         get_action_value(actions, "complete_registration"))
-
-        rows.append({
-            "campanha":   campanha,
-            "gasto":      round(gasto, 2),
-            "impressoes": impressoes,
-            "cliques":    cliques,
-            "ctr":        round(ctr, 4),
-            "cpv":        round(cpv, 6),
-            "conversoes": conversoes,
-        })
-
-    if not rows:
-        print("[AVISO] Nenhum dado retornado pela API.")
-        return
-
-    with open(OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-        writer.writeheader()
-        writer.writerows(rows)
+    insights = buscar(fields, params, consulta="01_campanhas")
 
-    total_gasto = sum(r["gasto"] for r in rows)
-    print(f"[OK] {OUTPUT.name} salvo — {len(rows)} campanhas | Gasto total: R$ {total_gasto:,.2f}")
+    salvar(montar_linhas(insights))
 
 
 if __name__ == "__main__":
@@ -4,14 +4,32 @@ Extrai a evolução diária do CPV (custo por visualização) nos últimos 30 di
 
 Gera: cpv_diario.csv
 Colunas: data, cpv
+
+A janela (last_30d) não inclui hoje; o dia de hoje vem de uma consulta à
+parte (date_preset "today", uma linha), como no 05_horarios.py — é o que
+deixa a cadência intradiária do 08_agendamento.py com o CPV do dia
+atualizado a cada hora. O CPV de hoje é parcial até o dia fechar.
+
+Variável de ambiente (.env):
+  CPV_HOJE  "0" não busca o CPV de hoje (padrão "1")
 """
 
-import csv
-from pathlib import Path
-from config import account
+import os
 
-OUTPUT = Path(__file__).parent / "cpv_diario.csv"
+from insights import buscar
+import acoes
+import dados
+
+OUTPUT = dados.caminho("cpv_diario.csv")
 DATE_PRESET = "last_30d"
+INCLUIR_HOJE = os.getenv("CPV_HOJE", "1").strip().lower() not in ("0", "false", "nao")
+
+FIELDS = [
+    "date_start",
+    "spend",
+    "actions",
+    "cost_per_action_type",
+]
 
 
 def calcular_cpv(row):
@@ -20,65 +38,92 @@ def calcular_cpv(row):
     Tenta cost_per_action_type[video_view] primeiro; fallback manual.
     """
     # Tentativa 1: campo direto
-    cost_per_ac = row.get("cost_per_action_type", [])
-    if cost_per_ac:
-        for a in cost_per_ac:
-            if a.get("action_type") == "video_view":
-                return float(a.get("value", 0))
+    cost_per_ac = acoes.da_linha(row, "cost_per_action_type")
+    if "video_view" in cost_per_ac:
+        return cost_per_ac["video_view"]
 
     # Tentativa 2: calcular manualmente
     spend = float(row.get("spend", 0))
-    actions = row.get("actions", [])
-    video_views = 0.0
-    for a in actions:
-        if a.get("action_type") == "video_view":
-            video_views = float(a.get("value", 0))
-            break
-
-    if video_views > 0:
-        return spend / video_views
+    views = video_views(row)
+    if views > 0:
+        return spend / views
     return 0.0
 
 
-def main():
-    fields = [
-        "date_start",
-        "spend",
-        "actions",
-        "cost_per_action_type",
-    ]
+def video_views(row):
+    return acoes.da_linha(row).get("video_view", 0.0)
 
-    params = {
-        "level": "account",
-        "date_preset": DATE_PRESET,
-        "time_increment": 1,          # 1 = breakdown diário
-    }
 
-    print(f"Consultando CPV diário ({DATE_PRESET})...")
-    insights = account.get_insights(fields=fields, params=params)
+def montar_linhas(insights):
+    """
+    Converte linhas diárias do Insights em linhas do cpv_diario.csv.
+    Uma linha por dia (level=account) usa calcular_cpv(); várias linhas no
+    mesmo dia (ex.: level=campaign) são somadas e o CPV vira gasto / views.
+    """
+    return finalizar(acumular({}, insights))
 
-    rows = []
+
+def acumular(por_dia, insights):
+    """Soma as linhas (ex.: uma página da API) no acumulador por dia e o devolve."""
     for row in insights:
-        data = row.get("date_start", "")
-        cpv  = calcular_cpv(row)
+        d = por_dia.setdefault(row.get("date_start", ""),
+                               {"linhas": 0, "gasto": 0.0, "views": 0.0, "cpv": 0.0})
+        d["linhas"] += 1
+        d["gasto"]  += float(row.get("spend", 0))
+        d["views"]  += video_views(row)
+        d["cpv"]     = calcular_cpv(row)
+    return por_dia
+
+
+def acumular_hoje(por_dia):
+    """Soma ao acumulador a linha de hoje (date_preset "today"), se CPV_HOJE."""
+    if INCLUIR_HOJE:
+        print("Consultando o CPV de hoje...")
+        params = {"level": "account", "date_preset": "today", "time_increment": 1}
+        acumular(por_dia, buscar(FIELDS, params))
+    return por_dia
+
+
+def finalizar(por_dia):
+    """Linhas do cpv_diario.csv a partir do acumulador de acumular()."""
+    rows = []
+    for data, d in por_dia.items():
+        if d["linhas"] == 1:
+            cpv = d["cpv"]
+        else:
+            cpv = d["gasto"] / d["views"] if d["views"] > 0 else 0.0
 
         if cpv > 0:                   # ignora dias sem impressões de vídeo
             rows.append({"data": data, "cpv": round(cpv, 6)})
 
+    rows.sort(key=lambda r: r["data"])
+    return rows
+
+
+def salvar(rows):
     if not rows:
         print("[AVISO] Nenhum dado de CPV encontrado (verifique se há anúncios de vídeo ativos).")
         return
 
-    rows.sort(key=lambda r: r["data"])
-
-    with open(OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["data", "cpv"])
-        writer.writeheader()
-        writer.writerows(rows)
+    dados.salvar(OUTPUT, rows, ["data", "cpv"])
 
     cpv_medio = sum(r["cpv"] for r in rows) / len(rows)
     print(f"[OK] {OUTPUT.name} salvo — {len(rows)} dias | CPV médio: R$ {cpv_medio:.6f}")
 
 
+def main():
+    params = {
+        "level": "account",
+        "date_preset": DATE_PRESET,
+        "time_increment": 1,          # 1 = breakdown diário
+    }
+
+    print(f"Consultando CPV diário ({DATE_PRESET})...")
+    por_dia = acumular({}, buscar(FIELDS, params, consulta="02_cpv_diario"))
+    acumular_hoje(por_dia)
+
+    salvar(finalizar(por_dia))
+
+
 if __name__ == "__main__":
     main()
@@ -6,11 +6,10 @@ Gera: posicionamentos.csv
 Colunas: posicionamento, gasto, impressoes
 """
 
-import csv
-from pathlib import Path
-from config import account
+from insights import buscar
+import dados
 
-OUTPUT = Path(__file__).parent / "posicionamentos.csv"
+OUTPUT = dados.caminho("posicionamentos.csv")
 DATE_PRESET = "last_30d"
 
 # Mapa de nomes técnicos da API → nomes amigáveis para o dashboard
@@ -46,7 +45,7 @@ def main():
     }
 
     print(f"Consultando distribuição por posicionamento ({DATE_PRESET})...")
-    insights = account.get_insights(fields=fields, params=params)
+    insights = buscar(fields, params, consulta="03_posicionamentos")
 
     # Agrupa por plataforma+posição
     agregado = {}
@@ -70,10 +69,7 @@ def main():
         for k, v in sorted(agregado.items(), key=lambda x: -x[1]["gasto"])
     ]
 
-    with open(OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["posicionamento", "gasto", "impressoes"])
-        writer.writeheader()
-        writer.writerows(rows)
+    dados.salvar(OUTPUT, rows, ["posicionamento", "gasto", "impressoes"])
 
     total = sum(r["gasto"] for r in rows)
     print(f"[OK] {OUTPUT.name} salvo — {len(rows)} posicionamentos | Total: R$ {total:,.2f}")
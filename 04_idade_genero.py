@@ -6,11 +6,10 @@ Gera: idade_genero.csv
 Colunas: idade, genero, gasto
 """
 
-import csv
-from pathlib import Path
-from config import account
+from insights import buscar
+import dados
 
-OUTPUT = Path(__file__).parent / "idade_genero.csv"
+OUTPUT = dados.caminho("idade_genero.csv")
 DATE_PRESET = "last_30d"
 
 # Ordem canônica das faixas etárias para o dashboard
@@ -38,7 +37,7 @@ def main():
     }
 
     print(f"Consultando dados por idade e gênero ({DATE_PRESET})...")
-    insights = account.get_insights(fields=fields, params=params)
+    insights = buscar(fields, params, consulta="04_idade_genero")
 
     # Agrupa por (idade, genero)
     agregado = {}
@@ -75,10 +74,7 @@ def main():
         for k, v in sorted(agregado.items(), key=sort_key)
     ]
 
-    with open(OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["idade", "genero", "gasto", "impressoes", "cliques"])
-        writer.writeheader()
-        writer.writerows(rows)
+    dados.salvar(OUTPUT, rows, ["idade", "genero", "gasto", "impressoes", "cliques"])
 
     total = sum(r["gasto"] for r in rows)
     print(f"[OK] {OUTPUT.name} salvo — {len(rows)} segmentos | Total: R$ {total:,.2f}")
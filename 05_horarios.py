@@ -1,32 +1,107 @@
 """
 05_horarios.py
-Extrai performance (cliques, impressões, gasto) por hora do dia.
-
-Gera: horarios.csv
-Colunas: hora, cliques, impressoes, gasto
+Extrai performance (cliques, impressões, gasto) por dia e hora: a matriz
+dia × hora da janela de análise mais as horas já fechadas de hoje.
+
+Gera:
+  horarios.csv         — hora, cliques, impressoes, gasto
+                         (24 faixas somando os dias da janela, sem hoje)
+  horarios_dia.csv     — data, dia_semana, hora, cliques, impressoes, gasto
+                         (uma linha por dia × hora, hoje incluído)
+  horarios_semana.csv  — dia_semana, hora, dias, cliques, impressoes, gasto
+                         (somas por dia da semana × hora na janela; `dias` é
+                         quantos dias daquele dia da semana entraram, para médias)
+
+A janela é consultada com time_increment=1, então com --incremental
+(INSIGHTS_INCREMENTAL=1) só os dias novos vão à API e o resto vem do
+armazém local. Hoje é sempre uma consulta à parte (date_preset "today", no
+máximo 24 linhas): a cadência intradiária do 08_agendamento.py, que roda a
+cada hora, atualiza as horas de hoje sem rebuscar a janela.
+
+dia_semana: 0 = segunda ... 6 = domingo (DIAS_SEMANA).
 
 Nota: a breakdown hourly_stats_aggregated_by_advertiser_time_zone retorna
-      intervalos no formato "HH:00:00 - HH:59:00" — o script extrai só a hora.
+      intervalos no formato "HH:00:00 - HH:59:00" — o script extrai só a hora
+      (formatos.hora).
+
+Variável de ambiente (.env):
+  HORARIOS_HOJE  "0" não busca as horas de hoje (padrão "1")
 """
 
-import csv
-import re
-from pathlib import Path
-from config import account
+import os
+from datetime import date
+
+from insights import buscar
+import dados
+import formatos
+
+OUTPUT        = dados.caminho("horarios.csv")
+OUTPUT_DIA    = dados.caminho("horarios_dia.csv")
+OUTPUT_SEMANA = dados.caminho("horarios_semana.csv")
+DATE_PRESET   = "last_30d"
+INCLUIR_HOJE  = os.getenv("HORARIOS_HOJE", "1").strip().lower() not in ("0", "false", "nao")
 
-OUTPUT = Path(__file__).parent / "horarios.csv"
-DATE_PRESET = "last_30d"
+BREAKDOWN   = "hourly_stats_aggregated_by_advertiser_time_zone"
+DIAS_SEMANA = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sab", "Dom"]
+METRICAS    = ["cliques", "impressoes", "gasto"]
 
 
-def extrair_hora(intervalo: str) -> int:
-    """
-    Converte "09:00:00 - 09:59:00" → 9
-    Converte "18:00:00 - 18:59:00" → 18
-    """
-    match = re.match(r"(\d{1,2}):\d{2}:\d{2}", intervalo.strip())
-    if match:
-        return int(match.group(1))
-    return -1
+def acumular(matriz, linhas):
+    """Soma as linhas do Insights em matriz[(data, hora)]."""
+    for row in linhas:
+        hora = formatos.hora(row.get(BREAKDOWN, ""))
+        if hora < 0:
+            continue
+        celula = matriz.setdefault((row.get("date_start", ""), hora),
+                                   {"cliques": 0, "impressoes": 0, "gasto": 0.0})
+        celula["cliques"]    += int(row.get("clicks", 0))
+        celula["impressoes"] += int(row.get("impressions", 0))
+        celula["gasto"]      += float(row.get("spend", 0))
+    return matriz
+
+
+def _dia_semana(data):
+    try:
+        return date.fromisoformat(data).weekday()
+    except ValueError:
+        return -1
+
+
+def por_hora(matriz):
+    """24 linhas (hora, métricas) somando todos os dias da matriz."""
+    soma = {h: {"cliques": 0, "impressoes": 0, "gasto": 0.0} for h in range(24)}
+    for (_, hora), m in matriz.items():
+        for k in METRICAS:
+            soma[hora][k] += m[k]
+    return [{"hora": h, **soma[h], "gasto": round(soma[h]["gasto"], 2)} for h in range(24)]
+
+
+def por_dia(matriz):
+    """Linhas data × hora em ordem, com o dia da semana."""
+    return [
+        {"data": data, "dia_semana": _dia_semana(data), "hora": hora,
+         **m, "gasto": round(m["gasto"], 2)}
+        for (data, hora), m in sorted(matriz.items())
+    ]
+
+
+def por_dia_semana(matriz):
+    """7 × 24 linhas com as somas por dia da semana e hora e quantos dias entraram."""
+    soma = {(d, h): {"cliques": 0, "impressoes": 0, "gasto": 0.0}
+            for d in range(7) for h in range(24)}
+    datas = {}
+    for (data, hora), m in matriz.items():
+        d = _dia_semana(data)
+        if d < 0:
+            continue
+        datas.setdefault(d, set()).add(data)
+        for k in METRICAS:
+            soma[(d, hora)][k] += m[k]
+    return [
+        {"dia_semana": d, "hora": h, "dias": len(datas.get(d, ())),
+         **soma[(d, h)], "gasto": round(soma[(d, h)]["gasto"], 2)}
+        for d in range(7) for h in range(24)
+    ]
 
 
 def main():
@@ -39,49 +114,46 @@ def main():
     params = {
         "level": "account",
         "date_preset": DATE_PRESET,
-        "breakdowns": ["hourly_stats_aggregated_by_advertiser_time_zone"],
+        "breakdowns": [BREAKDOWN],
+        "time_increment": 1,          # 1 = uma linha por dia × hora
     }
 
-    print(f"Consultando performance por horário ({DATE_PRESET})...")
-    insights = account.get_insights(fields=fields, params=params)
+    print(f"Consultando performance por dia e horário ({DATE_PRESET})...")
+    janela = acumular({}, buscar(fields, params, consulta="05_horarios"))
 
-    # Agrupa por hora (0-23), somando todos os dias
-    por_hora = {h: {"cliques": 0, "impressoes": 0, "gasto": 0.0} for h in range(24)}
+    hoje = {}
+    if INCLUIR_HOJE:
+        print("Consultando as horas de hoje...")
+        hoje = acumular({}, buscar(fields, dict(params, date_preset="today")))
 
-    for row in insights:
-        intervalo = row.get("hourly_stats_aggregated_by_advertiser_time_zone", "")
-        hora = extrair_hora(intervalo)
-        if hora < 0:
-            continue
-
-        por_hora[hora]["cliques"]    += int(row.get("clicks", 0))
-        por_hora[hora]["impressoes"] += int(row.get("impressions", 0))
-        por_hora[hora]["gasto"]      += float(row.get("spend", 0))
-
-    rows = [
-        {
-            "hora":       h,
-            "cliques":    por_hora[h]["cliques"],
-            "impressoes": por_hora[h]["impressoes"],
-            "gasto":      round(por_hora[h]["gasto"], 2),
-        }
-        for h in range(24)
-    ]
+    rows = por_hora(janela)
 
     # Verifica se há dados (se todos zeros, API não retornou nada)
-    if sum(r["cliques"] for r in rows) == 0:
+    if sum(r["cliques"] for r in rows) == 0 and not hoje:
         print("[AVISO] Nenhum dado horário retornado pela API.")
         return
 
-    with open(OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["hora", "cliques", "impressoes", "gasto"])
-        writer.writeheader()
-        writer.writerows(rows)
+    dados.salvar(OUTPUT, rows, ["hora"] + METRICAS)
+    # Hoje substitui o que a janela tiver do mesmo dia (nunca deveria ter)
+    dados.salvar(OUTPUT_DIA, por_dia({**janela, **hoje}),
+                 ["data", "dia_semana", "hora"] + METRICAS)
+    semana = por_dia_semana(janela)
+    dados.salvar(OUTPUT_SEMANA, semana, ["dia_semana", "hora", "dias"] + METRICAS)
 
     pico_hora  = max(rows, key=lambda r: r["cliques"])
     total_cliques = sum(r["cliques"] for r in rows)
-    print(f"[OK] {OUTPUT.name} salvo — 24 horas | Total de cliques: {total_cliques:,}")
+    n_dias = len({data for data, _ in janela})
+    print(f"[OK] {OUTPUT.name}, {OUTPUT_DIA.name} e {OUTPUT_SEMANA.name} salvos — "
+          f"{n_dias} dias × 24 horas | Total de cliques: {total_cliques:,}")
     print(f"     Pico de cliques: {pico_hora['cliques']:,} às {pico_hora['hora']:02d}h")
+    pico_semana = max(semana, key=lambda r: r["cliques"] / (r["dias"] or 1))
+    if pico_semana["dias"]:
+        print(f"     Melhor faixa da semana: {DIAS_SEMANA[pico_semana['dia_semana']]} "
+              f"{pico_semana['hora']:02d}h ({pico_semana['cliques'] / pico_semana['dias']:,.0f} cliques/dia)")
+    if hoje:
+        horas = sorted(h for _, h in hoje)
+        print(f"     Hoje: {sum(m['cliques'] for m in hoje.values()):,} cliques "
+              f"até {horas[-1]:02d}h ({len(horas)} horas com dados)")
 
     # Mini heatmap no terminal
     max_c = max(r["cliques"] for r in rows) or 1
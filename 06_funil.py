@@ -9,11 +9,11 @@ Gera: funil.csv
 Colunas: estagio, quantidade
 """
 
-import csv
-from pathlib import Path
-from config import account
+from insights import buscar
+import acoes
+import dados
 
-OUTPUT = Path(__file__).parent / "funil.csv"
+OUTPUT = dados.caminho("funil.csv")
 DATE_PRESET = "last_30d"
 
 # Mapeamento ação Facebook → estágio do funil
@@ -33,65 +33,60 @@ ACOES_LEAD = [
 ]
 
 
-def get_action_sum(actions, tipos):
-    """Soma todos os valores das ações cujo action_type esteja em `tipos`."""
-    if not actions:
-        return 0
-    total = 0
-    vistos = set()
-    for a in actions:
-        t = a.get("action_type", "")
-        if t in tipos and t not in vistos:
-            total += int(float(a.get("value", 0)))
-            vistos.add(t)
-    return total
-
+ACOES_VIEWS_PAG = [
+    "landing_page_view",
+    "view_content",
+]
 
-def main():
-    fields = [
-        "impressions",
-        "reach",
-        "clicks",
-        "actions",
-        "website_ctr",
-    ]
 
-    params = {
-        "level": "account",
-        "date_preset": DATE_PRESET,
-    }
+def montar_estagios(insights):
+    """
+    Soma as linhas do Insights e devolve a lista (estagio, quantidade), ou
+    None se a API não retornou impressões.
+    Obs.: alcance não é aditivo — somado sobre linhas diárias ou por
+    campanha ele superestima o alcance único do período. No modo
+    incremental as linhas diárias vêm sem "reach" e o alcance chega numa
+    linha do período inteiro (insights.NAO_ADITIVOS).
+    """
+    return finalizar(acumular({}, insights))
 
-    print(f"Consultando métricas do funil ({DATE_PRESET})...")
-    insights = account.get_insights(fields=fields, params=params)
 
+def acumular(totais, insights):
+    """Soma as linhas (ex.: uma página da API) no dict de totais e o devolve."""
     # Conta-level retorna normalmente 1 linha (ou poucos registros)
-    impressoes = 0
-    alcance    = 0
-    cliques    = 0
-    views_pag  = 0
-    leads      = 0
-    conversoes = 0
+    for chave in ("impressoes", "alcance", "cliques", "views_pag", "leads", "conversoes"):
+        totais.setdefault(chave, 0)
 
     for row in insights:
-        impressoes += int(row.get("impressions", 0))
-        alcance    += int(row.get("reach", 0))
-        cliques    += int(row.get("clicks", 0))
-        actions     = row.get("actions", [])
+        totais["impressoes"] += int(row.get("impressions", 0))
+        totais["alcance"]    += int(row.get("reach", 0))
+        totais["cliques"]    += int(row.get("clicks", 0))
+        actions               = acoes.da_linha(row)
+
+        totais["views_pag"]  += acoes.somar(actions, ACOES_VIEWS_PAG, inteiro=True)
+        totais["leads"]      += acoes.somar(actions, ACOES_LEAD, inteiro=True)
+        totais["conversoes"] += acoes.somar(actions, ACOES_CONVERSAO, inteiro=True)
+    return totais
 
-        views_pag  += get_action_sum(actions, {"landing_page_view", "view_content"})
-        leads      += get_action_sum(actions, set(ACOES_LEAD))
-        conversoes += get_action_sum(actions, set(ACOES_CONVERSAO))
 
+def finalizar(totais):
+    """Lista (estagio, quantidade) a partir de acumular(), ou None sem impressões."""
+    impressoes = totais.get("impressoes", 0)
     if impressoes == 0:
-        print("[AVISO] Nenhum dado de funil retornado pela API.")
-        return
+        return None
+
+    alcance    = totais["alcance"]
+    cliques    = totais["cliques"]
+    views_pag  = totais["views_pag"]
+    leads      = totais["leads"]
+    conversoes = totais["conversoes"]
 
     # Garante que os valores do funil são decrescentes (sanity check)
     views_pag  = min(views_pag,  cliques)
     leads      = min(leads,      views_pag if views_pag > 0 else cliques)
     conversoes = min(conversoes, leads if leads > 0 else cliques)
 
-    estagios = [
+    return [
         ("Impressoes",              impressoes),
         ("Alcance",                 alcance),
         ("Cliques",                 cliques),
@@ -100,11 +95,14 @@ def main():
         ("Conversoes",              conversoes),
     ]
 
-    with open(OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["estagio", "quantidade"])
-        writer.writeheader()
-        for estagio, qtd in estagios:
-            writer.writerow({"estagio": estagio, "quantidade": qtd})
+
+def salvar(estagios):
+    if not estagios:
+        print("[AVISO] Nenhum dado de funil retornado pela API.")
+        return
+
+    rows = [{"estagio": estagio, "quantidade": qtd} for estagio, qtd in estagios]
+    dados.salvar(OUTPUT, rows, ["estagio", "quantidade"])
 
     print(f"[OK] {OUTPUT.name} salvo — funil com {len(estagios)} estagios\n")
     max_q = estagios[0][1] or 1
@@ -115,5 +113,24 @@ def main():
         print(f"     {estagio:<28} {qtd:>12,}  {taxa:>7.2f}%")
 
 
+def main():
+    fields = [
+        "impressions",
+        "reach",
+        "clicks",
+        "actions",
+    ]
+
+    params = {
+        "level": "account",
+        "date_preset": DATE_PRESET,
+    }
+
+    print(f"Consultando métricas do funil ({DATE_PRESET})...")
+    insights = buscar(fields, params, consulta="06_funil")
+
+    salvar(montar_estagios(insights))
+
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,8 @@
 """
 07_dashboard.py
 Consolida CSVs dos scripts 01-06 e gera dashboard.html interativo com Chart.js.
+Layout, estilos e gráficos ficam em modelos/dashboard.* (modelos.py); aqui
+só se montam os KPIs e o bloco de dados.
 
 CSVs esperados (gerados pelos scripts anteriores):
   campanhas.csv      — campanha, gasto, impressoes, cliques, ctr, cpv, conversoes
@@ -8,15 +10,28 @@ CSVs esperados (gerados pelos scripts anteriores):
   posicionamentos.csv— posicionamento, gasto, impressoes
   idade_genero.csv   — idade, genero, gasto
   horarios.csv       — hora, cliques, impressoes, gasto
+  horarios_dia.csv   — data, dia_semana, hora, cliques, impressoes, gasto
+  horarios_semana.csv— dia_semana, hora, dias, cliques, impressoes, gasto
   funil.csv          — estagio, quantidade
 
 Se algum CSV não for encontrado, dados de amostra são usados automaticamente.
 """
 
-import json
 import os
+from datetime import date
 from pathlib import Path
 
+from dotenv import load_dotenv
+
+# Antes dos módulos do projeto: dados, formatos, metricas e modelos leem o .env ao importar
+load_dotenv()
+
+import formatos
+import metricas
+import modelos
+from dados import caminho, gravar_texto, ler_csv
+from reducao import lttb, top_n
+
 # Tenta importar pandas; se não estiver instalado, usa dados de amostra.
 try:
     import pandas as pd
@@ -27,6 +42,10 @@ except ImportError:
     print("[INFO]  Usando dados de amostra para todos os gráficos.\n")
 
 BASE_DIR = Path(__file__).parent
+TITULO   = "Facebook Ads — Dashboard de Performance"
+
+# dia_semana dos CSVs de horário (05_horarios.py): 0 = segunda
+DIAS_SEMANA = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sab", "Dom"]
 
 
 # ─────────────────────────────────────────────
@@ -34,18 +53,13 @@ BASE_DIR = Path(__file__).parent
 # ─────────────────────────────────────────────
 
 def _csv(nome):
-    p = BASE_DIR / nome
-    if PANDAS_OK and p.exists():
-        return pd.read_csv(p)
-    return None
+    # Leitura tipada e em cache compartilhada com o 09 (dados.py)
+    return ler_csv(nome)
 
 
 def load_campanhas():
     df = _csv("campanhas.csv")
     if df is not None:
-        cols = {"campanha": "campanha", "gasto": "gasto", "impressoes": "impressoes",
-                "cliques": "cliques", "ctr": "ctr", "cpv": "cpv", "conversoes": "conversoes"}
-        df.columns = [c.lower().strip() for c in df.columns]
         return df
     # fallback
     import pandas as pd
@@ -63,7 +77,6 @@ def load_campanhas():
 def load_cpv_diario():
     df = _csv("cpv_diario.csv")
     if df is not None:
-        df.columns = [c.lower().strip() for c in df.columns]
         return df
     import pandas as pd
     datas = [f"2024-{m:02d}-{d:02d}"
@@ -76,7 +89,6 @@ def load_cpv_diario():
 def load_posicionamentos():
     df = _csv("posicionamentos.csv")
     if df is not None:
-        df.columns = [c.lower().strip() for c in df.columns]
         return df
     import pandas as pd
     return pd.DataFrame({
@@ -89,7 +101,6 @@ def load_posicionamentos():
 def load_idade_genero():
     df = _csv("idade_genero.csv")
     if df is not None:
-        df.columns = [c.lower().strip() for c in df.columns]
         return df
     import pandas as pd
     idades  = ["18-24", "25-34", "35-44", "45-54", "55-64", "65+"]
@@ -112,7 +123,6 @@ def load_idade_genero():
 def load_horarios():
     df = _csv("horarios.csv")
     if df is not None:
-        df.columns = [c.lower().strip() for c in df.columns]
         return df
     import pandas as pd
     horas   = list(range(24))
@@ -121,10 +131,36 @@ def load_horarios():
     return pd.DataFrame({"hora": horas, "cliques": cliques})
 
 
+def load_horarios_dia():
+    df = _csv("horarios_dia.csv")
+    if df is not None:
+        return df
+    import pandas as pd
+    # Amostra: 4 semanas com o perfil horário de load_horarios() por dia
+    perfil  = load_horarios()["cliques"].tolist()
+    fatores = [1.0, 1.05, 1.1, 1.08, 0.95, 0.7, 0.6]     # seg ... dom
+    rows = []
+    for d in pd.date_range("2024-03-04", periods=28):
+        f = fatores[d.weekday()]
+        for h, c in enumerate(perfil):
+            rows.append({"data": d.strftime("%Y-%m-%d"), "dia_semana": d.weekday(), "hora": h,
+                         "cliques": round(c * f / 30), "gasto": round(c * f / 30 * 0.85, 2)})
+    return pd.DataFrame(rows)
+
+
+def load_horarios_semana():
+    df = _csv("horarios_semana.csv")
+    if df is not None:
+        return df
+    dia  = load_horarios_dia()
+    soma = dia.groupby(["dia_semana", "hora"], as_index=False)[["cliques", "gasto"]].sum()
+    soma["dias"] = soma["dia_semana"].map(dia.groupby("dia_semana")["data"].nunique())
+    return soma
+
+
 def load_funil():
     df = _csv("funil.csv")
     if df is not None:
-        df.columns = [c.lower().strip() for c in df.columns]
         return df
     import pandas as pd
     return pd.DataFrame({
@@ -133,6 +169,20 @@ def load_funil():
     })
 
 
+def carregar_dados():
+    """DataFrames de todos os gráficos (CSV ou amostra)."""
+    return {
+        "campanhas":       load_campanhas(),
+        "cpv_diario":      load_cpv_diario(),
+        "posicionamentos": load_posicionamentos(),
+        "idade_genero":    load_idade_genero(),
+        "horarios":        load_horarios(),
+        "horarios_dia":    load_horarios_dia(),
+        "horarios_semana": load_horarios_semana(),
+        "funil":           load_funil(),
+    }
+
+
 # ─────────────────────────────────────────────
 # KPIs globais
 # ─────────────────────────────────────────────
@@ -151,489 +201,148 @@ def calcular_kpis(df_camp):
 
 
 # ─────────────────────────────────────────────
-# HTML TEMPLATE
+# HTML — modelos/dashboard.{html,css,js}
 # ─────────────────────────────────────────────
 
-def gerar_html(kpis, dados):
+def _matriz(df, indice, linhas, valor, inteiro=False):
+    """Matriz [linha][hora] de `valor`; combinações ausentes ficam com 0."""
+    tabela = (df.pivot_table(index=indice, columns="hora", values=valor, aggfunc="sum")
+                .reindex(index=linhas, columns=range(24))
+                .fillna(0))
+    return tabela.astype(int if inteiro else float).values.tolist()
+
+
+def montar_dados(dados):
+    """
+    Bloco JSON único com as séries de todos os gráficos, em arrays por
+    coluna. Séries grandes são reduzidas (reducao.py): barras de campanha
+    viram top-N + "Outros" e o CPV diário passa por LTTB.
+    """
     camp      = dados["campanhas"]
     cpv_dia   = dados["cpv_diario"]
     posic     = dados["posicionamentos"]
     ig        = dados["idade_genero"]
     hor       = dados["horarios"]
+    hor_dia   = dados["horarios_dia"]
+    hor_sem   = dados["horarios_semana"]
     funil     = dados["funil"]
 
+    # ── Gasto por campanha: top-N + "Outros" ─
+    camp_labels, camp_gasto = top_n(camp["campanha"].tolist(),
+                                    [float(v) for v in camp["gasto"].tolist()])
+
+    # ── CPV diário: LTTB sobre o dia ordinal ─
+    datas = cpv_dia["data"].astype(str).tolist()
+    cpvs  = [float(v) for v in cpv_dia["cpv"].tolist()]
+    dias  = pd.to_datetime(cpv_dia["data"], errors="coerce")
+    xs    = (dias.map(pd.Timestamp.toordinal).tolist() if dias.notna().all()
+             else list(range(len(datas))))
+    pontos = lttb(xs, cpvs)
+
+    # ── Gasto por tipo de campanha (formatos.CLASSIFICADOR, o mesmo do 09) ─
+    por_tipo = (camp.assign(tipo=formatos.tipos_campanha(camp["campanha"]))
+                    .groupby("tipo")[["gasto", "conversoes"]].sum()
+                    .sort_values("gasto", ascending=False))
+
     # ── Scatter: CTR vs CPV ──────────────────
-    scatter_pts = [{"x": round(float(r["ctr"]), 3),
-                    "y": round(float(r["cpv"]), 5),
-                    "label": r["campanha"]}
-                   for _, r in camp.iterrows()]
+    # round() do Python por coluna: Series.round arredonda diferente nos empates
+    scatter = {
+        "ctr":       [round(x, 3) for x in camp["ctr"].astype(float).tolist()],
+        "cpv":       [round(y, 5) for y in camp["cpv"].astype(float).tolist()],
+        "campanhas": camp["campanha"].tolist(),
+    }
 
     # ── Heatmap Idade × Gênero ───────────────
     idades  = ig["idade"].unique().tolist()
     generos = ig["genero"].unique().tolist()
-    heatmap_datasets = []
-    palette_hm = ["#6366f1", "#ec4899"]
-    for gi, gen in enumerate(generos):
-        sub = ig[ig["genero"] == gen].set_index("idade")
-        heatmap_datasets.append({
-            "label": gen,
-            "data":  [float(sub.loc[i, "gasto"]) if i in sub.index else 0 for i in idades],
-            "backgroundColor": palette_hm[gi % len(palette_hm)] + "cc",
-            "borderColor":     palette_hm[gi % len(palette_hm)],
-            "borderWidth": 1,
-        })
+    # Tabela idade × gênero; combinações ausentes ficam com 0
+    gasto_ig = (ig.pivot_table(index="idade", columns="genero", values="gasto", aggfunc="sum")
+                  .reindex(index=idades, columns=generos)
+                  .fillna(0)
+                  .astype(float))
+
+    # ── Mapa de calor Dia × Hora ─────────────
+    # Por data (hoje, se presente, é a última linha e está parcial) e por dia
+    # da semana como média por dia, já que a janela não tem o mesmo número de
+    # segundas, terças...
+    datas_mapa = sorted(hor_dia["data"].astype(str).unique())
+    hor_dia    = hor_dia.assign(data=hor_dia["data"].astype(str))
+    hoje       = date.today().isoformat()
+    dias_sem   = hor_sem["dias"].clip(lower=1)
+    media_sem  = hor_sem.assign(cliques=hor_sem["cliques"] / dias_sem,
+                                gasto=hor_sem["gasto"] / dias_sem)
 
     # ── Funil ────────────────────────────────
-    funil_labels = funil["estagio"].tolist()
     funil_valores = [int(v) for v in funil["quantidade"].tolist()]
     funil_max = funil_valores[0] if funil_valores else 1
     funil_pcts = [round(v / funil_max * 100, 1) for v in funil_valores]
 
-    # ── Cores padrão ─────────────────────────
-    cores_bar  = ["#6366f1","#8b5cf6","#a78bfa","#c4b5fd","#ddd6fe"]
-    cores_pie  = ["#6366f1","#8b5cf6","#ec4899","#f59e0b","#10b981","#06b6d4"]
-
-    html = f"""<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Facebook Ads — Dashboard de Performance</title>
-<script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-<style>
-  *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-
-  body {{
-    background: #0f0f1a;
-    color: #e2e8f0;
-    font-family: 'Segoe UI', system-ui, sans-serif;
-    min-height: 100vh;
-    padding: 2rem;
-  }}
-
-  header {{
-    text-align: center;
-    margin-bottom: 2.5rem;
-  }}
-  header h1 {{
-    font-size: 2rem;
-    background: linear-gradient(135deg, #6366f1, #a78bfa, #ec4899);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    font-weight: 700;
-    letter-spacing: -0.5px;
-  }}
-  header p {{
-    color: #94a3b8;
-    margin-top: .4rem;
-    font-size: .95rem;
-  }}
-
-  /* ── KPI Cards ── */
-  .kpi-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-    gap: 1.2rem;
-    margin-bottom: 2.5rem;
-  }}
-  .kpi-card {{
-    background: linear-gradient(135deg, rgba(99,102,241,.15), rgba(139,92,246,.08));
-    border: 1px solid rgba(99,102,241,.3);
-    border-radius: 16px;
-    padding: 1.5rem 1.8rem;
-    position: relative;
-    overflow: hidden;
-    transition: transform .2s, box-shadow .2s;
-  }}
-  .kpi-card:hover {{
-    transform: translateY(-3px);
-    box-shadow: 0 8px 32px rgba(99,102,241,.25);
-  }}
-  .kpi-card::before {{
-    content: '';
-    position: absolute;
-    top: -40px; right: -40px;
-    width: 100px; height: 100px;
-    background: radial-gradient(circle, rgba(99,102,241,.2), transparent 70%);
-    border-radius: 50%;
-  }}
-  .kpi-label {{ font-size: .8rem; color: #94a3b8; text-transform: uppercase; letter-spacing: 1px; }}
-  .kpi-value {{ font-size: 1.9rem; font-weight: 700; margin-top: .4rem; color: #f1f5f9; }}
-  .kpi-icon  {{ position: absolute; top: 1rem; right: 1.2rem; font-size: 1.6rem; opacity: .5; }}
-
-  /* ── Chart Grid ── */
-  .charts-grid {{
-    display: grid;
-    grid-template-columns: repeat(2, 1fr);
-    gap: 1.5rem;
-  }}
-  .chart-card {{
-    background: rgba(15,15,30,.8);
-    border: 1px solid rgba(99,102,241,.2);
-    border-radius: 16px;
-    padding: 1.5rem;
-    position: relative;
-  }}
-  .chart-card.full-width {{ grid-column: 1 / -1; }}
-  .chart-card h2 {{
-    font-size: .9rem;
-    font-weight: 600;
-    color: #a78bfa;
-    margin-bottom: 1rem;
-    text-transform: uppercase;
-    letter-spacing: .5px;
-  }}
-  canvas {{ max-height: 320px; }}
-
-  /* ── Funil Custom ── */
-  .funil-container {{
-    display: flex;
-    flex-direction: column;
-    gap: .6rem;
-    padding: .5rem 0;
-  }}
-  .funil-row {{ display: flex; align-items: center; gap: 1rem; }}
-  .funil-label {{
-    width: 180px;
-    font-size: .82rem;
-    color: #cbd5e1;
-    text-align: right;
-    flex-shrink: 0;
-  }}
-  .funil-bar-wrap {{
-    flex: 1;
-    height: 34px;
-    background: rgba(255,255,255,.05);
-    border-radius: 6px;
-    overflow: hidden;
-    display: flex;
-    align-items: center;
-  }}
-  .funil-bar {{
-    height: 100%;
-    border-radius: 6px;
-    display: flex;
-    align-items: center;
-    padding-left: .7rem;
-    font-size: .8rem;
-    font-weight: 600;
-    color: #fff;
-    transition: width .8s ease;
-  }}
-  .funil-val {{
-    width: 110px;
-    text-align: right;
-    font-size: .8rem;
-    color: #94a3b8;
-    flex-shrink: 0;
-  }}
-
-  @media (max-width: 768px) {{
-    .charts-grid {{ grid-template-columns: 1fr; }}
-    .chart-card.full-width {{ grid-column: 1; }}
-    .kpi-value {{ font-size: 1.5rem; }}
-  }}
-</style>
-</head>
-<body>
-
-<header>
-  <h1>Facebook Ads — Dashboard de Performance</h1>
-  <p>Análise consolidada · Gerado automaticamente por 07_dashboard.py</p>
-</header>
-
-<!-- KPI Cards -->
-<div class="kpi-grid">
-  <div class="kpi-card">
-    <span class="kpi-icon">💸</span>
-    <div class="kpi-label">Gasto Total</div>
-    <div class="kpi-value">{kpis["gasto_total"]}</div>
-  </div>
-  <div class="kpi-card">
-    <span class="kpi-icon">👁️</span>
-    <div class="kpi-label">Impressões</div>
-    <div class="kpi-value">{kpis["impressoes"]}</div>
-  </div>
-  <div class="kpi-card">
-    <span class="kpi-icon">🖱️</span>
-    <div class="kpi-label">CTR Médio</div>
-    <div class="kpi-value">{kpis["ctr_medio"]}</div>
-  </div>
-  <div class="kpi-card">
-    <span class="kpi-icon">📹</span>
-    <div class="kpi-label">CPV Médio</div>
-    <div class="kpi-value">{kpis["cpv_medio"]}</div>
-  </div>
-</div>
-
-<!-- Charts Grid -->
-<div class="charts-grid">
-
-  <!-- 1. Gasto por Campanha -->
-  <div class="chart-card">
-    <h2>💰 Gasto por Campanha</h2>
-    <canvas id="chartCampanhas"></canvas>
-  </div>
-
-  <!-- 2. Evolução do CPV -->
-  <div class="chart-card">
-    <h2>📈 Evolução do CPV</h2>
-    <canvas id="chartCpv"></canvas>
-  </div>
-
-  <!-- 3. Distribuição por Posicionamento -->
-  <div class="chart-card">
-    <h2>🥧 Distribuição por Posicionamento</h2>
-    <canvas id="chartPosic"></canvas>
-  </div>
-
-  <!-- 4. Heatmap: Idade × Gênero -->
-  <div class="chart-card">
-    <h2>🌡️ Gasto: Idade × Gênero</h2>
-    <canvas id="chartIdadeGenero"></canvas>
-  </div>
-
-  <!-- 5. Performance por Horário -->
-  <div class="chart-card full-width">
-    <h2>🕐 Cliques por Horário do Dia</h2>
-    <canvas id="chartHorario"></canvas>
-  </div>
-
-  <!-- 6. Funil de Conversão -->
-  <div class="chart-card full-width">
-    <h2>🔻 Funil de Conversão</h2>
-    <div class="funil-container" id="funil"></div>
-  </div>
-
-  <!-- 7. Scatter: CTR vs CPV -->
-  <div class="chart-card full-width">
-    <h2>🔵 CTR vs CPV por Campanha (Outliers)</h2>
-    <canvas id="chartScatter"></canvas>
-  </div>
-
-</div>
-
-<script>
-// ── Configurações globais Chart.js ────────────────────────────
-Chart.defaults.color = '#94a3b8';
-Chart.defaults.borderColor = 'rgba(255,255,255,0.06)';
-Chart.defaults.font.family = "'Segoe UI', system-ui, sans-serif";
-
-const GRAD = (ctx, c1, c2) => {{
-  const g = ctx.createLinearGradient(0, 0, 0, 320);
-  g.addColorStop(0, c1); g.addColorStop(1, c2);
-  return g;
-}};
-
-// ── 1. Gasto por Campanha ─────────────────────────────────────
-(function() {{
-  const ctx = document.getElementById('chartCampanhas').getContext('2d');
-  const labels = {json.dumps(camp["campanha"].tolist())};
-  const data   = {json.dumps([float(v) for v in camp["gasto"].tolist()])};
-  new Chart(ctx, {{
-    type: 'bar',
-    data: {{
-      labels,
-      datasets: [{{
-        label: 'Gasto (R$)',
-        data,
-        backgroundColor: {json.dumps(cores_bar[:len(camp)])},
-        borderRadius: 8,
-        borderSkipped: false,
-      }}]
-    }},
-    options: {{
-      responsive: true,
-      plugins: {{ legend: {{ display: false }} }},
-      scales: {{
-        x: {{ grid: {{ display: false }} }},
-        y: {{
-          ticks: {{ callback: v => 'R$ ' + v.toLocaleString('pt-BR') }},
-        }}
-      }}
-    }}
-  }});
-}})();
-
-// ── 2. Evolução CPV ───────────────────────────────────────────
-(function() {{
-  const ctx = document.getElementById('chartCpv').getContext('2d');
-  const grad = GRAD(ctx, 'rgba(99,102,241,.4)', 'rgba(99,102,241,0)');
-  new Chart(ctx, {{
-    type: 'line',
-    data: {{
-      labels: {json.dumps(cpv_dia["data"].tolist())},
-      datasets: [{{
-        label: 'CPV (R$)',
-        data:  {json.dumps([float(v) for v in cpv_dia["cpv"].tolist()])},
-        borderColor: '#6366f1',
-        backgroundColor: grad,
-        fill: true,
-        tension: 0.4,
-        pointRadius: 4,
-        pointBackgroundColor: '#6366f1',
-      }}]
-    }},
-    options: {{
-      responsive: true,
-      plugins: {{ legend: {{ display: false }} }},
-      scales: {{
-        x: {{ grid: {{ display: false }}, ticks: {{ maxTicksLimit: 8 }} }},
-        y: {{ ticks: {{ callback: v => 'R$ ' + v.toFixed(4) }} }}
-      }}
-    }}
-  }});
-}})();
-
-// ── 3. Distribuição por Posicionamento ────────────────────────
-(function() {{
-  const ctx = document.getElementById('chartPosic').getContext('2d');
-  new Chart(ctx, {{
-    type: 'doughnut',
-    data: {{
-      labels: {json.dumps(posic["posicionamento"].tolist())},
-      datasets: [{{
-        data:            {json.dumps([float(v) for v in posic["gasto"].tolist()])},
-        backgroundColor: {json.dumps(cores_pie[:len(posic)])},
-        borderWidth: 2,
-        borderColor: '#0f0f1a',
-        hoverOffset: 8,
-      }}]
-    }},
-    options: {{
-      responsive: true,
-      cutout: '60%',
-      plugins: {{
-        legend: {{ position: 'right', labels: {{ boxWidth: 12, padding: 12 }} }}
-      }}
-    }}
-  }});
-}})();
-
-// ── 4. Heatmap Idade × Gênero (grouped bar) ───────────────────
-(function() {{
-  const ctx = document.getElementById('chartIdadeGenero').getContext('2d');
-  new Chart(ctx, {{
-    type: 'bar',
-    data: {{
-      labels: {json.dumps(idades)},
-      datasets: {json.dumps(heatmap_datasets)}
-    }},
-    options: {{
-      responsive: true,
-      plugins: {{ legend: {{ position: 'top' }} }},
-      scales: {{
-        x: {{ grid: {{ display: false }} }},
-        y: {{ ticks: {{ callback: v => 'R$ ' + v.toLocaleString('pt-BR') }} }}
-      }}
-    }}
-  }});
-}})();
-
-// ── 5. Performance por Horário ────────────────────────────────
-(function() {{
-  const ctx   = document.getElementById('chartHorario').getContext('2d');
-  const horas = {json.dumps(hor["hora"].tolist())};
-  const cliques = {json.dumps([int(v) for v in hor["cliques"].tolist()])};
-  const maxVal  = Math.max(...cliques);
-  const bgColors = cliques.map(v => {{
-    const ratio = v / maxVal;
-    return `rgba(${{Math.round(99 + (236-99)*ratio)}}, ${{Math.round(102 + (73-102)*ratio)}}, ${{Math.round(241 + (153-241)*ratio)}}, 0.85)`;
-  }});
-  new Chart(ctx, {{
-    type: 'bar',
-    data: {{
-      labels: horas.map(h => h + 'h'),
-      datasets: [{{
-        label: 'Cliques',
-        data: cliques,
-        backgroundColor: bgColors,
-        borderRadius: 5,
-        borderSkipped: false,
-      }}]
-    }},
-    options: {{
-      responsive: true,
-      plugins: {{ legend: {{ display: false }} }},
-      scales: {{
-        x: {{ grid: {{ display: false }} }},
-        y: {{ grid: {{ color: 'rgba(255,255,255,.05)' }} }}
-      }}
-    }}
-  }});
-}})();
-
-// ── 6. Funil (HTML customizado) ───────────────────────────────
-(function() {{
-  const labels  = {json.dumps(funil_labels)};
-  const valores = {json.dumps(funil_valores)};
-  const pcts    = {json.dumps(funil_pcts)};
-  const cores   = ['#6366f1','#7c3aed','#9333ea','#a855f7','#c084fc','#e879f9'];
-  const el = document.getElementById('funil');
-  labels.forEach((lbl, i) => {{
-    const row = document.createElement('div');
-    row.className = 'funil-row';
-    row.innerHTML = `
-      <div class="funil-label">${{lbl}}</div>
-      <div class="funil-bar-wrap">
-        <div class="funil-bar" style="width:${{pcts[i]}}%; background:${{cores[i]}};">
-          ${{pcts[i]}}%
-        </div>
-      </div>
-      <div class="funil-val">${{valores[i].toLocaleString('pt-BR')}}</div>
-    `;
-    el.appendChild(row);
-  }});
-}})();
-
-// ── 7. Scatter CTR vs CPV ─────────────────────────────────────
-(function() {{
-  const ctx = document.getElementById('chartScatter').getContext('2d');
-  const pts = {json.dumps(scatter_pts)};
-  new Chart(ctx, {{
-    type: 'scatter',
-    data: {{
-      datasets: [{{
-        label: 'Campanhas',
-        data: pts,
-        backgroundColor: pts.map((_, i) => {json.dumps(cores_pie)}[i % {len(cores_pie)}] + 'cc'),
-        pointRadius: 10,
-        pointHoverRadius: 14,
-      }}]
-    }},
-    options: {{
-      responsive: true,
-      plugins: {{
-        legend: {{ display: false }},
-        tooltip: {{
-          callbacks: {{
-            label: ctx => {{
-              const p = ctx.raw;
-              return ` ${{p.label}}: CTR ${{p.x}}% | CPV R$ ${{p.y}}`;
-            }}
-          }}
-        }}
-      }},
-      scales: {{
-        x: {{
-          title: {{ display: true, text: 'CTR (%)', color: '#94a3b8' }},
-          grid: {{ color: 'rgba(255,255,255,.05)' }}
-        }},
-        y: {{
-          title: {{ display: true, text: 'CPV (R$)', color: '#94a3b8' }},
-          grid: {{ color: 'rgba(255,255,255,.05)' }},
-          ticks: {{ callback: v => 'R$ ' + v.toFixed(4) }}
-        }}
-      }}
-    }}
-  }});
-}})();
-
-</script>
-</body>
-</html>"""
-    return html
+    return {
+        "campanhas": {
+            "labels": camp_labels,
+            "gasto":  camp_gasto,
+            "outros": len(camp_labels) < len(camp),
+        },
+        "cpv": {
+            "datas":   [datas[i] for i in pontos],
+            "valores": [cpvs[i] for i in pontos],
+        },
+        "posicionamentos": {
+            "labels": posic["posicionamento"].tolist(),
+            "gasto":  [float(v) for v in posic["gasto"].tolist()],
+        },
+        "idade_genero": {
+            "idades":  idades,
+            "generos": generos,
+            "gasto":   [gasto_ig[gen].tolist() for gen in generos],
+        },
+        "horarios": {
+            "horas":   hor["hora"].tolist(),
+            "cliques": [int(v) for v in hor["cliques"].tolist()],
+        },
+        "mapa_horario": {
+            "datas":       datas_mapa,
+            "hoje":        hoje if hoje in datas_mapa else None,
+            "dias_semana": DIAS_SEMANA,
+            "dia": {
+                "cliques": _matriz(hor_dia, "data", datas_mapa, "cliques", inteiro=True),
+                "gasto":   _matriz(hor_dia, "data", datas_mapa, "gasto"),
+            },
+            "semana": {
+                "cliques": _matriz(media_sem, "dia_semana", range(7), "cliques"),
+                "gasto":   _matriz(media_sem, "dia_semana", range(7), "gasto"),
+            },
+        },
+        "funil": {
+            "labels":  funil["estagio"].tolist(),
+            "valores": funil_valores,
+            "pcts":    funil_pcts,
+        },
+        "scatter": scatter,
+        "tipos": {
+            "labels":     por_tipo.index.tolist(),
+            "gasto":      [float(v) for v in por_tipo["gasto"].tolist()],
+            "conversoes": [int(v) for v in por_tipo["conversoes"].tolist()],
+        },
+    }
+
+
+def gerar_html(kpis, dados, diretorio=None):
+    return modelos.pagina("dashboard", titulo=TITULO, dados=montar_dados(dados),
+                          diretorio=diretorio, **kpis)
+
+
+def painel(ao_vivo=None):
+    """
+    (kpis, dados dos gráficos, html) a partir dos CSVs atuais, sem gravar
+    nada — usado pelo servidor.py. `ao_vivo` vai para modelos.pagina.
+    """
+    dados    = carregar_dados()
+    kpis     = calcular_kpis(dados["campanhas"])
+    graficos = montar_dados(dados)
+    html = modelos.pagina("dashboard", titulo=TITULO, dados=graficos,
+                          ao_vivo=ao_vivo, **kpis)
+    return kpis, graficos, html
 
 
 # ─────────────────────────────────────────────
@@ -650,30 +359,17 @@ def main():
             return
 
     print("Carregando dados...")
-    camp  = load_campanhas()
-    cpv   = load_cpv_diario()
-    posic = load_posicionamentos()
-    ig    = load_idade_genero()
-    hor   = load_horarios()
-    fun   = load_funil()
+    dados = carregar_dados()
 
     print("Calculando KPIs...")
-    kpis = calcular_kpis(camp)
+    kpis = calcular_kpis(dados["campanhas"])
 
     print("Gerando dashboard.html...")
-    dados = {
-        "campanhas":     camp,
-        "cpv_diario":    cpv,
-        "posicionamentos": posic,
-        "idade_genero":  ig,
-        "horarios":      hor,
-        "funil":         fun,
-    }
-    html = gerar_html(kpis, dados)
+    saida = caminho("dashboard.html")
+    html = gerar_html(kpis, dados, saida.parent)
 
-    saida = BASE_DIR / "dashboard.html"
-    with open(saida, "w", encoding="utf-8") as f:
-        f.write(html)
+    gravar_texto(saida, html)
+    metricas.gravado(saida)
 
     print(f"\n[OK] dashboard.html gerado em: {saida}")
     print(f"  KPIs consolidados:")
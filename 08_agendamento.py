@@ -1,12 +1,47 @@
 """
 08_agendamento.py
-Agendamento automático do pipeline Facebook Ads.
+Agendamento automático do pipeline Facebook Ads (Windows, Linux e macOS).
 
 Modos de uso:
-  python 08_agendamento.py            → loop contínuo (mantém terminal aberto)
-  python 08_agendamento.py --instalar → registra no Agendador de Tarefas do Windows
-  python 08_agendamento.py --remover  → remove do Agendador de Tarefas do Windows
-  python 08_agendamento.py --status   → exibe próximas execuções e log recente
+  python 08_agendamento.py                  → loop contínuo (mantém o processo vivo)
+  python 08_agendamento.py --instalar       → registra as cadências no agendador do
+                                              sistema (schtasks no Windows; timers
+                                              systemd --user ou crontab nos demais)
+  python 08_agendamento.py --remover        → remove do agendador do sistema
+  python 08_agendamento.py --status         → agendador, execução em andamento e log recente
+  python 08_agendamento.py --exportar cron  → imprime as linhas de crontab
+  python 08_agendamento.py --exportar systemd → imprime os .service/.timer
+  python 08_agendamento.py --executar NOME  → uma execução da cadência NOME
+                                              (é o que o cron/systemd/schtasks chamam)
+
+Cadências (CADENCIAS): cada uma roda um subconjunto das etapas do run_all
+(--etapas) no seu ritmo — o CPV e os horários de hoje de hora em hora (02 e
+05 consultam o dia atual à parte, CPV_HOJE / HORARIOS_HOJE), o pipeline
+completo (demografia, posicionamentos, públicos...) uma vez por dia.
+
+Uma cadência nunca se sobrepõe a si mesma: cada uma segura a própria trava
+de arquivo (agendamento-<cadencia>.lock, flock/msvcrt — liberada pelo sistema
+se o processo morrer), compartilhada entre o loop e o cron/systemd/schtasks.
+Quem encontra a trava ocupada espera até ESPERA_TRAVA_MIN e então desiste
+daquela vez. Cadências diferentes rodam em paralelo — a intradiária não fica
+parada atrás do pipeline diário: as saídas em comum (CSVs do 02/05 e
+dashboard.html) são gravadas de forma atômica (dados.py) e o armazém SQLite
+serializa as escritas.
+
+Antes de começar, cada execução espera um atraso aleatório de até
+JITTER_SEGUNDOS, para que várias contas/máquinas agendadas no mesmo horário
+não consultem a API no mesmo instante (no systemd o atraso é o
+RandomizedDelaySec do timer).
+
+Ao fim de cada execução o servidor local dos dashboards (servidor.py), se
+estiver no ar em SERVIDOR_URL, é avisado para reler os dados e atualizar os
+navegadores abertos.
+
+Variáveis de ambiente (.env):
+  AGENDA_HORARIO          horário do pipeline completo (padrão 08:00)
+  AGENDA_INTRADIA_MIN     intervalo do CPV intradiário em minutos (padrão 60; 0 desliga)
+  AGENDA_JITTER           atraso aleatório máximo em segundos (padrão 300)
+  AGENDA_ESPERA_TRAVA_MIN espera máxima pela execução anterior da mesma cadência (padrão 30)
 
 Log: agendamento.log
 """
@@ -14,29 +49,64 @@ Log: agendamento.log
 import subprocess
 import sys
 import os
+import random
+import shutil
+import threading
 import time
 import logging
 import argparse
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import metricas
+import servidor
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
 
 # ─────────────────────────────────────────────
 # CONFIGURAÇÃO
 # ─────────────────────────────────────────────
 
 # Horário de execução diária (formato HH:MM)
-HORARIO_DIARIO = "08:00"
+HORARIO_DIARIO = os.getenv("AGENDA_HORARIO", "08:00")
 
-# Intervalo em horas para modo contínuo (alternativo ao horário fixo)
-INTERVALO_HORAS = 24
+# Intervalo do CPV intradiário, em minutos (0 desliga a cadência)
+INTERVALO_INTRADIA_MIN = int(os.getenv("AGENDA_INTRADIA_MIN", "60"))
 
-# Nome da tarefa no Agendador do Windows
-NOME_TAREFA = "FacebookAdsPipeline"
+# Atraso aleatório antes de cada execução e espera máxima pela trava
+JITTER_SEGUNDOS   = int(os.getenv("AGENDA_JITTER", "300"))
+ESPERA_TRAVA_MIN  = int(os.getenv("AGENDA_ESPERA_TRAVA_MIN", "30"))
+
+# Nome da tarefa no Agendador do Windows / prefixo das unidades systemd
+NOME_TAREFA  = "FacebookAdsPipeline"
+NOME_SYSTEMD = "facebook-ads"
 
 BASE_DIR  = Path(__file__).parent
 LOG_FILE  = BASE_DIR / "agendamento.log"
 PYTHON    = sys.executable
 RUNNER    = BASE_DIR / "run_all.py"
+ESTE      = Path(__file__).resolve()
+
+# Execuções agendadas buscam só os dias novos e reaproveitam o armazém local;
+# o cache de respostas (cache.py) é para iteração manual, não para o agendamento
+ARGS_PIPELINE = ["--incremental", "--sem-cache", "--sem-abrir"]
+
+# nome → quando ("horario" HH:MM diário ou "minutos" de intervalo) e etapas
+# do run_all (--etapas; None = pipeline completo)
+CADENCIAS = {
+    "diaria":   {"horario": HORARIO_DIARIO, "etapas": None},
+    "intradia": {"minutos": INTERVALO_INTRADIA_MIN, "etapas": "02,05,07"},
+}
+if INTERVALO_INTRADIA_MIN <= 0:
+    del CADENCIAS["intradia"]
 
 # ─────────────────────────────────────────────
 # LOGGING
@@ -54,114 +124,416 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
+# ─────────────────────────────────────────────
+# TRAVA ENTRE PROCESSOS
+# ─────────────────────────────────────────────
+
+def _travar(f):
+    f.seek(0)
+    if os.name == "nt":
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _destravar(f):
+    f.seek(0)
+    if os.name == "nt":
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def arquivo_trava(nome):
+    """Trava da cadência `nome` (agendamento-<nome>.lock)."""
+    return BASE_DIR / f"agendamento-{nome}.lock"
+
+
+@contextmanager
+def trava(nome, descricao, espera=0):
+    """
+    Trava exclusiva da cadência `nome`. Tenta por até `espera` segundos e
+    entrega True se conseguiu, False se outra execução continua com ela.
+    O arquivo guarda quem está executando (lido pelo --status).
+    """
+    f = open(arquivo_trava(nome), "a+", encoding="utf-8")
+    limite = time.monotonic() + espera
+    while True:
+        try:
+            _travar(f)
+            break
+        except OSError:
+            if time.monotonic() >= limite:
+                f.close()
+                yield False
+                return
+            time.sleep(5)
+    try:
+        f.seek(0)
+        f.truncate()
+        f.write(f"{descricao} · pid {os.getpid()} · desde {datetime.now():%Y-%m-%d %H:%M:%S}\n")
+        f.flush()
+        yield True
+    finally:
+        _destravar(f)
+        f.close()
+
+
+def em_andamento(nome):
+    """Descrição da execução da cadência `nome` que segura a trava, ou None."""
+    if not arquivo_trava(nome).exists():
+        return None
+    with open(arquivo_trava(nome), "a+", encoding="utf-8") as f:
+        try:
+            _travar(f)
+        except OSError:
+            f.seek(0)
+            return f.read().strip() or "execucao em andamento"
+        _destravar(f)
+    return None
+
+
 # ─────────────────────────────────────────────
 # EXECUTOR
 # ─────────────────────────────────────────────
 
-def executar_pipeline():
-    log.info("Iniciando pipeline...")
-    inicio = datetime.now()
+def executar_pipeline(etapas=None):
+    log.info(f"Iniciando pipeline{f' (etapas {etapas})' if etapas else ''}...")
+    inicio = time.perf_counter()
+    extras = ["--etapas", etapas] if etapas else []
     try:
         result = subprocess.run(
-            [PYTHON, str(RUNNER)],
+            [PYTHON, str(RUNNER), *ARGS_PIPELINE, *extras],
             capture_output=True,
             text=True,
             encoding="utf-8",
             errors="replace",
         )
-        duracao = (datetime.now() - inicio).seconds
+        duracao = time.perf_counter() - inicio
         if result.returncode == 0:
-            log.info(f"Pipeline concluido com sucesso em {duracao}s.")
+            log.info(f"Pipeline concluido com sucesso em {duracao:.1f}s.")
+            resumir_manifesto()
         else:
-            log.error(f"Pipeline falhou (codigo {result.returncode}) em {duracao}s.")
+            log.error(f"Pipeline falhou (codigo {result.returncode}) em {duracao:.1f}s.")
             if result.stderr:
                 for linha in result.stderr.strip().splitlines()[-5:]:
                     log.error(f"  {linha}")
     except Exception as e:
         log.exception(f"Erro inesperado ao executar pipeline: {e}")
+    notificar_servidor()
+
+
+def resumir_manifesto():
+    """Uma linha de log com os totais e a etapa mais lenta (metricas.py)."""
+    manifesto = metricas.ler_manifesto()
+    if not manifesto:
+        return
+    t = manifesto["totais"]
+    lenta = manifesto.get("mais_lenta") or {}
+    log.info(f"  {manifesto['etapas_ok']}/{len(manifesto['etapas'])} etapas · "
+             f"{t['chamadas_api']} chamadas API · {t['paginas_api']} paginas · "
+             f"{t['linhas_lidas']} linhas · mais lenta: {lenta.get('etapa')} "
+             f"({lenta.get('parede_s', 0):.1f}s)")
+
+
+def notificar_servidor():
+    """Pede ao servidor.py (se estiver no ar) que releia os CSVs novos."""
+    versoes = servidor.notificar()
+    if versoes is not None:
+        log.info(f"Servidor dos dashboards atualizado ({servidor.URL}) — versoes {versoes}.")
+
+
+def executar_cadencia(nome, jitter=True):
+    """Uma execução da cadência `nome`: atraso aleatório, trava e pipeline."""
+    cadencia = CADENCIAS[nome]
+    if jitter and JITTER_SEGUNDOS > 0:
+        atraso = random.uniform(0, JITTER_SEGUNDOS)
+        log.info(f"[{nome}] Aguardando {atraso:.0f}s (jitter) antes de iniciar...")
+        time.sleep(atraso)
+
+    with trava(nome, f"cadencia {nome}", ESPERA_TRAVA_MIN * 60) as livre:
+        if not livre:
+            log.warning(f"[{nome}] A execucao anterior desta cadencia continua apos "
+                        f"{ESPERA_TRAVA_MIN} min — esta execucao foi ignorada.")
+            return False
+        executar_pipeline(cadencia["etapas"])
+        return True
 
 
 # ─────────────────────────────────────────────
-# MODO LOOP CONTINUO (schedule puro)
+# MODO LOOP CONTINUO
 # ─────────────────────────────────────────────
 
-def modo_loop():
-    """Mantém o processo vivo e roda o pipeline no horário configurado."""
-    try:
-        import schedule
-    except ImportError:
-        log.error("Instale a biblioteca: pip install schedule")
-        sys.exit(1)
+def proxima_execucao(cadencia, agora):
+    """Próximo horário da cadência depois de `agora`."""
+    if "horario" in cadencia:
+        hora, minuto = map(int, cadencia["horario"].split(":"))
+        alvo = agora.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+        return alvo if alvo > agora else alvo + timedelta(days=1)
+    # Intervalos alinhados ao relógio a partir da meia-noite (ex.: 60 → hh:00)
+    passo = cadencia["minutos"]
+    meia_noite = agora.replace(hour=0, minute=0, second=0, microsecond=0)
+    decorridos = int((agora - meia_noite).total_seconds() // 60)
+    return meia_noite + timedelta(minutes=(decorridos // passo + 1) * passo)
 
-    log.info(f"Agendamento iniciado — execucao diaria as {HORARIO_DIARIO}.")
-    log.info("Pressione Ctrl+C para encerrar.")
 
-    # Executa imediatamente na primeira vez
-    executar_pipeline()
+def _disparar(nome):
+    # Em thread: o loop continua agendando; a trava da cadência impede que
+    # ela se sobreponha a si mesma (cadências diferentes rodam juntas)
+    threading.Thread(target=executar_cadencia, args=(nome,), name=f"cadencia-{nome}",
+                     daemon=True).start()
 
-    schedule.every().day.at(HORARIO_DIARIO).do(executar_pipeline)
 
+def modo_loop():
+    """Mantém o processo vivo e dispara cada cadência no seu horário."""
+    for nome, cadencia in CADENCIAS.items():
+        quando = (f"diariamente as {cadencia['horario']}" if "horario" in cadencia
+                  else f"a cada {cadencia['minutos']} min")
+        log.info(f"Cadencia '{nome}': {quando} — etapas {cadencia['etapas'] or 'todas'}.")
+    log.info(f"Agendamento iniciado (jitter ate {JITTER_SEGUNDOS}s). Pressione Ctrl+C para encerrar.")
+
+    # Executa imediatamente na primeira vez (pipeline completo, sem jitter)
+    threading.Thread(target=executar_cadencia, args=("diaria", False), daemon=True).start()
+
+    agenda = {nome: proxima_execucao(c, datetime.now()) for nome, c in CADENCIAS.items()}
     try:
         while True:
-            schedule.run_pending()
-            time.sleep(60)
+            nome = min(agenda, key=agenda.get)
+            espera = (agenda[nome] - datetime.now()).total_seconds()
+            if espera > 0:
+                # Dorme até a próxima cadência (em trechos, para acompanhar
+                # mudanças no relógio do sistema)
+                time.sleep(min(espera, 300))
+                continue
+            _disparar(nome)
+            agenda[nome] = proxima_execucao(CADENCIAS[nome], datetime.now())
     except KeyboardInterrupt:
         log.info("Agendamento encerrado pelo usuario.")
 
 
 # ─────────────────────────────────────────────
-# AGENDADOR DE TAREFAS DO WINDOWS (schtasks)
+# EXPORTAÇÃO — cron e systemd
+# ─────────────────────────────────────────────
+
+def _comando(nome, jitter=True):
+    return f'"{PYTHON}" "{ESTE}" --executar {nome}' + ("" if jitter else " --sem-jitter")
+
+
+def _marcador(nome):
+    return f"# {NOME_TAREFA}:{nome}"
+
+
+def _intervalo(cadencia):
+    """Minutos da cadência, se cron/systemd/schtasks conseguem representá-los."""
+    passo = cadencia["minutos"]
+    if (passo < 60 and 60 % passo == 0) or (passo % 60 == 0 and 24 % (passo // 60) == 0):
+        return passo
+    raise ValueError(f"intervalo de {passo} min nao cabe no agendador do sistema "
+                     f"(use divisores de 60 min ou de 24 h, ou o loop continuo)")
+
+
+def _cron_quando(cadencia):
+    if "horario" in cadencia:
+        hora, minuto = map(int, cadencia["horario"].split(":"))
+        return f"{minuto} {hora} * * *"
+    passo = _intervalo(cadencia)
+    return f"*/{passo} * * * *" if passo < 60 else f"0 */{passo // 60} * * *"
+
+
+def linhas_cron():
+    """Uma linha de crontab por cadência, com marcador para remoção."""
+    return [f"{_cron_quando(c)} cd \"{BASE_DIR}\" && {_comando(nome)} >/dev/null 2>&1 {_marcador(nome)}"
+            for nome, c in CADENCIAS.items()]
+
+
+def _systemd_quando(cadencia):
+    if "horario" in cadencia:
+        return f"*-*-* {cadencia['horario']}:00"
+    passo = _intervalo(cadencia)
+    return f"*:0/{passo}" if passo < 60 else f"*-*-* 0/{passo // 60}:00:00"
+
+
+def unidades_systemd():
+    """{nome do arquivo: conteúdo} das unidades .service e .timer de cada cadência."""
+    unidades = {}
+    for nome, c in CADENCIAS.items():
+        base = f"{NOME_SYSTEMD}-{nome}"
+        unidades[f"{base}.service"] = (
+            "[Unit]\n"
+            f"Description=Facebook Ads pipeline ({nome})\n\n"
+            "[Service]\n"
+            "Type=oneshot\n"
+            f"WorkingDirectory={BASE_DIR}\n"
+            f"ExecStart={_comando(nome, jitter=False)}\n"
+        )
+        unidades[f"{base}.timer"] = (
+            "[Unit]\n"
+            f"Description=Facebook Ads pipeline ({nome})\n\n"
+            "[Timer]\n"
+            f"OnCalendar={_systemd_quando(c)}\n"
+            f"RandomizedDelaySec={JITTER_SEGUNDOS}\n"
+            "Persistent=true\n\n"
+            "[Install]\n"
+            "WantedBy=timers.target\n"
+        )
+    return unidades
+
+
+def exportar(formato):
+    if formato == "cron":
+        print("\n".join(linhas_cron()))
+        return
+    for arquivo, conteudo in unidades_systemd().items():
+        print(f"# ~/.config/systemd/user/{arquivo}")
+        print(conteudo)
+
+
+# ─────────────────────────────────────────────
+# AGENDADOR DO SISTEMA
 # ─────────────────────────────────────────────
 
+def _agendador():
+    """"schtasks", "systemd" ou "cron" — o que este sistema oferece."""
+    if os.name == "nt":
+        return "schtasks"
+    if shutil.which("systemctl"):
+        teste = subprocess.run(["systemctl", "--user", "show-environment"],
+                               capture_output=True, text=True)
+        if teste.returncode == 0:
+            return "systemd"
+    if shutil.which("crontab"):
+        return "cron"
+    return None
+
+
+def _nome_tarefa(nome):
+    return NOME_TAREFA if nome == "diaria" else f"{NOME_TAREFA}-{nome}"
+
+
+def _schtasks_quando(cadencia):
+    if "horario" in cadencia:
+        return ["/sc", "DAILY", "/st", cadencia["horario"]]
+    passo = _intervalo(cadencia)
+    if passo % 60 == 0:
+        return ["/sc", "HOURLY", "/mo", str(passo // 60)]
+    return ["/sc", "MINUTE", "/mo", str(passo)]
+
+
+def _crontab_atual():
+    result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
+    linhas = result.stdout.splitlines() if result.returncode == 0 else []
+    return [l for l in linhas if f"# {NOME_TAREFA}:" not in l]
+
+
+def _gravar_crontab(linhas):
+    result = subprocess.run(["crontab", "-"], input="\n".join(linhas) + "\n",
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        log.error(f"Falha ao gravar o crontab: {result.stderr.strip()}")
+    return result.returncode == 0
+
+
+def _dir_systemd():
+    return Path.home() / ".config" / "systemd" / "user"
+
+
 def instalar_tarefa():
-    """Registra o pipeline no Agendador de Tarefas do Windows."""
-    hora, minuto = HORARIO_DIARIO.split(":")
-    cmd = [
-        "schtasks", "/create",
-        "/tn",  NOME_TAREFA,
-        "/tr",  f'"{PYTHON}" "{RUNNER}"',
-        "/sc",  "DAILY",
-        "/st",  HORARIO_DIARIO,
-        "/ru",  os.environ.get("USERNAME", "SYSTEM"),
-        "/f",                    # sobrescreve se já existir
-        "/rl", "HIGHEST",        # executa com privilégios elevados
-    ]
-    log.info(f"Registrando tarefa '{NOME_TAREFA}' para rodar diariamente as {HORARIO_DIARIO}...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0:
-        log.info("Tarefa registrada com sucesso no Agendador do Windows.")
-        log.info(f"Para verificar: Agendador de Tarefas > Biblioteca > {NOME_TAREFA}")
+    """Registra cada cadência no agendador do sistema."""
+    agendador = _agendador()
+    if agendador == "schtasks":
+        for nome, c in CADENCIAS.items():
+            cmd = [
+                "schtasks", "/create",
+                "/tn",  _nome_tarefa(nome),
+                "/tr",  _comando(nome),
+                *_schtasks_quando(c),
+                "/ru",  os.environ.get("USERNAME", "SYSTEM"),
+                "/f",                    # sobrescreve se já existir
+                "/rl", "HIGHEST",        # executa com privilégios elevados
+            ]
+            log.info(f"Registrando tarefa '{_nome_tarefa(nome)}'...")
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode == 0:
+                log.info("Tarefa registrada com sucesso no Agendador do Windows.")
+            else:
+                log.error(f"Falha ao registrar tarefa: {result.stderr.strip()}")
+                log.error("Tente executar como Administrador.")
+    elif agendador == "systemd":
+        destino = _dir_systemd()
+        destino.mkdir(parents=True, exist_ok=True)
+        for arquivo, conteudo in unidades_systemd().items():
+            (destino / arquivo).write_text(conteudo, encoding="utf-8")
+        timers = [f"{NOME_SYSTEMD}-{nome}.timer" for nome in CADENCIAS]
+        subprocess.run(["systemctl", "--user", "daemon-reload"], check=False)
+        result = subprocess.run(["systemctl", "--user", "enable", "--now", *timers],
+                                capture_output=True, text=True)
+        if result.returncode == 0:
+            log.info(f"Timers systemd ativados: {', '.join(timers)} (em {destino}).")
+            log.info("Para rodar sem sessao aberta: loginctl enable-linger $USER")
+        else:
+            log.error(f"Falha ao ativar os timers: {result.stderr.strip()}")
+    elif agendador == "cron":
+        if _gravar_crontab(_crontab_atual() + linhas_cron()):
+            log.info(f"{len(CADENCIAS)} linha(s) adicionada(s) ao crontab.")
     else:
-        log.error(f"Falha ao registrar tarefa: {result.stderr.strip()}")
-        log.error("Tente executar como Administrador.")
+        log.error("Nenhum agendador encontrado (schtasks, systemd ou cron). "
+                  "Use o loop continuo ou --exportar.")
 
 
 def remover_tarefa():
-    """Remove a tarefa do Agendador de Tarefas do Windows."""
-    cmd = ["schtasks", "/delete", "/tn", NOME_TAREFA, "/f"]
-    log.info(f"Removendo tarefa '{NOME_TAREFA}'...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0:
-        log.info("Tarefa removida com sucesso.")
+    """Remove as cadências do agendador do sistema."""
+    agendador = _agendador()
+    if agendador == "schtasks":
+        for nome in CADENCIAS:
+            log.info(f"Removendo tarefa '{_nome_tarefa(nome)}'...")
+            result = subprocess.run(["schtasks", "/delete", "/tn", _nome_tarefa(nome), "/f"],
+                                    capture_output=True, text=True)
+            if result.returncode == 0:
+                log.info("Tarefa removida com sucesso.")
+            else:
+                log.error(f"Falha ao remover: {result.stderr.strip()}")
+    elif agendador == "systemd":
+        timers = [f"{NOME_SYSTEMD}-{nome}.timer" for nome in CADENCIAS]
+        subprocess.run(["systemctl", "--user", "disable", "--now", *timers],
+                       capture_output=True, text=True)
+        for arquivo in unidades_systemd():
+            (_dir_systemd() / arquivo).unlink(missing_ok=True)
+        subprocess.run(["systemctl", "--user", "daemon-reload"], check=False)
+        log.info(f"Timers systemd removidos: {', '.join(timers)}.")
+    elif agendador == "cron":
+        if _gravar_crontab(_crontab_atual()):
+            log.info("Linhas do pipeline removidas do crontab.")
     else:
-        log.error(f"Falha ao remover: {result.stderr.strip()}")
+        log.error("Nenhum agendador encontrado (schtasks, systemd ou cron).")
 
 
 def status_tarefa():
-    """Exibe status da tarefa e últimas linhas do log."""
-    # Status no Agendador do Windows
-    print("\n--- Agendador de Tarefas do Windows ---")
-    result = subprocess.run(
-        ["schtasks", "/query", "/tn", NOME_TAREFA, "/fo", "LIST"],
-        capture_output=True, text=True
-    )
-    if result.returncode == 0:
-        print(result.stdout)
-    else:
-        print(f"Tarefa '{NOME_TAREFA}' nao encontrada no Agendador.")
+    """Exibe o agendador, a execução em andamento e as últimas linhas do log."""
+    agendador = _agendador()
+    print(f"\n--- Agendador: {agendador or 'nenhum encontrado'} ---")
+    if agendador == "schtasks":
+        for nome in CADENCIAS:
+            result = subprocess.run(
+                ["schtasks", "/query", "/tn", _nome_tarefa(nome), "/fo", "LIST"],
+                capture_output=True, text=True
+            )
+            print(result.stdout if result.returncode == 0
+                  else f"Tarefa '{_nome_tarefa(nome)}' nao encontrada no Agendador.")
+    elif agendador == "systemd":
+        result = subprocess.run(["systemctl", "--user", "list-timers", f"{NOME_SYSTEMD}-*"],
+                                capture_output=True, text=True)
+        print(result.stdout.strip() or "Nenhum timer instalado.")
+    elif agendador == "cron":
+        result = subprocess.run(["crontab", "-l"], capture_output=True, text=True)
+        linhas = [l for l in result.stdout.splitlines() if f"# {NOME_TAREFA}:" in l]
+        print("\n".join(linhas) or "Nenhuma linha do pipeline no crontab.")
+
+    print("\n--- Execucoes em andamento ---")
+    andamento = {nome: em_andamento(nome) for nome in CADENCIAS}
+    print("\n".join(f"{nome}: {desc}" for nome, desc in andamento.items() if desc) or "Nenhuma.")
 
     # Últimas linhas do log
-    print("--- Ultimas execucoes (agendamento.log) ---")
+    print("\n--- Ultimas execucoes (agendamento.log) ---")
     if LOG_FILE.exists():
         linhas = LOG_FILE.read_text(encoding="utf-8").splitlines()
         for linha in linhas[-20:]:
@@ -179,21 +551,36 @@ def main():
         description="Agendamento automatico do pipeline Facebook Ads"
     )
     parser.add_argument("--instalar", action="store_true",
-                        help="Registra no Agendador de Tarefas do Windows")
+                        help="Registra as cadencias no agendador do sistema (schtasks, systemd ou cron)")
     parser.add_argument("--remover",  action="store_true",
-                        help="Remove do Agendador de Tarefas do Windows")
+                        help="Remove as cadencias do agendador do sistema")
     parser.add_argument("--status",   action="store_true",
-                        help="Exibe status e log recente")
+                        help="Exibe agendador, execucao em andamento e log recente")
+    parser.add_argument("--exportar", choices=["cron", "systemd"],
+                        help="Imprime as linhas de crontab ou as unidades systemd")
+    parser.add_argument("--executar", choices=list(CADENCIAS), metavar="CADENCIA",
+                        help=f"Uma execucao da cadencia ({', '.join(CADENCIAS)})")
+    parser.add_argument("--sem-jitter", action="store_true",
+                        help="Com --executar, comeca sem o atraso aleatorio")
     args = parser.parse_args()
 
-    if args.instalar:
-        instalar_tarefa()
-    elif args.remover:
-        remover_tarefa()
-    elif args.status:
-        status_tarefa()
-    else:
-        modo_loop()
+    try:
+        if args.instalar:
+            instalar_tarefa()
+        elif args.remover:
+            remover_tarefa()
+        elif args.status:
+            status_tarefa()
+        elif args.exportar:
+            exportar(args.exportar)
+        elif args.executar:
+            executar_cadencia(args.executar, jitter=not args.sem_jitter)
+        else:
+            modo_loop()
+    except ValueError as e:
+        # Intervalo de cadência que o agendador do sistema não representa
+        log.error(str(e))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
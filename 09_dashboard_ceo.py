@@ -7,13 +7,25 @@ Gera:
   dashboard_ceo.html        — dashboard interativo
   relatorio_ceo.csv         — dados consolidados por imersão
   relatorio_ceo_publicos.csv— dados por público/segmentação
+
+Lê campanhas.csv (01) e publicos.csv (11); sem os CSVs usa dados de amostra.
+Layout, estilos e gráficos ficam em modelos/dashboard_ceo.* (modelos.py).
 """
 
 import csv
-import json
 from pathlib import Path
 from datetime import date
 
+from dotenv import load_dotenv
+
+# Antes dos módulos do projeto: dados, formatos, metricas e modelos leem o .env ao importar
+load_dotenv()
+
+import formatos
+import metricas
+import modelos
+from dados import caminho, gravar_texto, ler_csv
+
 try:
     import pandas as pd
     PANDAS_OK = True
@@ -21,6 +33,7 @@ except ImportError:
     PANDAS_OK = False
 
 BASE_DIR = Path(__file__).parent
+TITULO   = "Dashboard CEO — Facebook Ads"
 
 # ─────────────────────────────────────────────
 # CONSTANTES DE NEGÓCIO
@@ -31,9 +44,9 @@ TICKET_MEDIO        = 297           # Ticket médio do produto principal (R$)
 PRECO_MENTORIA      = 28_000        # Preço da mentoria (R$)
 CENARIOS_MENTORIA   = [0.07, 0.10, 0.14]  # Taxas de conversão: conservador, realista, otimista
 
-OUTPUT_HTML         = BASE_DIR / "dashboard_ceo.html"
-OUTPUT_CSV_CEO      = BASE_DIR / "relatorio_ceo.csv"
-OUTPUT_CSV_PUBLICOS = BASE_DIR / "relatorio_ceo_publicos.csv"
+OUTPUT_HTML         = caminho("dashboard_ceo.html")
+OUTPUT_CSV_CEO      = caminho("relatorio_ceo.csv")
+OUTPUT_CSV_PUBLICOS = caminho("relatorio_ceo_publicos.csv")
 
 
 # ─────────────────────────────────────────────
@@ -97,81 +110,71 @@ def _amostra_publicos():
 # LOADERS
 # ─────────────────────────────────────────────
 
-def _identificar_tipo(nome):
-    n = str(nome).lower()
-    if "remarketing" in n or "retarget" in n: return "Remarketing"
-    if "lal" in n or "lookalike" in n:        return "Prospecting LAL"
-    if "brand" in n or "awareness" in n:      return "Brand Awareness"
-    if "video" in n:                          return "Video Views"
-    if "lead" in n:                           return "Lead Generation"
-    return "Outros"
-
 def load_imersoes():
-    if PANDAS_OK:
-        p = BASE_DIR / "campanhas.csv"
-        if p.exists():
-            df = pd.read_csv(p)
-            df.columns = [c.lower().strip() for c in df.columns]
-            df["imersao"] = df["campanha"].str.extract(
-                r'(Imer[sS][aã][oO]\s+\S+)', expand=False
-            ).fillna("Campanha Atual")
-            g = df.groupby("imersao").agg(
-                gasto=("gasto", "sum"),
-                compras=("conversoes", "sum"),
-                cliques=("cliques", "sum"),
-            ).reset_index()
-            if g["gasto"].sum() > 100:
-                rows = []
-                for _, r in g.iterrows():
-                    leads     = int(r["compras"] * 8.5)
-                    page_views = int(r["compras"] * 3.8)
-                    checkouts  = int(r["compras"] * 1.3)
-                    rows.append({
-                        "imersao":        r["imersao"],
-                        "gasto":          float(r["gasto"]),
-                        "leads":          leads,
-                        "page_views":     page_views,
-                        "checkouts":      checkouts,
-                        "compras":        int(r["compras"]),
-                        "receita_direta": int(r["compras"]) * TICKET_MEDIO,
-                    })
-                return rows
+    df = ler_csv("campanhas.csv")
+    if df is not None:
+        df["imersao"] = formatos.imersoes(df["campanha"])
+        g = df.groupby("imersao").agg(
+            gasto=("gasto", "sum"),
+            compras=("conversoes", "sum"),
+            cliques=("cliques", "sum"),
+        ).reset_index()
+        if g["gasto"].sum() > 100:
+            compras = g["compras"].astype("int64")
+            return pd.DataFrame({
+                "imersao":        g["imersao"],
+                "gasto":          g["gasto"].astype(float),
+                "leads":          (compras * 8.5).astype("int64"),
+                "page_views":     (compras * 3.8).astype("int64"),
+                "checkouts":      (compras * 1.3).astype("int64"),
+                "compras":        compras,
+                "receita_direta": compras * TICKET_MEDIO,
+            }).to_dict("records")
     return _amostra_imersoes()
 
 def load_tipos():
-    if PANDAS_OK:
-        p = BASE_DIR / "campanhas.csv"
-        if p.exists():
-            df = pd.read_csv(p)
-            df.columns = [c.lower().strip() for c in df.columns]
-            df["tipo"] = df["campanha"].apply(_identificar_tipo)
-            g = df.groupby("tipo").agg(
-                gasto=("gasto", "sum"),
-                compras=("conversoes", "sum"),
-                leads=("cliques", "sum"),
-            ).reset_index()
-            return g.rename(columns={"leads": "leads"}).to_dict("records")
+    df = ler_csv("campanhas.csv")
+    if df is not None:
+        df["tipo"] = formatos.tipos_campanha(df["campanha"])
+        g = df.groupby("tipo").agg(
+            gasto=("gasto", "sum"),
+            compras=("conversoes", "sum"),
+            leads=("cliques", "sum"),
+        ).reset_index()
+        return g.rename(columns={"leads": "leads"}).to_dict("records")
     return _amostra_tipos()
 
 def load_desperdicio():
-    if PANDAS_OK:
-        p = BASE_DIR / "campanhas.csv"
-        if p.exists():
-            df = pd.read_csv(p)
-            df.columns = [c.lower().strip() for c in df.columns]
-            waste = df[df["conversoes"] == 0].sort_values("gasto", ascending=False).head(15)
-            if len(waste) > 0:
-                return [
-                    {"campanha": r["campanha"], "gasto": float(r["gasto"]),
-                     "compras": 0, "leads": int(r.get("cliques", 0))}
-                    for _, r in waste.iterrows()
-                ]
+    df = ler_csv("campanhas.csv")
+    if df is not None:
+        waste = df[df["conversoes"] == 0].sort_values("gasto", ascending=False).head(15)
+        if len(waste) > 0:
+            return pd.DataFrame({
+                "campanha": waste["campanha"],
+                "gasto":    waste["gasto"].astype(float),
+                "compras":  0,
+                "leads":    waste["cliques"].astype("int64") if "cliques" in waste else 0,
+            }).to_dict("records")
     return _amostra_desperdicio()
 
 def load_publicos():
+    df = ler_csv("publicos.csv")
+    if df is not None and not df.empty:
+        colunas = ["publico", "tipo", "gasto", "leads", "compras", "cpv"]
+        return df.sort_values("gasto", ascending=False)[colunas].to_dict("records")
     return _amostra_publicos()
 
 
+def carregar_dados():
+    """Imersões, tipos, desperdício e públicos (CSV ou amostra)."""
+    return {
+        "imersoes":    load_imersoes(),
+        "tipos":       load_tipos(),
+        "desperdicio": load_desperdicio(),
+        "publicos":    load_publicos(),
+    }
+
+
 # ─────────────────────────────────────────────
 # KPIs
 # ─────────────────────────────────────────────
@@ -286,23 +289,44 @@ def exportar_csvs(imersoes, publicos):
         w.writeheader()
         w.writerows(publicos)
 
+    metricas.gravado(OUTPUT_CSV_CEO, linhas=len(imersoes))
+    metricas.gravado(OUTPUT_CSV_PUBLICOS, linhas=len(publicos))
     print(f"[OK] {OUTPUT_CSV_CEO.name} — {len(imersoes)} imersoes")
     print(f"[OK] {OUTPUT_CSV_PUBLICOS.name} — {len(publicos)} publicos")
 
 
 # ─────────────────────────────────────────────
-# HTML GENERATOR
+# HTML — modelos/dashboard_ceo.{html,css,js}
 # ─────────────────────────────────────────────
 
-def gerar_html(kpis, insights, dados):
+# Fragmentos repetidos, compilados uma vez (modelos.py)
+KPI_CARD = modelos.compilar(
+    '<div class="kpi-card" style="{{ borda }}"><span class="kpi-icon">{{ icone }}</span>'
+    '<div class="kpi-label">{{ label }}</div><div class="kpi-value">{{ valor }}</div></div>')
+INSIGHT_CARD = modelos.compilar(
+    '<div class="insight-card" style="border-left-color:{{ cor }}">'
+    '<span class="insight-icon">{{ icone }}</span>'
+    '<div><div class="insight-titulo">{{ titulo }}</div><div class="insight-texto">{{ texto }}</div></div></div>')
+CENARIO_CARD = modelos.compilar(
+    '<div class="cenario-card" style="border-color:{{ cor }};background:{{ fundo }}">'
+    '<div class="cen-taxa" style="color:{{ cor }}">{{ taxa }}%</div>'
+    '<div class="cen-nome">{{ nome }}</div>'
+    '<div class="cen-receita">{{ receita }}</div>'
+    '<div class="cen-roas">ROAS {{ roas }}x</div></div>')
+RECOMENDACAO = modelos.compilar(
+    '<div class="recom-item"><span>🔴</span><div>'
+    '<strong>{{ campanha }}</strong><br>'
+    '<small>R$ {{ gasto }} gastos — 0 conversoes → pausar ou revisar criativo</small>'
+    '</div></div>')
+
+
+def montar_dados(kpis, dados):
+    """Bloco JSON com as séries dos 13 gráficos."""
     imersoes   = dados["imersoes"]
     tipos      = dados["tipos"]
     desperdicio= dados["desperdicio"]
 
     nomes = [i["imersao"] for i in imersoes]
-    gasto_total = kpis["_gasto_total"]
-
-    # ── Série de dados para os 13 gráficos ──────────────────────
 
     # Chart 1: Spend / Receita direta / Projetada por imersão
     c1_spend  = [i["gasto"] for i in imersoes]
@@ -345,13 +369,11 @@ def gerar_html(kpis, insights, dados):
     # Chart 7: Stacked barras tipo × imersão
     total_tipo_gasto = sum(t["gasto"] for t in tipos) or 1
     tipo_props = [t["gasto"] / total_tipo_gasto for t in tipos]
-    cores_tipos = ["#6366f1","#8b5cf6","#ec4899","#f59e0b","#10b981"]
-    c7_datasets = json.dumps([
+    c7_datasets = [
         {"label": t["tipo"],
-         "data": [round(i["gasto"] * tipo_props[ti], 2) for i in imersoes],
-         "backgroundColor": cores_tipos[ti % len(cores_tipos)]}
+         "data": [round(i["gasto"] * tipo_props[ti], 2) for i in imersoes]}
         for ti, t in enumerate(tipos)
-    ])
+    ]
 
     # Chart 8: Desperdício preview (top 5) — seção 4
     c8_nomes  = [d["campanha"][:30] + "…" if len(d["campanha"]) > 30 else d["campanha"]
@@ -359,14 +381,12 @@ def gerar_html(kpis, insights, dados):
     c8_gastos = [d["gasto"] for d in desperdicio[:5]]
 
     # Chart 9: Projeções 3 cenários por imersão
-    cores_cen = ["#10b981","#6366f1","#ec4899"]
     cen_labels = [f"Cenario {int(c*100)}%" for c in CENARIOS_MENTORIA]
-    c9_datasets = json.dumps([
+    c9_datasets = [
         {"label": cen_labels[ci],
-         "data": [round(i["leads"] * c * PRECO_MENTORIA) for i in imersoes],
-         "backgroundColor": cores_cen[ci] + "cc", "borderColor": cores_cen[ci], "borderWidth": 1}
+         "data": [round(i["leads"] * c * PRECO_MENTORIA) for i in imersoes]}
         for ci, c in enumerate(CENARIOS_MENTORIA)
-    ])
+    ]
 
     # Chart 10: Break-even analysis
     c10_labels = ["CPV Atual", "Meta CPV", f"BEP Direto (R${TICKET_MEDIO})",
@@ -379,7 +399,6 @@ def gerar_html(kpis, insights, dados):
         round(TICKET_MEDIO + PRECO_MENTORIA * CENARIOS_MENTORIA[1], 2),
         round(TICKET_MEDIO + PRECO_MENTORIA * CENARIOS_MENTORIA[2], 2),
     ]
-    c10_cores  = ["#6366f1","#f59e0b","#10b981","#10b981","#10b981","#10b981"]
 
     # Chart 11: Taxa Checkout → Compra por imersão
     c11_vals = [round(i["compras"]/i["checkouts"]*100, 2) if i["checkouts"] > 0 else 0
@@ -395,6 +414,30 @@ def gerar_html(kpis, insights, dados):
     c13_nomes  = [d["campanha"][:40] + "…" if len(d["campanha"]) > 40 else d["campanha"]
                   for d in desperdicio[:15]]
     c13_gastos = [d["gasto"] for d in desperdicio[:15]]
+    return {
+        "nomes":    nomes,
+        "meta_cpv": META_CPV,
+        "receita":  {"gasto": c1_spend, "direta": c1_direto, "projetada": c1_proj},
+        "cpv":      c2_cpv,
+        "funil":    {"leads": c3_leads, "page_views": c3_pv, "checkouts": c3_ck, "compras": c3_cp},
+        "funil_total": {"labels": c4_labels, "valores": c4_vals},
+        "taxas":    {"labels": c5_labels, "valores": c5_vals},
+        "tipos":    {"labels": c6_labels, "gasto": c6_gasto},
+        "tipo_imersao": c7_datasets,
+        "desperdicio_top5": {"nomes": c8_nomes, "gastos": c8_gastos},
+        "projecoes": c9_datasets,
+        "break_even": {"labels": c10_labels, "valores": c10_vals},
+        "checkout_compra": c11_vals,
+        "roas":     {"direto": c12_direto, "mentoria": c12_mentoria},
+        "desperdicio_top15": {"nomes": c13_nomes, "gastos": c13_gastos},
+    }
+
+
+def _campos(kpis, insights, dados):
+    """Campos do modelos/dashboard_ceo.html: KPIs, insights, cenários e recomendações."""
+    imersoes    = dados["imersoes"]
+    desperdicio = dados["desperdicio"]
+    gasto_total = kpis["_gasto_total"]
 
     # ── KPI cards HTML ───────────────────────────────────────────
     cpv_cor    = "#10b981" if kpis["cpv_ok"] else "#ef4444"
@@ -414,17 +457,14 @@ def gerar_html(kpis, insights, dados):
         ("🔥", "Desperdicio",        kpis["desperdicio"],       "border-color:#ef4444"),
     ]
     kpi_html = "\n".join(
-        f'<div class="kpi-card" style="{borda}"><span class="kpi-icon">{ic}</span>'
-        f'<div class="kpi-label">{lb}</div><div class="kpi-value">{vl}</div></div>'
+        KPI_CARD.renderizar(icone=ic, label=lb, valor=vl, borda=borda)
         for ic, lb, vl, borda in kpi_cards
     )
 
     # ── Insights HTML ────────────────────────────────────────────
     cores_ins = {"success":"#10b981","warning":"#f59e0b","danger":"#ef4444","info":"#6366f1"}
     insights_html = "\n".join(
-        f'<div class="insight-card" style="border-left-color:{cores_ins.get(t,"#6366f1")}">'
-        f'<span class="insight-icon">{ic}</span>'
-        f'<div><div class="insight-titulo">{ti}</div><div class="insight-texto">{tx}</div></div></div>'
+        INSIGHT_CARD.renderizar(cor=cores_ins.get(t, "#6366f1"), icone=ic, titulo=ti, texto=tx)
         for t, ic, ti, tx in insights
     )
 
@@ -439,343 +479,45 @@ def gerar_html(kpis, insights, dados):
         rd  = sum(i["receita_direta"] for i in imersoes)
         roas_c = (rd + rec) / gasto_total if gasto_total > 0 else 0
         def brl(v): return f"R$ {v:,.0f}".replace(",","X").replace(".",",").replace("X",".")
-        cenarios_html += (
-            f'<div class="cenario-card" style="border-color:{cor};background:{bg}">'
-            f'<div class="cen-taxa" style="color:{cor}">{int(c*100)}%</div>'
-            f'<div class="cen-nome">{cen_nomes[ci]}</div>'
-            f'<div class="cen-receita">{brl(rec)}</div>'
-            f'<div class="cen-roas">ROAS {roas_c:.2f}x</div></div>'
+        cenarios_html += CENARIO_CARD.renderizar(
+            cor=cor, fundo=bg, taxa=int(c*100), nome=cen_nomes[ci],
+            receita=brl(rec), roas=f"{roas_c:.2f}",
         )
 
     # ── Recomendações de desperdício ─────────────────────────────
     recom_html = "".join(
-        f'<div class="recom-item"><span>🔴</span><div>'
-        f'<strong>{d["campanha"]}</strong><br>'
-        f'<small>R$ {d["gasto"]:,.2f} gastos — 0 conversoes → pausar ou revisar criativo</small>'
-        f'</div></div>'
+        RECOMENDACAO.renderizar(campanha=d["campanha"], gasto=f"{d['gasto']:,.2f}")
         for d in sorted(desperdicio, key=lambda x: -x["gasto"])[:5]
     )
 
-    hoje = date.today().strftime("%d/%m/%Y")
-
-    # ── HTML completo ────────────────────────────────────────────
-    return f"""<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width,initial-scale=1">
-<title>Dashboard CEO — Facebook Ads</title>
-<script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-<style>
-*,*::before,*::after{{box-sizing:border-box;margin:0;padding:0}}
-:root{{
-  --bg:#0a0a14;--bg2:#0f0f1e;--bg3:#14142a;
-  --border:rgba(99,102,241,.2);
-  --text:#e2e8f0;--muted:#94a3b8;
-  --p:#6366f1;--s:#8b5cf6;--g:#10b981;--w:#f59e0b;--d:#ef4444;--pk:#ec4899;
-}}
-html{{scroll-behavior:smooth}}
-body{{background:var(--bg);color:var(--text);font-family:'Segoe UI',system-ui,sans-serif;padding:1.5rem;min-height:100vh}}
-a{{color:var(--p)}}
-
-/* ── Header ── */
-header{{text-align:center;margin-bottom:2rem}}
-header h1{{font-size:1.9rem;font-weight:700;background:linear-gradient(135deg,#6366f1,#a78bfa,#ec4899);
-  -webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text}}
-header p{{color:var(--muted);margin-top:.3rem;font-size:.9rem}}
-
-/* ── Seções ── */
-section{{margin-bottom:2.5rem}}
-.section-title{{font-size:1rem;font-weight:600;color:var(--p);text-transform:uppercase;
-  letter-spacing:.5px;margin-bottom:1.2rem;padding-bottom:.6rem;
-  border-bottom:1px solid var(--border)}}
-
-/* ── KPI Grid ── */
-.kpi-grid{{display:grid;grid-template-columns:repeat(5,1fr);gap:1rem;margin-bottom:2rem}}
-.kpi-card{{background:var(--bg2);border:1px solid;border-radius:14px;padding:1.2rem 1.4rem;
-  position:relative;overflow:hidden;transition:transform .2s,box-shadow .2s}}
-.kpi-card:hover{{transform:translateY(-3px);box-shadow:0 8px 24px rgba(0,0,0,.4)}}
-.kpi-icon{{position:absolute;top:.8rem;right:1rem;font-size:1.4rem;opacity:.45}}
-.kpi-label{{font-size:.72rem;color:var(--muted);text-transform:uppercase;letter-spacing:.8px}}
-.kpi-value{{font-size:1.5rem;font-weight:700;margin-top:.3rem;color:#f1f5f9}}
-
-/* ── Insights ── */
-.insights-grid{{display:grid;grid-template-columns:repeat(auto-fit,minmax(260px,1fr));gap:1rem}}
-.insight-card{{background:var(--bg2);border-left:4px solid;border-radius:10px;
-  padding:1rem 1.2rem;display:flex;align-items:flex-start;gap:.8rem}}
-.insight-icon{{font-size:1.4rem;flex-shrink:0}}
-.insight-titulo{{font-weight:600;font-size:.9rem;color:#f1f5f9;margin-bottom:.2rem}}
-.insight-texto{{font-size:.82rem;color:var(--muted);line-height:1.4}}
-
-/* ── Chart grid ── */
-.charts-2{{display:grid;grid-template-columns:1fr 1fr;gap:1.2rem}}
-.charts-3{{display:grid;grid-template-columns:1fr 1fr 1fr;gap:1.2rem}}
-.charts-13{{display:grid;grid-template-columns:1fr 3fr;gap:1.2rem}}
-.chart-card{{background:var(--bg2);border:1px solid var(--border);border-radius:14px;padding:1.3rem}}
-.chart-card.full{{grid-column:1/-1}}
-.chart-card h3{{font-size:.8rem;font-weight:600;color:var(--s);text-transform:uppercase;
-  letter-spacing:.5px;margin-bottom:1rem}}
-canvas{{max-height:280px}}
-
-/* ── Cenários ── */
-.cenarios-grid{{display:grid;grid-template-columns:repeat(3,1fr);gap:1rem;margin-bottom:1.2rem}}
-.cenario-card{{border:1px solid;border-radius:14px;padding:1.5rem;text-align:center}}
-.cen-taxa{{font-size:2.2rem;font-weight:800;margin-bottom:.3rem}}
-.cen-nome{{font-size:.8rem;color:var(--muted);text-transform:uppercase;letter-spacing:.5px;margin-bottom:.8rem}}
-.cen-receita{{font-size:1.3rem;font-weight:700;color:#f1f5f9;margin-bottom:.3rem}}
-.cen-roas{{font-size:.85rem;color:var(--muted)}}
-
-/* ── Recomendações ── */
-.recom-item{{display:flex;align-items:flex-start;gap:.8rem;padding:.8rem;
-  background:rgba(239,68,68,.06);border-radius:8px;margin-bottom:.6rem;border:1px solid rgba(239,68,68,.15)}}
-.recom-item small{{color:var(--muted)}}
-
-@media(max-width:900px){{
-  .kpi-grid{{grid-template-columns:repeat(2,1fr)}}
-  .charts-2,.charts-3,.charts-13{{grid-template-columns:1fr}}
-  .cenarios-grid{{grid-template-columns:1fr}}
-}}
-</style>
-</head>
-<body>
-
-<header>
-  <h1>Dashboard CEO — Facebook Ads</h1>
-  <p>Analise executiva completa &middot; Gerado em {hoje} por 09_dashboard_ceo.py</p>
-</header>
-
-<!-- KPI Cards -->
-<div class="kpi-grid">
-{kpi_html}
-</div>
-
-<!-- Seção 1: Insights -->
-<section>
-  <div class="section-title">01 — Insights Executivos</div>
-  <div class="insights-grid">
-{insights_html}
-  </div>
-</section>
-
-<!-- Seção 2: Comparativo de Imersões -->
-<section>
-  <div class="section-title">02 — Comparativo de Imersoes</div>
-  <div class="charts-2">
-    <div class="chart-card">
-      <h3>Gasto vs Receita Direta vs Projetada</h3>
-      <canvas id="c1"></canvas>
-    </div>
-    <div class="chart-card">
-      <h3>Evolucao do CPV + Meta R${META_CPV}</h3>
-      <canvas id="c2"></canvas>
-    </div>
-  </div>
-</section>
-
-<!-- Seção 3: Funil Completo -->
-<section>
-  <div class="section-title">03 — Funil Completo</div>
-  <div class="charts-3">
-    <div class="chart-card full">
-      <h3>Funil por Imersao</h3>
-      <canvas id="c3"></canvas>
-    </div>
-    <div class="chart-card">
-      <h3>Funil Total (Horizontal)</h3>
-      <canvas id="c4"></canvas>
-    </div>
-    <div class="chart-card full" style="grid-column:2/-1">
-      <h3>Taxas de Conversao entre Estagios</h3>
-      <canvas id="c5"></canvas>
-    </div>
-  </div>
-</section>
-
-<!-- Seção 4: Distribuição por Tipo de Campanha -->
-<section>
-  <div class="section-title">04 — Distribuicao por Tipo de Campanha</div>
-  <div class="charts-3">
-    <div class="chart-card">
-      <h3>Gasto por Tipo</h3>
-      <canvas id="c6"></canvas>
-    </div>
-    <div class="chart-card">
-      <h3>Gasto por Tipo x Imersao</h3>
-      <canvas id="c7"></canvas>
-    </div>
-    <div class="chart-card">
-      <h3>Top Campanhas sem Conversao</h3>
-      <canvas id="c8"></canvas>
-    </div>
-  </div>
-</section>
-
-<!-- Seção 5: Unit Economics & Projeções -->
-<section>
-  <div class="section-title">05 — Unit Economics & Projecoes de Mentoria</div>
-  <div class="cenarios-grid">
-{cenarios_html}
-  </div>
-  <div class="charts-2">
-    <div class="chart-card">
-      <h3>Projecao por Imersao (3 Cenarios)</h3>
-      <canvas id="c9"></canvas>
-    </div>
-    <div class="chart-card">
-      <h3>Break-even: CPV vs Pontos de Equilibrio</h3>
-      <canvas id="c10"></canvas>
-    </div>
-  </div>
-</section>
-
-<!-- Seção 6: Tendências de Eficiência -->
-<section>
-  <div class="section-title">06 — Tendencias de Eficiencia</div>
-  <div class="charts-2">
-    <div class="chart-card">
-      <h3>Taxa Checkout → Compra por Imersao (%)</h3>
-      <canvas id="c11"></canvas>
-    </div>
-    <div class="chart-card">
-      <h3>ROAS Direto vs ROAS + Mentoria por Imersao</h3>
-      <canvas id="c12"></canvas>
-    </div>
-  </div>
-</section>
-
-<!-- Seção 7: Análise de Desperdício -->
-<section>
-  <div class="section-title">07 — Analise de Desperdicio</div>
-  <div class="charts-13">
-    <div class="chart-card">
-      <h3>Recomendacoes</h3>
-{recom_html}
-    </div>
-    <div class="chart-card">
-      <h3>Top 15 Campanhas — Alto Gasto, Zero Conversao</h3>
-      <canvas id="c13" style="max-height:420px"></canvas>
-    </div>
-  </div>
-</section>
-
-<script>
-Chart.defaults.color='#94a3b8';
-Chart.defaults.borderColor='rgba(255,255,255,.06)';
-Chart.defaults.font.family="'Segoe UI',system-ui,sans-serif";
-
-const BRL = v => 'R$ ' + Number(v).toLocaleString('pt-BR',{{minimumFractionDigits:2}});
-const nomes = {json.dumps(nomes)};
-
-// ── Chart 1: Spend vs Receita ───────────────────────────────
-new Chart('c1',{{type:'bar',data:{{labels:nomes,datasets:[
-  {{label:'Gasto',data:{json.dumps(c1_spend)},backgroundColor:'rgba(99,102,241,.8)',borderRadius:5}},
-  {{label:'Receita Direta',data:{json.dumps(c1_direto)},backgroundColor:'rgba(16,185,129,.8)',borderRadius:5}},
-  {{label:'Rec. Projetada (10%)',data:{json.dumps(c1_proj)},backgroundColor:'rgba(236,72,153,.8)',borderRadius:5}},
-]}},options:{{responsive:true,plugins:{{legend:{{position:'top'}}}},
-  scales:{{x:{{grid:{{display:false}}}},y:{{ticks:{{callback:BRL}}}}}}
-}}}});
-
-// ── Chart 2: CPV + meta ─────────────────────────────────────
-new Chart('c2',{{type:'line',data:{{labels:nomes,datasets:[
-  {{label:'CPV',data:{json.dumps(c2_cpv)},borderColor:'#6366f1',backgroundColor:'rgba(99,102,241,.15)',
-    fill:true,tension:.4,pointRadius:5,pointBackgroundColor:'#6366f1'}},
-  {{label:'Meta R${META_CPV}',data:{json.dumps([META_CPV]*len(nomes))},
-    borderColor:'#f59e0b',borderDash:[6,4],borderWidth:2,pointRadius:0,fill:false}},
-]}},options:{{responsive:true,plugins:{{legend:{{position:'top'}}}},
-  scales:{{x:{{grid:{{display:false}}}},y:{{ticks:{{callback:BRL}}}}}}
-}}}});
-
-// ── Chart 3: Funil agrupado ─────────────────────────────────
-new Chart('c3',{{type:'bar',data:{{labels:nomes,datasets:[
-  {{label:'Leads',data:{json.dumps(c3_leads)},backgroundColor:'rgba(99,102,241,.85)',borderRadius:4}},
-  {{label:'Page Views',data:{json.dumps(c3_pv)},backgroundColor:'rgba(139,92,246,.85)',borderRadius:4}},
-  {{label:'Checkouts',data:{json.dumps(c3_ck)},backgroundColor:'rgba(236,72,153,.85)',borderRadius:4}},
-  {{label:'Compras',data:{json.dumps(c3_cp)},backgroundColor:'rgba(16,185,129,.85)',borderRadius:4}},
-]}},options:{{responsive:true,plugins:{{legend:{{position:'top'}}}},
-  scales:{{x:{{grid:{{display:false}}}},y:{{}}}}
-}}}});
-
-// ── Chart 4: Funil horizontal ───────────────────────────────
-new Chart('c4',{{type:'bar',data:{{labels:{json.dumps(c4_labels)},datasets:[
-  {{label:'Total',data:{json.dumps(c4_vals)},
-    backgroundColor:['rgba(99,102,241,.85)','rgba(139,92,246,.85)','rgba(236,72,153,.85)','rgba(16,185,129,.85)'],
-    borderRadius:5}}
-]}},options:{{indexAxis:'y',responsive:true,plugins:{{legend:{{display:false}}}},
-  scales:{{x:{{}},y:{{grid:{{display:false}}}}}}
-}}}});
-
-// ── Chart 5: Taxas de conversão ─────────────────────────────
-new Chart('c5',{{type:'bar',data:{{labels:{json.dumps(c5_labels)},datasets:[
-  {{label:'Taxa (%)',data:{json.dumps(c5_vals)},
-    backgroundColor:['rgba(99,102,241,.8)','rgba(236,72,153,.8)','rgba(16,185,129,.8)'],
-    borderRadius:6}}
-]}},options:{{responsive:true,plugins:{{legend:{{display:false}}}},
-  scales:{{x:{{grid:{{display:false}}}},y:{{ticks:{{callback:v=>v+'%'}}}}}}
-}}}});
-
-// ── Chart 6: Doughnut tipos ─────────────────────────────────
-new Chart('c6',{{type:'doughnut',data:{{labels:{json.dumps(c6_labels)},datasets:[
-  {{data:{json.dumps(c6_gasto)},
-    backgroundColor:['#6366f1','#8b5cf6','#ec4899','#f59e0b','#10b981'],
-    borderWidth:2,borderColor:'#0f0f1e',hoverOffset:8}}
-]}},options:{{cutout:'60%',responsive:true,
-  plugins:{{legend:{{position:'right',labels:{{boxWidth:10,padding:10}}}}}}
-}}}});
-
-// ── Chart 7: Stacked tipo × imersão ────────────────────────
-new Chart('c7',{{type:'bar',data:{{labels:nomes,datasets:{c7_datasets}}},
-  options:{{responsive:true,plugins:{{legend:{{position:'top'}}}},
-    scales:{{x:{{stacked:true,grid:{{display:false}}}},y:{{stacked:true}}}}
-}}}});
-
-// ── Chart 8: Desperdício preview ────────────────────────────
-new Chart('c8',{{type:'bar',data:{{labels:{json.dumps(c8_nomes)},datasets:[
-  {{label:'Gasto sem conversao',data:{json.dumps(c8_gastos)},
-    backgroundColor:'rgba(239,68,68,.8)',borderRadius:4}}
-]}},options:{{indexAxis:'y',responsive:true,plugins:{{legend:{{display:false}}}},
-  scales:{{x:{{ticks:{{callback:BRL}}}},y:{{grid:{{display:false}}}}}}
-}}}});
-
-// ── Chart 9: Projeções 3 cenários ───────────────────────────
-new Chart('c9',{{type:'bar',data:{{labels:nomes,datasets:{c9_datasets}}},
-  options:{{responsive:true,plugins:{{legend:{{position:'top'}}}},
-    scales:{{x:{{grid:{{display:false}}}},y:{{ticks:{{callback:BRL}}}}}}
-}}}});
-
-// ── Chart 10: Break-even ────────────────────────────────────
-new Chart('c10',{{type:'bar',data:{{labels:{json.dumps(c10_labels)},datasets:[
-  {{label:'R$',data:{json.dumps(c10_vals)},
-    backgroundColor:{json.dumps(c10_cores)},borderRadius:6}}
-]}},options:{{responsive:true,plugins:{{legend:{{display:false}}}},
-  scales:{{x:{{grid:{{display:false}}}},y:{{ticks:{{callback:BRL}}}}}}
-}}}});
-
-// ── Chart 11: Taxa checkout → compra ────────────────────────
-new Chart('c11',{{type:'bar',data:{{labels:nomes,datasets:[
-  {{label:'Taxa (%)',data:{json.dumps(c11_vals)},
-    backgroundColor:'rgba(16,185,129,.8)',borderRadius:6}}
-]}},options:{{responsive:true,plugins:{{legend:{{display:false}}}},
-  scales:{{x:{{grid:{{display:false}}}},y:{{ticks:{{callback:v=>v+'%'}}}}}}
-}}}});
-
-// ── Chart 12: ROAS direto vs mentoria ───────────────────────
-new Chart('c12',{{type:'bar',data:{{labels:nomes,datasets:[
-  {{label:'ROAS Direto',data:{json.dumps(c12_direto)},backgroundColor:'rgba(99,102,241,.8)',borderRadius:4}},
-  {{label:'ROAS + Mentoria 10%',data:{json.dumps(c12_mentoria)},backgroundColor:'rgba(16,185,129,.8)',borderRadius:4}},
-]}},options:{{responsive:true,plugins:{{legend:{{position:'top'}}}},
-  scales:{{x:{{grid:{{display:false}}}},y:{{ticks:{{callback:v=>v+'x'}}}}}}
-}}}});
-
-// ── Chart 13: Top 15 desperdício ────────────────────────────
-new Chart('c13',{{type:'bar',data:{{labels:{json.dumps(c13_nomes)},datasets:[
-  {{label:'Gasto (R$)',data:{json.dumps(c13_gastos)},
-    backgroundColor:'rgba(239,68,68,.75)',borderRadius:4}}
-]}},options:{{indexAxis:'y',responsive:true,plugins:{{legend:{{display:false}}}},
-  scales:{{x:{{ticks:{{callback:BRL}}}},y:{{grid:{{display:false}},ticks:{{font:{{size:11}}}}}}}}
-}}}});
-</script>
-</body>
-</html>"""
+    return {
+        "hoje":          date.today().strftime("%d/%m/%Y"),
+        "meta_cpv":      META_CPV,
+        "kpi_html":      kpi_html,
+        "insights_html": insights_html,
+        "cenarios_html": cenarios_html,
+        "recom_html":    recom_html,
+    }
+
+
+def gerar_html(kpis, insights, dados, diretorio=None):
+    return modelos.pagina("dashboard_ceo", titulo=TITULO, dados=montar_dados(kpis, dados),
+                          diretorio=diretorio, **_campos(kpis, insights, dados))
+
+
+def painel(ao_vivo=None):
+    """
+    (kpis, dados dos gráficos, html) a partir dos CSVs atuais, sem gravar
+    nada — usado pelo servidor.py. `ao_vivo` vai para modelos.pagina.
+    """
+    dados    = carregar_dados()
+    kpis     = calcular_kpis(dados["imersoes"], dados["tipos"], dados["desperdicio"])
+    insights = gerar_insights(kpis, dados["imersoes"], dados["desperdicio"])
+    graficos = montar_dados(kpis, dados)
+    html = modelos.pagina("dashboard_ceo", titulo=TITULO, dados=graficos,
+                          ao_vivo=ao_vivo, **_campos(kpis, insights, dados))
+    publicos = {k: v for k, v in kpis.items() if not k.startswith("_")}
+    return publicos, graficos, html
 
 
 # ─────────────────────────────────────────────
@@ -784,10 +526,11 @@ new Chart('c13',{{type:'bar',data:{{labels:{json.dumps(c13_nomes)},datasets:[
 
 def main():
     print("Carregando dados...")
-    imersoes    = load_imersoes()
-    tipos       = load_tipos()
-    desperdicio = load_desperdicio()
-    publicos    = load_publicos()
+    dados       = carregar_dados()
+    imersoes    = dados["imersoes"]
+    tipos       = dados["tipos"]
+    desperdicio = dados["desperdicio"]
+    publicos    = dados["publicos"]
 
     print("Calculando KPIs...")
     kpis = calcular_kpis(imersoes, tipos, desperdicio)
@@ -799,12 +542,10 @@ def main():
     exportar_csvs(imersoes, publicos)
 
     print("Gerando dashboard_ceo.html...")
-    dados = {"imersoes": imersoes, "tipos": tipos,
-             "desperdicio": desperdicio, "publicos": publicos}
-    html = gerar_html(kpis, insights, dados)
+    html = gerar_html(kpis, insights, dados, OUTPUT_HTML.parent)
 
-    with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
-        f.write(html)
+    gravar_texto(OUTPUT_HTML, html)
+    metricas.gravado(OUTPUT_HTML)
 
     print(f"[OK] {OUTPUT_HTML.name} gerado")
     print(f"\n  KPIs:")
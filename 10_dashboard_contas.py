@@ -0,0 +1,190 @@
+"""
+10_dashboard_contas.py
+Dashboard comparativo entre contas de anúncio, gerado ao final do modo
+multi-conta (python run_all.py --contas).
+
+Lê, para cada conta de contas/contas.json (contas.py):
+  contas/<act_id>/campanhas.csv   — gasto, impressões, cliques, conversões
+  contas/<act_id>/cpv_diario.csv  — evolução do CPV
+
+Gera (em contas/):
+  dashboard_contas.html  — KPIs somados, gasto/conversões/CPA por conta,
+                           CPV diário por conta e tabela comparativa
+  contas_resumo.csv      — uma linha por conta
+
+Contas sem campanhas.csv (extração falhou) aparecem na tabela como "sem dados".
+Layout, estilos e gráficos ficam em modelos/dashboard_contas.* (modelos.py).
+"""
+
+import csv
+from datetime import date
+
+import contas
+import metricas
+import modelos
+from dados import ler_csv
+
+OUTPUT_HTML = contas.DIR_CONTAS / "dashboard_contas.html"
+OUTPUT_CSV  = contas.DIR_CONTAS / "contas_resumo.csv"
+
+
+# ─────────────────────────────────────────────
+# LOADERS
+# ─────────────────────────────────────────────
+
+def resumir_conta(conta):
+    """Totais de uma conta a partir do campanhas.csv, ou None sem dados."""
+    df = ler_csv("campanhas.csv", contas.diretorio(conta["id"]))
+    if df is None or df.empty:
+        return None
+    gasto      = float(df["gasto"].sum())
+    impressoes = int(df["impressoes"].sum())
+    cliques    = int(df["cliques"].sum())
+    conversoes = int(df["conversoes"].sum())
+    return {
+        "conta":      conta["id"],
+        "nome":       conta["nome"],
+        "campanhas":  len(df),
+        "gasto":      round(gasto, 2),
+        "impressoes": impressoes,
+        "cliques":    cliques,
+        "ctr":        round(cliques / impressoes * 100, 4) if impressoes else 0.0,
+        "conversoes": conversoes,
+        "cpa":        round(gasto / conversoes, 2) if conversoes else 0.0,
+    }
+
+
+def serie_cpv(conta):
+    """{data: cpv} do cpv_diario.csv da conta (vazio se não houver)."""
+    df = ler_csv("cpv_diario.csv", contas.diretorio(conta["id"]))
+    if df is None or df.empty:
+        return {}
+    return dict(zip(df["data"].astype(str).tolist(), df["cpv"].astype(float).tolist()))
+
+
+# ─────────────────────────────────────────────
+# EXPORT
+# ─────────────────────────────────────────────
+
+def exportar_csv(resumos):
+    campos = ["conta", "nome", "campanhas", "gasto", "impressoes",
+              "cliques", "ctr", "conversoes", "cpa"]
+    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=campos)
+        w.writeheader()
+        w.writerows(resumos)
+    metricas.gravado(OUTPUT_CSV, linhas=len(resumos))
+    print(f"[OK] {OUTPUT_CSV.name} — {len(resumos)} contas")
+
+
+def _brl(v):
+    return f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _milhar(v):
+    return f"{v:,}".replace(",", ".")
+
+
+# ─────────────────────────────────────────────
+# HTML — modelos/dashboard_contas.{html,css,js}
+# ─────────────────────────────────────────────
+
+LINHA_CONTA = modelos.compilar(
+    "<tr><td>{{ nome }}</td><td>{{ conta }}</td><td>{{ campanhas }}</td>"
+    "<td>{{ gasto }}</td><td>{{ impressoes }}</td>"
+    "<td>{{ ctr }}%</td><td>{{ conversoes }}</td><td>{{ cpa }}</td></tr>")
+LINHA_SEM_DADOS = modelos.compilar(
+    "<tr class='sem-dados'><td>{{ nome }}</td><td>{{ conta }}</td>"
+    "<td colspan='6'>sem dados</td></tr>")
+
+
+def gerar_html(resumos, sem_dados, series, diretorio=None):
+    gasto      = sum(r["gasto"] for r in resumos)
+    impressoes = sum(r["impressoes"] for r in resumos)
+    cliques    = sum(r["cliques"] for r in resumos)
+    conversoes = sum(r["conversoes"] for r in resumos)
+    ctr        = cliques / impressoes * 100 if impressoes else 0.0
+    cpa        = gasto / conversoes if conversoes else 0.0
+
+    ordenados = sorted(resumos, key=lambda r: -r["gasto"])
+
+    datas = sorted({d for s in series.values() for d in s})
+    series_cpv = [
+        {"label": r["nome"], "indice": i, "data": [series[r["conta"]].get(d) for d in datas]}
+        for i, r in enumerate(ordenados) if series.get(r["conta"])
+    ]
+
+    linhas_tabela = "".join(
+        LINHA_CONTA.renderizar(
+            nome=r["nome"], conta=r["conta"], campanhas=r["campanhas"],
+            gasto=_brl(r["gasto"]), impressoes=_milhar(r["impressoes"]),
+            ctr=f"{r['ctr']:.2f}", conversoes=_milhar(r["conversoes"]),
+            cpa=_brl(r["cpa"]) if r["conversoes"] else "—",
+        )
+        for r in ordenados
+    ) + "".join(
+        LINHA_SEM_DADOS.renderizar(nome=c["nome"], conta=c["id"])
+        for c in sem_dados
+    )
+
+    dados = {
+        "nomes":      [r["nome"] for r in ordenados],
+        "gasto":      [r["gasto"] for r in ordenados],
+        "conversoes": [r["conversoes"] for r in ordenados],
+        "cpa":        [r["cpa"] for r in ordenados],
+        "cpv":        {"datas": datas, "series": series_cpv},
+    }
+
+    return modelos.pagina(
+        "dashboard_contas",
+        titulo="Facebook Ads — Comparativo entre Contas",
+        dados=dados,
+        diretorio=diretorio,
+        n_contas=len(resumos),
+        hoje=date.today().strftime("%d/%m/%Y"),
+        gasto=_brl(gasto),
+        impressoes=_milhar(impressoes),
+        ctr=f"{ctr:.2f}%",
+        conversoes=_milhar(conversoes),
+        cpa=_brl(cpa),
+        linhas_tabela=linhas_tabela,
+    )
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+
+def main():
+    lista = contas.ler_manifesto()
+    if not lista:
+        print("[AVISO] Nenhuma conta encontrada — rode: python run_all.py --contas")
+        return
+
+    print(f"Carregando dados de {len(lista)} contas...")
+    resumos, sem_dados, series = [], [], {}
+    for conta in lista:
+        resumo = resumir_conta(conta)
+        if resumo is None:
+            sem_dados.append(conta)
+            continue
+        resumos.append(resumo)
+        series[conta["id"]] = serie_cpv(conta)
+
+    if sem_dados:
+        print(f"[AVISO] {len(sem_dados)} conta(s) sem campanhas.csv: "
+              f"{', '.join(c['id'] for c in sem_dados)}")
+
+    contas.DIR_CONTAS.mkdir(parents=True, exist_ok=True)
+    exportar_csv(resumos)
+
+    with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
+        f.write(gerar_html(resumos, sem_dados, series, OUTPUT_HTML.parent))
+    metricas.gravado(OUTPUT_HTML)
+
+    gasto = sum(r["gasto"] for r in resumos)
+    print(f"[OK] {OUTPUT_HTML.name} gerado — {len(resumos)} contas | Gasto total: {_brl(gasto)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+11_publicos.py
+Extrai performance por público (últimos 30 dias): insights por conjunto de
+anúncios + segmentação (targeting) de cada conjunto, agregados por público.
+
+Gera: publicos.csv
+Colunas: publico, tipo, conjuntos, gasto, leads, compras, cpv
+
+  publico — públicos do conjunto (personalizados, lookalikes, interesses);
+            conjuntos sem nenhum viram "Broad <idade_min>-<idade_max>"
+  tipo    — Remarketing | LAL | Interesse | Broad
+  cpv     — custo por venda (gasto / compras)
+
+Os insights chegam página a página (insights.buscar_paginas) e são somados
+por conjunto; a segmentação é lida em lotes de até 50 conjuntos enviados em
+paralelo (lote.py), em vez de uma chamada por conjunto.
+"""
+
+from insights import buscar_paginas
+from lote import buscar_objetos
+import acoes
+import dados
+import formatos
+
+OUTPUT = dados.caminho("publicos.csv")
+DATE_PRESET = "last_30d"
+
+
+def acumular(por_conjunto, insights):
+    """Soma as linhas (ex.: uma página da API) por conjunto de anúncios."""
+    for row in insights:
+        c = por_conjunto.setdefault(row.get("adset_id", ""), {
+            "nome": row.get("adset_name", "Desconhecido"),
+            "gasto": 0.0, "leads": 0.0, "compras": 0.0,
+        })
+        actions = acoes.da_linha(row)
+        c["gasto"]   += float(row.get("spend", 0))
+        c["leads"]   += actions.get("lead", 0.0)
+        c["compras"] += actions.get("purchase", 0.0)
+    return por_conjunto
+
+
+def classificar_publico(segmentacao):
+    """(publico, tipo) a partir do targeting de um conjunto."""
+    itens = []
+    for aud in segmentacao.get("custom_audiences", []) or []:
+        nome = aud.get("name") or aud.get("id", "")
+        itens.append((nome, "LAL" if formatos.lookalike(nome) else "Remarketing"))
+    for spec in segmentacao.get("flexible_spec", []) or []:
+        for interesse in spec.get("interests", []) or []:
+            itens.append((f"Interesse {interesse.get('name', '')}".strip(), "Interesse"))
+
+    if not itens:
+        idade_min = segmentacao.get("age_min", 18)
+        idade_max = segmentacao.get("age_max", 65)
+        return f"Broad {idade_min}-{idade_max}", "Broad"
+    return " + ".join(nome for nome, _ in itens), itens[0][1]
+
+
+def montar_linhas(por_conjunto, segmentacoes):
+    """Agrega os conjuntos por público e devolve as linhas do publicos.csv."""
+    por_publico = {}
+    for adset_id, c in por_conjunto.items():
+        obj = segmentacoes.get(adset_id)
+        if obj is None:
+            publico, tipo = c["nome"], "Desconhecido"
+        else:
+            publico, tipo = classificar_publico(obj.get("targeting") or {})
+
+        p = por_publico.setdefault(publico, {"tipo": tipo, "conjuntos": 0,
+                                             "gasto": 0.0, "leads": 0.0, "compras": 0.0})
+        p["conjuntos"] += 1
+        p["gasto"]     += c["gasto"]
+        p["leads"]     += c["leads"]
+        p["compras"]   += c["compras"]
+
+    rows = [
+        {
+            "publico":   publico,
+            "tipo":      p["tipo"],
+            "conjuntos": p["conjuntos"],
+            "gasto":     round(p["gasto"], 2),
+            "leads":     int(p["leads"]),
+            "compras":   int(p["compras"]),
+            "cpv":       round(p["gasto"] / p["compras"], 2) if p["compras"] else 0.0,
+        }
+        for publico, p in por_publico.items()
+    ]
+    rows.sort(key=lambda r: -r["gasto"])
+    return rows
+
+
+def salvar(rows):
+    if not rows:
+        print("[AVISO] Nenhum dado de conjunto de anúncios retornado pela API.")
+        return
+
+    dados.salvar(OUTPUT, rows, ["publico", "tipo", "conjuntos", "gasto", "leads", "compras", "cpv"])
+
+    total = sum(r["gasto"] for r in rows)
+    print(f"[OK] {OUTPUT.name} salvo — {len(rows)} publicos | Total: R$ {total:,.2f}")
+    print(f"\n     {'Publico':<40} {'Tipo':<12} {'Gasto':>12} {'Compras':>8}")
+    print(f"     {'-'*76}")
+    for r in rows[:15]:
+        print(f"     {r['publico'][:40]:<40} {r['tipo']:<12} {r['gasto']:>12,.2f} {r['compras']:>8}")
+
+
+def main():
+    fields = [
+        "adset_id",
+        "adset_name",
+        "spend",
+        "actions",
+    ]
+
+    params = {
+        "level": "adset",
+        "date_preset": DATE_PRESET,
+    }
+
+    print(f"Consultando insights por conjunto de anuncios ({DATE_PRESET})...")
+    por_conjunto = {}
+    for pagina in buscar_paginas(fields, params, consulta="11_publicos"):
+        acumular(por_conjunto, pagina)
+
+    if not por_conjunto:
+        salvar([])
+        return
+
+    print(f"Lendo segmentacao de {len(por_conjunto)} conjuntos em lotes...")
+    segmentacoes = buscar_objetos(list(por_conjunto), ["targeting"])
+
+    salvar(montar_linhas(por_conjunto, segmentacoes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+acoes.py
+Índice de ações das linhas do Insights.
+
+A API devolve `actions` e `cost_per_action_type` como listas
+[{"action_type": ..., "value": ...}] com dezenas de tipos por linha. Em vez de
+percorrer a lista a cada tipo consultado, cada lista vira um dict
+{action_type: valor} uma única vez por linha:
+
+    idx = acoes.da_linha(row)             # actions
+    idx.get("video_view", 0.0)            # 0.0 se o tipo não veio
+    acoes.somar(idx, ACOES_LEAD)
+
+O índice fica guardado na própria linha, então o 00_consolidado (três
+acumuladores sobre as mesmas linhas) monta cada índice só uma vez. Por ser
+compartilhado entre extratores, é somente leitura: consulte com .get() —
+`"video_view" in idx` continua dizendo se o tipo veio da API.
+
+Filtragem na API: `filtering` por action_type não é usado de propósito —
+a Insights API descarta as linhas sem nenhuma das ações filtradas, levando
+junto gasto, impressões e cliques dessas linhas. O enxugamento do lado da API
+fica nos `fields`, que pedem só as listas de ações realmente usadas.
+"""
+
+from types import MappingProxyType
+
+
+def indexar(lista):
+    """
+    [{action_type, value}] → {action_type: float} somente leitura; vale a 1ª
+    ocorrência do tipo.
+    """
+    indice = {}
+    for a in lista or []:
+        tipo = a.get("action_type", "")
+        if tipo not in indice:
+            indice[tipo] = float(a.get("value", 0))
+    return MappingProxyType(indice)
+
+
+def da_linha(row, campo="actions"):
+    """Índice de `row[campo]`, montado na primeira consulta e reaproveitado."""
+    chave = "_indice_" + campo
+    indice = row.get(chave)
+    if indice is None:
+        indice = row[chave] = indexar(row.get(campo))
+    return indice
+
+
+def somar(indice, tipos, inteiro=False):
+    """Soma dos valores dos tipos em `tipos` (cada valor truncado se `inteiro`)."""
+    if inteiro:
+        return sum(int(indice[t]) for t in tipos if t in indice)
+    return sum(indice[t] for t in tipos if t in indice)
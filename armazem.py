@@ -0,0 +1,76 @@
+"""
+armazem.py
+Armazém local (SQLite) de linhas diárias do Insights para a extração
+incremental.
+
+Cada consulta é guardada sob uma chave (script + conta + assinatura dos
+campos/parâmetros); mudar os campos de um script gera uma chave nova, então
+linhas antigas nunca se misturam com um formato diferente.
+
+Tabela:
+  linhas(chave, data, dados)  — dados = linha da API em JSON
+
+Variável de ambiente (.env):
+  ARMAZEM_DB  caminho do banco (padrão: insights.db ao lado dos scripts)
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+DB_PATH = Path(os.getenv("ARMAZEM_DB", Path(__file__).parent / "insights.db"))
+
+
+def _conectar():
+    con = sqlite3.connect(DB_PATH, timeout=60)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS linhas (
+            chave TEXT NOT NULL,
+            data  TEXT NOT NULL,
+            dados TEXT NOT NULL
+        )
+    """)
+    con.execute("CREATE INDEX IF NOT EXISTS idx_linhas_chave_data ON linhas (chave, data)")
+    return con
+
+
+def ultimo_dia(chave):
+    """Data (YYYY-MM-DD) mais recente guardada para a chave, ou None."""
+    with closing(_conectar()) as con:
+        (data,) = con.execute("SELECT MAX(data) FROM linhas WHERE chave = ?", (chave,)).fetchone()
+    return data
+
+
+def substituir(chave, inicio, fim, linhas):
+    """
+    Troca, numa única transação, as linhas da chave entre `inicio` e `fim`
+    (inclusive) pelas linhas recebidas. Dias reprocessados são sobrescritos.
+    `linhas` pode ser um iterador (ex.: páginas vindas da API): é consumido
+    aos poucos numa tabela temporária, sem ser montado em memória e sem
+    bloquear o banco para os outros extratores enquanto a API responde.
+    Retorna o número de linhas gravadas.
+    """
+    registros = ((l.get("date_start", ""), json.dumps(l, ensure_ascii=False)) for l in linhas)
+    with closing(_conectar()) as con:
+        con.execute("CREATE TEMP TABLE novas (data TEXT NOT NULL, dados TEXT NOT NULL)")
+        con.executemany("INSERT INTO novas (data, dados) VALUES (?, ?)", registros)
+        with con:
+            con.execute("DELETE FROM linhas WHERE chave = ? AND data BETWEEN ? AND ?",
+                        (chave, inicio, fim))
+            cur = con.execute("INSERT INTO linhas (chave, data, dados) "
+                              "SELECT ?, data, dados FROM novas", (chave,))
+    return cur.rowcount
+
+
+def ler(chave, inicio, fim):
+    """Itera sobre as linhas (dicts) da chave entre `inicio` e `fim`, em ordem de data."""
+    with closing(_conectar()) as con:
+        cursor = con.execute(
+            "SELECT dados FROM linhas WHERE chave = ? AND data BETWEEN ? AND ? ORDER BY data",
+            (chave, inicio, fim),
+        )
+        for (dados,) in cursor:
+            yield json.loads(dados)
@@ -0,0 +1,359 @@
+"""
+benchmark.py
+Benchmark do pipeline contra o servidor fake (fake_api.py), sem
+credenciais, com volumes sintéticos configuráveis: campanhas, anúncios por
+campanha, dias e cardinalidade dos breakdowns. Serve para dimensionar
+--workers antes de receber uma conta grande e para pegar regressões de
+desempenho entre versões.
+
+As etapas 01-06, 11, 07 e 09 rodam como no run_all.py (um subprocesso por
+etapa, sequencial ou com --workers) em um diretório temporário, sem cache
+nem armazém. Cada cenário roda --repeticoes vezes e o resultado por etapa é
+a mediana de:
+  tempo de parede (latência da etapa), CPU, pico de RSS, ms por chamada à
+  API, e linhas lidas por segundo (vazão) — números de metricas.py.
+
+O servidor fake roda neste processo; o CPU que ele gasta gerando as linhas
+sai separado (cpu_fake_s), já que numa conta real esse custo é da Meta.
+
+Cada execução é gravada em benchmarks/<cenario>-<data>.json e comparada com
+a última execução gravada do mesmo cenário, parâmetros e workers (ou com
+--base ARQUIVO). Etapas com tempo ou memória acima da tolerância são
+listadas como regressão e o script termina com código 1 (dá para usar em CI).
+
+Uso:
+  python benchmark.py                              → cenário "pequeno"
+  python benchmark.py --cenario grande --workers 6
+  python benchmark.py --campanhas 200 --anuncios 10 --dias 60 --posicionamentos 16
+  python benchmark.py --cenario medio --repeticoes 5 --tolerancia 0.15
+  python benchmark.py --etapas 03,04                → só algumas etapas
+  python benchmark.py --listar                      → cenários e execuções gravadas
+
+Variável de ambiente (.env):
+  BENCHMARK_DIR  onde gravar os resultados (padrão: benchmarks/)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import fake_api
+import run_all
+
+DIR_RESULTADOS = Path(os.getenv("BENCHMARK_DIR") or BASE_DIR / "benchmarks")
+
+CENARIOS = {
+    "pequeno": {"campanhas": 6,   "anuncios": 4,  "dias": 30},
+    "medio":   {"campanhas": 40,  "anuncios": 8,  "dias": 30},
+    "grande":  {"campanhas": 100, "anuncios": 10, "dias": 60, "posicionamentos": 12},
+}
+CARDINALIDADES = ("posicionamentos", "idades", "generos", "horarios")
+
+TOLERANCIA = 0.20          # 20% acima da base é regressão...
+PISO_S     = 0.25          # ...se a diferença passar do ruído (segundos)
+PISO_MB    = 10            # e, para memória, de 10 MB
+
+
+# ─────────────────────────────────────────────
+# EXECUÇÃO
+# ─────────────────────────────────────────────
+
+def _ambiente(url, diretorio):
+    """Variáveis das etapas: API fake, saídas e armazém no diretório temporário, sem cache."""
+    return {
+        "FACEBOOK_GRAPH_URL":     url,
+        "FACEBOOK_AD_ACCOUNT_ID": "act_1",
+        "FACEBOOK_ACCESS_TOKEN":  "fake",
+        "PIPELINE_SAIDA":         str(diretorio),
+        "ARMAZEM_DB":             str(diretorio / "insights.db"),
+        "CACHE_DIR":              str(diretorio / ".cache_insights"),
+        "CACHE_INSIGHTS":         "0",
+        "INSIGHTS_INCREMENTAL":   "0",
+    }
+
+
+def _rodada(etapas, workers, env):
+    """Uma execução das etapas: ({script: (ok, medidas)}, parede_s, log)."""
+    def executor(script, label, capturar):
+        return run_all.run(script, label, True, env=env)
+
+    saida = io.StringIO()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(saida), contextlib.redirect_stderr(saida):
+        resultados = run_all.executar_grafo(etapas, workers, executor)
+    return resultados, time.perf_counter() - inicio, saida.getvalue()
+
+
+def _mediana(valores):
+    valores = [v for v in valores if v is not None]
+    return round(statistics.median(valores), 3) if valores else None
+
+
+def resumir(etapas, rodadas):
+    """Mediana por etapa das rodadas, com latência por chamada e vazão."""
+    resumo = []
+    for script, label, _ in etapas:
+        medidas = [r[script][1] for r in rodadas]
+        contadores = medidas[-1]            # determinísticos: iguais em todas as rodadas
+        parede = _mediana([m.get("parede_s") for m in medidas])
+        chamadas = contadores.get("chamadas_api") or 0
+        linhas = contadores.get("linhas_lidas") or 0
+        resumo.append({
+            "etapa":          script,
+            "label":          label,
+            "ok":             all(r[script][0] for r in rodadas),
+            "parede_s":       parede,
+            "cpu_s":          _mediana([m.get("cpu_s") for m in medidas]),
+            "rss_pico_bytes": _mediana([m.get("rss_pico_bytes") for m in medidas]),
+            "chamadas_api":   chamadas,
+            "ms_por_chamada": round(_mediana([m.get("tempo_api_ms") for m in medidas]) / chamadas, 1)
+                              if chamadas else None,
+            "linhas_lidas":   linhas,
+            "linhas_por_s":   round(linhas / parede) if parede and linhas else None,
+            "linhas_gravadas": contadores.get("linhas_gravadas") or 0,
+            "bytes_gravados": contadores.get("bytes_gravados") or 0,
+        })
+    return resumo
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar_cenario(nome, parametros, etapas, workers=1, repeticoes=3):
+    """Sobe o fake com o volume do cenário, roda as etapas e devolve o resultado."""
+    gerador = fake_api.GeradorInsights(
+        parametros["campanhas"], parametros["anuncios"], dias=parametros.get("dias"),
+        cardinalidades={c: parametros.get(c) for c in CARDINALIDADES})
+    servidor, url = fake_api.iniciar_em_thread(porta=0, gerador=gerador, polls=1)
+
+    rodadas, totais = [], []
+    cpu_fake = time.process_time()
+    try:
+        with tempfile.TemporaryDirectory(prefix="benchmark_") as tmp:
+            env = _ambiente(url, Path(tmp))
+            for i in range(repeticoes):
+                print(f"  Rodada {i + 1}/{repeticoes}...", end=" ", flush=True)
+                resultados, total, log = _rodada(etapas, workers, env)
+                falhas = [s for s, (ok, _) in resultados.items() if not ok]
+                print(f"{total:.1f}s" + (f"  [ERRO] {', '.join(falhas)}" if falhas else ""))
+                if falhas and i == 0:
+                    print(log[-3000:])
+                rodadas.append(resultados)
+                totais.append(total)
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    cpu_fake = time.process_time() - cpu_fake
+
+    etapas_resumo = resumir(etapas, rodadas)
+    linhas = sum(e["linhas_lidas"] for e in etapas_resumo)
+    total = _mediana(totais)
+    return {
+        "cenario":     nome,
+        "parametros":  parametros,
+        "workers":     workers,
+        "repeticoes":  repeticoes,
+        "data":        datetime.now().isoformat(timespec="seconds"),
+        "commit":      _commit(),
+        "python":      platform.python_version(),
+        "plataforma":  platform.platform(),
+        "total_s":     total,
+        "linhas_por_s": round(linhas / total) if total else None,
+        "cpu_fake_s":  round(cpu_fake / repeticoes, 3),
+        "chamadas_fake": servidor.estado.chamadas // repeticoes,
+        "etapas":      etapas_resumo,
+    }
+
+
+# ─────────────────────────────────────────────
+# RESULTADOS E COMPARAÇÃO
+# ─────────────────────────────────────────────
+
+def _mb(valor):
+    return f"{valor / 2**20:.0f}" if valor else "-"
+
+
+def imprimir(resultado):
+    largura = max([16] + [len(e["label"]) for e in resultado["etapas"]])
+    print(f"\n  {'Etapa':<{largura}} {'Status':<6} {'Tempo':>8} {'CPU':>7} {'RSS MB':>7} "
+          f"{'API':>5} {'ms/cham':>8} {'Linhas':>9} {'Linhas/s':>9}")
+    print(f"  {'-'*(largura + 66)}")
+    for e in resultado["etapas"]:
+        print(f"  {e['label']:<{largura}} {'OK' if e['ok'] else 'ERRO':<6} "
+              f"{e['parede_s'] or 0:>7.2f}s {e['cpu_s'] or 0:>6.2f}s {_mb(e['rss_pico_bytes']):>7} "
+              f"{e['chamadas_api']:>5} {e['ms_por_chamada'] or 0:>8.1f} "
+              f"{e['linhas_lidas']:>9} {e['linhas_por_s'] or 0:>9}")
+    print(f"  {'-'*(largura + 66)}")
+    print(f"  {'Total (parede)':<{largura + 7}} {resultado['total_s']:>7.2f}s"
+          f"   {resultado['linhas_por_s'] or 0} linhas/s"
+          f"   · CPU do fake {resultado['cpu_fake_s']:.2f}s por rodada")
+    if resultado["cpu_fake_s"] > resultado["total_s"] * 0.5:
+        print("  [AVISO] O fake gastou mais da metade do tempo gerando linhas — as latencias "
+              "das etapas de API incluem esse custo; compare execucoes entre si, nao com a API real.")
+
+
+def gravar(resultado):
+    DIR_RESULTADOS.mkdir(parents=True, exist_ok=True)
+    carimbo = resultado["data"].replace(":", "").replace("-", "")
+    caminho = DIR_RESULTADOS / f"{resultado['cenario']}-{carimbo}.json"
+    caminho.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+    return caminho
+
+
+def _ler(caminho):
+    try:
+        return json.loads(Path(caminho).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def anterior(resultado):
+    """Última execução gravada comparável (mesmo cenário, parâmetros e workers), ou None."""
+    for caminho in sorted(DIR_RESULTADOS.glob(f"{resultado['cenario']}-*.json"), reverse=True):
+        base = _ler(caminho)
+        if (base and base["parametros"] == resultado["parametros"]
+                and base["workers"] == resultado["workers"]):
+            return caminho, base
+    return None
+
+
+def _delta(atual, base):
+    return f"{(atual - base) / base * 100:+.0f}%" if atual is not None and base else "-"
+
+
+def comparar(resultado, base, tolerancia=TOLERANCIA):
+    """Imprime a diferença por etapa e devolve a lista de regressões."""
+    por_etapa = {e["etapa"]: e for e in base["etapas"]}
+    regressoes = []
+    largura = max([16] + [len(e["label"]) for e in resultado["etapas"]])
+    print(f"\n  {'Etapa':<{largura}} {'Tempo':>8} {'Base':>8} {'Δ':>6}   {'RSS MB':>6} {'Base':>6} {'Δ':>6}")
+    print(f"  {'-'*(largura + 54)}")
+    for e in resultado["etapas"]:
+        b = por_etapa.get(e["etapa"])
+        if not b:
+            continue
+        t, tb = e["parede_s"] or 0, b["parede_s"] or 0
+        r, rb = e["rss_pico_bytes"] or 0, b["rss_pico_bytes"] or 0
+        marca = []
+        if t > tb * (1 + tolerancia) and t - tb > PISO_S:
+            marca.append("tempo")
+        if r > rb * (1 + tolerancia) and (r - rb) / 2**20 > PISO_MB:
+            marca.append("memoria")
+        if marca:
+            regressoes.append((e["label"], marca))
+        print(f"  {e['label']:<{largura}} {t:>7.2f}s {tb:>7.2f}s {_delta(t, tb):>6}   "
+              f"{_mb(r):>6} {_mb(rb):>6} {_delta(r, rb):>6}"
+              f"{'   <- ' + ' e '.join(marca) if marca else ''}")
+    print(f"  {'-'*(largura + 54)}")
+    print(f"  {'Total':<{largura}} {resultado['total_s']:>7.2f}s {base['total_s']:>7.2f}s "
+          f"{_delta(resultado['total_s'], base['total_s']):>6}")
+    return regressoes
+
+
+def listar():
+    print("Cenarios:")
+    for nome, p in CENARIOS.items():
+        print(f"  {nome:<8} {json.dumps(p)}")
+    arquivos = sorted(DIR_RESULTADOS.glob("*.json"))
+    print(f"\nExecucoes gravadas em {DIR_RESULTADOS}:" if arquivos else "\nNenhuma execucao gravada.")
+    for caminho in arquivos:
+        r = _ler(caminho)
+        if r:
+            print(f"  {caminho.name:<36} {r['total_s']:>7.2f}s  {r['workers']} worker(s)"
+                  f"  commit {r.get('commit') or '?'}")
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline contra a Insights API fake")
+    parser.add_argument("--cenario", choices=CENARIOS, default="pequeno",
+                        help="Volume base (os parametros abaixo sobrepoem o do cenario)")
+    parser.add_argument("--campanhas", type=int, help="Campanhas na conta sintetica")
+    parser.add_argument("--anuncios", type=int, help="Anuncios por campanha")
+    parser.add_argument("--dias", type=int, help="Dias da janela de analise")
+    for nome in CARDINALIDADES:
+        parser.add_argument(f"--{nome}", type=int, help=f"Cardinalidade do breakdown de {nome}")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Etapas simultaneas, como no run_all.py --paralelo (padrao: 1)")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Rodadas por cenario; o resultado e a mediana (padrao: 3)")
+    parser.add_argument("--etapas", metavar="PREFIXOS",
+                        help="So as etapas cujos scripts comecam com estes prefixos (ex.: 03,04)")
+    parser.add_argument("--base", metavar="ARQUIVO",
+                        help="Resultado a comparar (padrao: ultima execucao comparavel)")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help=f"Aumento relativo aceito antes de acusar regressao (padrao: {TOLERANCIA})")
+    parser.add_argument("--nao-gravar", action="store_true", help="Nao grava o resultado em benchmarks/")
+    parser.add_argument("--listar", action="store_true", help="Lista cenarios e execucoes gravadas")
+    args = parser.parse_args()
+
+    if args.listar:
+        listar()
+        return
+
+    parametros = dict(CENARIOS[args.cenario])
+    for nome in ("campanhas", "anuncios", "dias") + CARDINALIDADES:
+        if getattr(args, nome) is not None:
+            parametros[nome] = getattr(args, nome)
+    personalizado = parametros != CENARIOS[args.cenario]
+    nome = "personalizado" if personalizado else args.cenario
+
+    etapas = run_all.SCRIPTS
+    if args.etapas:
+        etapas = run_all.filtrar_etapas(etapas, [p.strip() for p in args.etapas.split(",") if p.strip()])
+        if not etapas:
+            parser.error(f"nenhuma etapa corresponde a --etapas {args.etapas}")
+        nome += "-" + args.etapas.replace(",", "_")
+
+    print("Facebook Ads — Benchmark do pipeline")
+    print(f"Cenario: {nome} {json.dumps(parametros)}")
+    print(f"Etapas: {len(etapas)} · {max(1, args.workers)} worker(s) · {args.repeticoes} rodada(s)\n")
+
+    try:
+        resultado = executar_cenario(nome, parametros, etapas, max(1, args.workers),
+                                     max(1, args.repeticoes))
+    except ValueError as erro:
+        parser.error(str(erro))
+    imprimir(resultado)
+
+    comparavel = ((args.base, _ler(args.base)) if args.base else anterior(resultado))
+    if not args.nao_gravar:
+        print(f"\n[OK] Resultado gravado em {gravar(resultado)}")
+
+    if not comparavel or not comparavel[1]:
+        print("[INFO] Sem execucao anterior comparavel — esta passa a ser a base.")
+        return
+    caminho, base = comparavel
+    print(f"\nComparacao com {Path(caminho).name} (commit {base.get('commit') or '?'}):")
+    regressoes = comparar(resultado, base, args.tolerancia)
+    if regressoes:
+        print(f"\n[AVISO] {len(regressoes)} etapa(s) com regressao acima de {args.tolerancia:.0%}: "
+              + "; ".join(f"{label} ({' e '.join(m)})" for label, m in regressoes))
+        sys.exit(1)
+    print(f"\n[OK] Nenhuma regressao acima de {args.tolerancia:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+cache.py
+Cache em disco das respostas do Insights, para reexecuções seguidas do
+pipeline (ajustes de dashboard, depuração) não consultarem a API de novo.
+
+Cada consulta vira um arquivo <hash>.jsonl em CACHE_DIR, uma página por
+linha; a chave é (conta, level, fields, params, período). Presets relativos
+("last_30d", "yesterday"...) entram na chave junto com a data do dia, então o
+cache nunca atravessa a virada do dia.
+
+  • validade — entradas mais velhas que CACHE_TTL segundos são ignoradas e
+    apagadas;
+  • tamanho  — passando de CACHE_MAX_MB, as entradas menos usadas recentemente
+    são removidas (atime, marcado a cada leitura; mtime guarda a gravação);
+  • gravação — a página é gravada enquanto é repassada a quem consome, em um
+    arquivo temporário renomeado só quando a consulta chega ao fim; consulta
+    interrompida não deixa entrada parcial.
+
+Desligar em uma execução: CACHE_INSIGHTS=0 ou `python run_all.py --sem-cache`.
+
+Variáveis de ambiente (.env):
+  CACHE_INSIGHTS  "0" desliga o cache (padrão "1")
+  CACHE_DIR       diretório das entradas (padrão: .cache_insights/)
+  CACHE_TTL       validade em segundos (padrão 900)
+  CACHE_MAX_MB    tamanho máximo do diretório em MB (padrão 200)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+BASE_DIR  = Path(__file__).parent
+ATIVO     = os.getenv("CACHE_INSIGHTS", "1").strip().lower() not in ("0", "false", "nao")
+DIR_CACHE = Path(os.getenv("CACHE_DIR") or BASE_DIR / ".cache_insights")
+TTL       = float(os.getenv("CACHE_TTL", "900"))
+MAX_BYTES = int(float(os.getenv("CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+SUFIXO = ".jsonl"
+
+
+def chave(conta, fields, params, hoje=None):
+    """Hash da consulta; presets relativos levam a data de hoje junto."""
+    assinatura = {
+        "conta":  conta,
+        "fields": sorted(fields),
+        "params": params,
+    }
+    if "date_preset" in params:
+        assinatura["hoje"] = (hoje or date.today()).isoformat()
+    texto = json.dumps(assinatura, sort_keys=True, default=str)
+    return hashlib.sha1(texto.encode()).hexdigest()
+
+
+def _arquivo(k):
+    return DIR_CACHE / f"{k}{SUFIXO}"
+
+
+def ler(k):
+    """Iterador sobre as páginas em cache, ou None se não houver entrada válida."""
+    if not ATIVO:
+        return None
+    arq = _arquivo(k)
+    try:
+        st = arq.stat()
+    except FileNotFoundError:
+        return None
+    agora = time.time()
+    if agora - st.st_mtime > TTL:
+        arq.unlink(missing_ok=True)
+        return None
+    os.utime(arq, (agora, st.st_mtime))   # marca o uso sem mexer na validade
+    return _paginas(arq)
+
+
+def _paginas(arq):
+    with open(arq, encoding="utf-8") as f:
+        for linha in f:
+            yield json.loads(linha)
+
+
+def gravando(k, paginas):
+    """
+    Repassa as páginas de `paginas` e as grava no cache; a entrada só passa a
+    existir se o iterador for consumido até o fim.
+    """
+    if not ATIVO:
+        yield from paginas
+        return
+
+    DIR_CACHE.mkdir(parents=True, exist_ok=True)
+    tmp = DIR_CACHE / f"{k}.{os.getpid()}.{threading.get_ident()}.tmp"
+    completo = False
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for pagina in paginas:
+                f.write(json.dumps(pagina, ensure_ascii=False) + "\n")
+                yield pagina
+        completo = True
+    finally:
+        if completo:
+            os.replace(tmp, _arquivo(k))
+            podar()
+        else:
+            tmp.unlink(missing_ok=True)
+
+
+def podar(max_bytes=MAX_BYTES):
+    """Apaga entradas vencidas e, acima de `max_bytes`, as menos usadas."""
+    if not DIR_CACHE.exists():
+        return
+    agora = time.time()
+    entradas = []
+    for arq in DIR_CACHE.glob(f"*{SUFIXO}"):
+        try:
+            st = arq.stat()
+        except FileNotFoundError:
+            continue
+        if agora - st.st_mtime > TTL:
+            arq.unlink(missing_ok=True)
+        else:
+            entradas.append((st.st_atime, st.st_size, arq))
+
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, arq in sorted(entradas, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        arq.unlink(missing_ok=True)
+        total -= tamanho
+
+
+def limpar():
+    """Remove todas as entradas do cache."""
+    for arq in DIR_CACHE.glob(f"*{SUFIXO}"):
+        arq.unlink(missing_ok=True)
@@ -1,14 +1,27 @@
-from facebook_business.api import FacebookAdsApi
+from facebook_business.session import FacebookSession
 from facebook_business.adobjects.adaccount import AdAccount
 from dotenv import load_dotenv
 import os
 
+# Antes dos módulos do projeto: limites.py e sessao.py leem o .env ao importar
 load_dotenv()
 
-FacebookAdsApi.init(
+from limites import ApiComLimite
+import sessao
+
+# Permite apontar o SDK para outro host (ex.: servidor local do fake_api.py)
+if os.getenv("FACEBOOK_GRAPH_URL"):
+    FacebookSession.GRAPH = os.getenv("FACEBOOK_GRAPH_URL").rstrip("/")
+
+# ApiComLimite = FacebookAdsApi + ritmo pelos cabeçalhos de uso e backoff (limites.py)
+api = ApiComLimite.init(
     app_id=os.getenv("FACEBOOK_APP_ID"),
     app_secret=os.getenv("FACEBOOK_APP_SECRET"),
     access_token=os.getenv("FACEBOOK_ACCESS_TOKEN"),
+    timeout=sessao.TIMEOUT,
 )
 
+# Pool de conexões keep-alive, gzip e repetição no adaptador HTTP (sessao.py)
+sessao.instalar(api)
+
 account = AdAccount(os.getenv("FACEBOOK_AD_ACCOUNT_ID"))
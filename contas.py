@@ -0,0 +1,102 @@
+"""
+contas.py
+Contas de anúncio do modo multi-conta (run_all.py --contas) e seus
+diretórios de saída.
+
+Origem da lista, na ordem:
+  1. arquivo passado em --contas
+  2. FACEBOOK_AD_ACCOUNT_IDS no .env (ids separados por vírgula)
+  3. contas.txt ao lado dos scripts
+
+Formato do arquivo — uma conta por linha, nome opcional; "#" comenta:
+  act_123456789   Cliente A
+  987654321       Cliente B
+
+Cada conta grava suas saídas em contas/<act_id>/ (PIPELINE_SAIDA), e o
+run_all registra as contas executadas em contas/contas.json, lido pelo
+10_dashboard_contas.py.
+
+Variável de ambiente (.env):
+  PIPELINE_CONTAS_DIR  diretório raiz das contas (padrão: contas/)
+"""
+
+import json
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_DIR    = Path(__file__).parent
+DIR_CONTAS  = Path(os.getenv("PIPELINE_CONTAS_DIR") or BASE_DIR / "contas")
+ARQUIVO_PADRAO = BASE_DIR / "contas.txt"
+MANIFESTO   = DIR_CONTAS / "contas.json"
+
+
+def normalizar_id(conta_id):
+    """"123" → "act_123" (formato esperado pelo AdAccount)."""
+    conta_id = conta_id.strip()
+    return conta_id if conta_id.startswith("act_") else f"act_{conta_id}"
+
+
+def _ler_arquivo(arquivo):
+    contas = []
+    for linha in Path(arquivo).read_text(encoding="utf-8").splitlines():
+        linha = linha.split("#", 1)[0].strip()
+        if not linha:
+            continue
+        partes = linha.split(maxsplit=1)
+        conta_id = normalizar_id(partes[0])
+        contas.append({"id": conta_id, "nome": partes[1].strip() if len(partes) > 1 else conta_id})
+    return contas
+
+
+def carregar(arquivo=None):
+    """Lista de contas [{"id", "nome"}], sem repetições, na ordem de origem."""
+    if arquivo:
+        contas = _ler_arquivo(arquivo)
+    elif os.getenv("FACEBOOK_AD_ACCOUNT_IDS"):
+        contas = [{"id": normalizar_id(c), "nome": normalizar_id(c)}
+                  for c in os.getenv("FACEBOOK_AD_ACCOUNT_IDS").split(",") if c.strip()]
+    elif ARQUIVO_PADRAO.exists():
+        contas = _ler_arquivo(ARQUIVO_PADRAO)
+    else:
+        contas = []
+
+    vistas, unicas = set(), []
+    for c in contas:
+        if c["id"] not in vistas:
+            vistas.add(c["id"])
+            unicas.append(c)
+    return unicas
+
+
+def diretorio(conta_id):
+    """Diretório de saída da conta (contas/<act_id>/)."""
+    return DIR_CONTAS / conta_id
+
+
+def ambiente(conta_id):
+    """Variáveis de ambiente que apontam um script para a conta."""
+    return {
+        "FACEBOOK_AD_ACCOUNT_ID": conta_id,
+        "PIPELINE_SAIDA":         str(diretorio(conta_id)),
+    }
+
+
+def salvar_manifesto(contas):
+    DIR_CONTAS.mkdir(parents=True, exist_ok=True)
+    with open(MANIFESTO, "w", encoding="utf-8") as f:
+        json.dump(contas, f, ensure_ascii=False, indent=2)
+
+
+def ler_manifesto():
+    """Contas da última execução multi-conta; sem manifesto, os subdiretórios de contas/."""
+    if MANIFESTO.exists():
+        with open(MANIFESTO, encoding="utf-8") as f:
+            return json.load(f)
+    if not DIR_CONTAS.exists():
+        return []
+    return [{"id": p.name, "nome": p.name}
+            for p in sorted(DIR_CONTAS.iterdir()) if p.is_dir()]
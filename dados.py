@@ -0,0 +1,206 @@
+"""
+dados.py
+Gravação e leitura compartilhadas das saídas dos extratores (01-06), usadas
+pelos extratores e pelos dashboards 07 e 09.
+
+Gravação: salvar() escreve sempre o CSV e, com SAIDA_PARQUET=1 e pyarrow
+instalado, também um .parquet ao lado, com o schema explícito de SCHEMAS
+(colunar, comprimido e sem inferência de tipos na leitura).
+
+Leitura: ler_csv() prefere o .parquet quando ele existe e não é mais antigo
+que o CSV. Cada arquivo é lido uma única vez com tipos explícitos e fica em
+memória enquanto não mudar (mtime e tamanho). Quem chama recebe uma cópia
+rasa do DataFrame, então pode criar colunas sem alterar o cache.
+
+Toda gravação é atômica (arquivo temporário + os.replace): leitores e duas
+execuções simultâneas do agendamento (cadências diária e intradiária gravam os
+mesmos CSVs) nunca veem um arquivo pela metade — vale o último a terminar.
+
+Saídas: os CSVs/HTMLs vão para SAIDA_DIR (PIPELINE_SAIDA). No modo
+multi-conta (run_all.py --contas) cada conta roda com PIPELINE_SAIDA
+apontando para o próprio diretório (contas/<id>/).
+
+Variáveis de ambiente (.env):
+  SAIDA_PARQUET   "1" grava também <nome>.parquet (padrão "0")
+  PIPELINE_SAIDA  diretório das saídas (padrão: ao lado dos scripts)
+"""
+
+import csv
+import os
+import threading
+from pathlib import Path
+
+import metricas
+
+try:
+    import pandas as pd
+    PANDAS_OK = True
+except ImportError:
+    PANDAS_OK = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_OK = True
+except ImportError:
+    PYARROW_OK = False
+
+BASE_DIR  = Path(__file__).parent
+SAIDA_DIR = Path(os.getenv("PIPELINE_SAIDA") or BASE_DIR)
+
+# Colunas e tipos de cada CSV do pipeline
+SCHEMAS = {
+    "campanhas.csv": {
+        "campanha": "str", "gasto": "float64", "impressoes": "int64",
+        "cliques": "int64", "ctr": "float64", "cpv": "float64", "conversoes": "int64",
+    },
+    "cpv_diario.csv": {
+        "data": "str", "cpv": "float64",
+    },
+    "posicionamentos.csv": {
+        "posicionamento": "str", "gasto": "float64", "impressoes": "int64",
+    },
+    "idade_genero.csv": {
+        "idade": "str", "genero": "str", "gasto": "float64",
+        "impressoes": "int64", "cliques": "int64",
+    },
+    "horarios.csv": {
+        "hora": "int64", "cliques": "int64", "impressoes": "int64", "gasto": "float64",
+    },
+    "horarios_dia.csv": {
+        "data": "str", "dia_semana": "int64", "hora": "int64",
+        "cliques": "int64", "impressoes": "int64", "gasto": "float64",
+    },
+    "horarios_semana.csv": {
+        "dia_semana": "int64", "hora": "int64", "dias": "int64",
+        "cliques": "int64", "impressoes": "int64", "gasto": "float64",
+    },
+    "funil.csv": {
+        "estagio": "str", "quantidade": "int64",
+    },
+    "publicos.csv": {
+        "publico": "str", "tipo": "str", "conjuntos": "int64", "gasto": "float64",
+        "leads": "int64", "compras": "int64", "cpv": "float64",
+    },
+}
+
+SAIDA_PARQUET = os.getenv("SAIDA_PARQUET", "0").strip().lower() in ("1", "true", "sim")
+
+_cache = {}
+_lock  = threading.Lock()
+
+
+# ─────────────────────────────────────────────
+#  GRAVAÇÃO
+# ─────────────────────────────────────────────
+def caminho(nome):
+    """Caminho de uma saída do pipeline (ex.: "campanhas.csv") em SAIDA_DIR."""
+    SAIDA_DIR.mkdir(parents=True, exist_ok=True)
+    return SAIDA_DIR / nome
+
+
+def _temporario(caminho):
+    """Arquivo temporário ao lado de `caminho`, único por processo e thread."""
+    return caminho.with_name(f"{caminho.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def gravar_texto(caminho, texto):
+    """Grava `texto` em `caminho` de forma atômica (ex.: o HTML dos dashboards)."""
+    caminho = Path(caminho)
+    tmp = _temporario(caminho)
+    tmp.write_text(texto, encoding="utf-8")
+    os.replace(tmp, caminho)
+
+
+def _schema_arrow(nome, fieldnames):
+    tipos = {"str": pa.string(), "float64": pa.float64(), "int64": pa.int64()}
+    schema = SCHEMAS.get(nome, {})
+    return pa.schema([(c, tipos[schema.get(c, "str")]) for c in fieldnames])
+
+
+def _salvar_parquet(caminho, rows, fieldnames):
+    schema = _schema_arrow(caminho.with_suffix(".csv").name, fieldnames)
+    colunas = {c: [r.get(c) for r in rows] for c in fieldnames}
+    tabela = pa.Table.from_pydict(colunas, schema=schema)
+    tmp = _temporario(caminho)
+    pq.write_table(tabela, tmp, compression="zstd")
+    os.replace(tmp, caminho)
+
+
+def salvar(caminho, rows, fieldnames):
+    """
+    Grava `rows` (lista de dicts) em `caminho` (.csv). Com SAIDA_PARQUET=1
+    grava também o .parquet correspondente; sem pyarrow, só avisa.
+    """
+    caminho = Path(caminho)
+    tmp = _temporario(caminho)
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, caminho)
+    metricas.gravado(caminho, linhas=len(rows))
+
+    if not SAIDA_PARQUET:
+        return
+    if not PYARROW_OK:
+        print("[AVISO] SAIDA_PARQUET=1, mas pyarrow não está instalado — gravado só o CSV.")
+        return
+    _salvar_parquet(caminho.with_suffix(".parquet"), rows, fieldnames)
+    metricas.gravado(caminho.with_suffix(".parquet"))
+
+
+# ─────────────────────────────────────────────
+#  LEITURA
+# ─────────────────────────────────────────────
+def _assinatura(p):
+    st = p.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _origem(p):
+    """Arquivo a ler para o CSV `p`: o .parquet se estiver em dia, senão o CSV."""
+    parquet = p.with_suffix(".parquet")
+    if PYARROW_OK and parquet.exists():
+        if not p.exists() or parquet.stat().st_mtime_ns >= p.stat().st_mtime_ns:
+            return parquet
+    return p
+
+
+def _ler(p, nome):
+    if p.suffix == ".parquet":
+        df = pd.read_parquet(p)
+        df.columns = [c.lower().strip() for c in df.columns]
+        return df
+    try:
+        df = pd.read_csv(p, dtype=SCHEMAS.get(nome))
+    except (ValueError, TypeError):
+        # Valores ausentes/inesperados em colunas inteiras: deixa o pandas inferir
+        df = pd.read_csv(p)
+    df.columns = [c.lower().strip() for c in df.columns]
+    return df
+
+
+def ler_csv(nome, diretorio=None):
+    """
+    DataFrame do CSV `nome` (ex.: "campanhas.csv") em `diretorio` (padrão:
+    SAIDA_DIR) — lido do .parquet correspondente quando houver um em dia —,
+    ou None se o arquivo não existir ou o pandas não estiver instalado.
+    """
+    csv_path = Path(diretorio or SAIDA_DIR) / nome
+    p = _origem(csv_path)
+    if not PANDAS_OK or not p.exists():
+        return None
+
+    assinatura = _assinatura(p)
+    with _lock:
+        em_cache = _cache.get(csv_path)
+        if em_cache is None or em_cache[0] != (p, assinatura):
+            em_cache = ((p, assinatura), _ler(p, nome))
+            _cache[csv_path] = em_cache
+    return em_cache[1].copy(deep=False)
+
+
+def limpar_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,582 @@
+"""
+fake_api.py
+Servidor local que imita os endpoints de Insights da Graph API usados pelos
+extratores, para exercitar paginação e relatórios assíncronos sem credenciais.
+
+Uso:
+  python fake_api.py                      → http://127.0.0.1:8765
+  python fake_api.py --porta 9000 --polls 5
+  python fake_api.py --campanhas 200 --anuncios 10 --dias 90 --posicionamentos 16
+
+Em outro terminal, aponte os scripts para o servidor:
+  FACEBOOK_GRAPH_URL=http://127.0.0.1:8765 FACEBOOK_AD_ACCOUNT_ID=act_1 \\
+  FACEBOOK_ACCESS_TOKEN=fake python 03_posicionamentos.py
+
+Endpoints (com qualquer prefixo de versão, ex. /v19.0/...):
+  GET  /act_<id>/insights         → consulta síncrona paginada
+  POST /act_<id>/insights         → cria relatório assíncrono
+  GET  /<report_run_id>           → status do relatório (avança a cada consulta)
+  GET  /<report_run_id>/insights  → resultado paginado do relatório
+  GET  /<campaign_id|adset_id>    → campanha / conjunto (com targeting)
+  POST /  (batch=[...])           → lote de até 50 GETs, cada um com seu status
+
+Com --capacidade N o servidor informa o uso (x-ad-account-usage,
+x-fb-ads-insights-throttle, x-business-use-case-usage) como chamadas no
+último minuto / N e responde erro #17 acima de 100%. --falhas P devolve
+erro #80004 em uma fração P das chamadas.
+
+Os dados são sintéticos e determinísticos: a mesma consulta sempre devolve
+as mesmas linhas. O volume é configurável — campanhas, anúncios por campanha,
+dias das janelas last_Nd (--dias) e cardinalidade de cada breakdown
+(--posicionamentos, --idades, --generos, --horarios) — para o benchmark.py
+medir o pipeline com contas de vários tamanhos.
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+PORTA_PADRAO = 8765
+
+NOMES_CAMPANHA = [
+    "Imersao Jan/25 - Remarketing 7d",
+    "Imersao Fev/25 - LAL 1pct Compradores",
+    "Imersao Mar/25 - Interesse Empreendedorismo",
+    "Brand Awareness - Wide - 18-34",
+    "Video Views - Prospecting BR",
+    "Lead Gen - Formulario Nativo",
+    "Retarget - Checkout Abandonado",
+    "Broad - Mobile - Stories",
+]
+
+POSICIONAMENTOS = [
+    ("facebook", "feed"), ("facebook", "facebook_stories"), ("facebook", "facebook_reels"),
+    ("instagram", "feed"), ("instagram", "instagram_stories"), ("instagram", "reels"),
+    ("audience_network", "classic"), ("messenger", "messenger_inbox"),
+]
+IDADES   = ["18-24", "25-34", "35-44", "45-54", "55-64", "65+"]
+GENEROS  = ["male", "female", "unknown"]
+HORARIOS = [f"{h:02d}:00:00 - {h:02d}:59:59" for h in range(24)]
+
+BREAKDOWNS = {
+    "publisher_platform": None,   # preenchido junto com platform_position
+    "platform_position":  None,
+    "age":                IDADES,
+    "gender":             GENEROS,
+    "hourly_stats_aggregated_by_advertiser_time_zone": HORARIOS,
+}
+
+# Cardinalidade máxima dos breakdowns com valores reais (os extratores
+# interpretam esses rótulos); posicionamentos aceitam qualquer quantidade.
+LIMITES_CARDINALIDADE = {"idades": len(IDADES), "generos": len(GENEROS), "horarios": len(HORARIOS)}
+
+# Parâmetros que só mudam a página, não as linhas da consulta
+PARAMS_PAGINA = ("after", "before", "limit", "access_token", "appsecret_proof")
+CONSULTAS_EM_MEMORIA = 32
+
+# Segmentação do conjunto de cada campanha (mesma posição em NOMES_CAMPANHA)
+SEGMENTACOES = [
+    {"custom_audiences": [{"id": "6001", "name": "Visitantes do site 7d"}]},
+    {"custom_audiences": [{"id": "6002", "name": "Lookalike (BR, 1%) - Compradores"}]},
+    {"flexible_spec": [{"interests": [{"id": "6003", "name": "Empreendedorismo"}]}]},
+    {},
+    {"flexible_spec": [{"interests": [{"id": "6004", "name": "Marketing digital"},
+                                      {"id": "6005", "name": "Pequenas empresas"}]}]},
+    {"custom_audiences": [{"id": "6006", "name": "Lookalike (BR, 3%) - Leads"}]},
+    {"custom_audiences": [{"id": "6007", "name": "Checkout abandonado 30d"}],
+     "excluded_custom_audiences": [{"id": "6008", "name": "Compradores 180d"}]},
+    {},
+]
+OBJETIVOS = ["OUTCOME_SALES", "OUTCOME_LEADS", "OUTCOME_AWARENESS", "OUTCOME_ENGAGEMENT"]
+
+TIPOS_ACAO = [
+    ("video_view",            0.30),
+    ("link_click",            0.60),
+    ("landing_page_view",     0.35),
+    ("view_content",          0.25),
+    ("lead",                  0.06),
+    ("complete_registration", 0.03),
+    ("initiate_checkout",     0.02),
+    ("purchase",              0.006),
+]
+
+
+# ─────────────────────────────────────────────
+# GERADOR DE DADOS SINTÉTICOS
+# ─────────────────────────────────────────────
+
+class GeradorInsights:
+    """
+    Gera linhas de Insights para uma conta sintética com `campanhas`
+    campanhas e `anuncios` anúncios por campanha (um conjunto por campanha).
+    `dias` fixa o tamanho das janelas last_Nd (None = o do preset) e
+    `cardinalidades` ({"posicionamentos", "idades", "generos", "horarios"}:
+    n) limita ou amplia os valores de cada breakdown.
+    """
+
+    def __init__(self, campanhas=6, anuncios=4, semente=42, dias=None, cardinalidades=None):
+        self.campanhas = campanhas
+        self.anuncios  = anuncios
+        self.semente   = semente
+        self.dias      = dias
+        self.posicionamentos, self.breakdowns = _eixos(cardinalidades or {})
+
+    def _entidades(self, level):
+        for c in range(self.campanhas):
+            camp = {
+                "campaign_id":   f"{1000 + c}",
+                "campaign_name": NOMES_CAMPANHA[c % len(NOMES_CAMPANHA)]
+                                 + (f" #{c // len(NOMES_CAMPANHA)}" if c >= len(NOMES_CAMPANHA) else ""),
+                "adset_id":      f"{2000 + c}",
+                "adset_name":    f"Conjunto {c + 1}",
+            }
+            if level in ("account", "campaign", "adset"):
+                yield camp
+                continue
+            for a in range(self.anuncios):
+                yield dict(camp, ad_id=f"{3000 + c * self.anuncios + a}",
+                           ad_name=f"Anuncio {c + 1}.{a + 1}")
+
+    def objeto(self, objeto_id, fields):
+        """Campanha ou conjunto de anúncios pelo id (GET /<id>), ou None."""
+        for c, ent in enumerate(self._entidades("campaign")):
+            rng = random.Random(zlib.crc32(f"{self.semente}|obj|{c}".encode()))
+            base = {
+                "status":       "ACTIVE" if c % 5 else "PAUSED",
+                "daily_budget": str(rng.choice([5000, 10000, 20000, 50000])),
+                "created_time": f"2024-{1 + c % 12:02d}-{1 + c % 28:02d}T10:00:00-0300",
+            }
+            if objeto_id == ent["campaign_id"]:
+                obj = dict(base, id=objeto_id, name=ent["campaign_name"],
+                           objective=OBJETIVOS[c % len(OBJETIVOS)])
+            elif objeto_id == ent["adset_id"]:
+                segmentacao = dict(SEGMENTACOES[c % len(SEGMENTACOES)],
+                                   age_min=18, age_max=65,
+                                   geo_locations={"countries": ["BR"]})
+                obj = dict(base, id=objeto_id, name=ent["adset_name"],
+                           campaign_id=ent["campaign_id"], targeting=segmentacao)
+            else:
+                continue
+            return {k: v for k, v in obj.items() if k == "id" or not fields or k in fields}
+        return None
+
+    def _combinacoes(self, breakdowns):
+        eixos = []
+        if "publisher_platform" in breakdowns or "platform_position" in breakdowns:
+            eixos.append([{"publisher_platform": p, "platform_position": pos}
+                          for p, pos in self.posicionamentos])
+        for b in breakdowns:
+            if self.breakdowns.get(b):
+                eixos.append([{b: v} for v in self.breakdowns[b]])
+        for combo in itertools.product(*eixos):
+            valores = {}
+            for parte in combo:
+                valores.update(parte)
+            yield valores
+
+    def _metricas(self, chave):
+        rng = random.Random(zlib.crc32(f"{self.semente}|{chave}".encode()))
+        impressoes = rng.randint(200, 5000)
+        cliques    = int(impressoes * rng.uniform(0.005, 0.03))
+        acoes = {t: int(cliques * taxa * rng.uniform(0.5, 1.5)) for t, taxa in TIPOS_ACAO}
+        acoes["video_view"] = int(impressoes * TIPOS_ACAO[0][1] * rng.uniform(0.5, 1.5))
+        return {
+            "spend":       round(impressoes * rng.uniform(0.01, 0.04), 2),
+            "impressions": impressoes,
+            "reach":       int(impressoes * rng.uniform(0.5, 0.9)),
+            "clicks":      cliques,
+            "acoes":       acoes,
+        }
+
+    def linhas(self, fields, params):
+        """Devolve a lista de linhas para a consulta, no formato da API."""
+        level      = params.get("level", "account")
+        breakdowns = params.get("breakdowns") or []
+        diario     = str(params.get("time_increment", "")) == "1"
+        inicio, fim = intervalo_datas(params)
+        if self.dias and not isinstance(params.get("time_range"), dict) \
+                and str(params.get("date_preset", "last_30d")).startswith("last_"):
+            inicio = fim - timedelta(days=self.dias - 1)
+        dias = [inicio + timedelta(days=i) for i in range((fim - inicio).days + 1)]
+
+        chave_nivel = {"account": (), "campaign": ("campaign_id",),
+                       "adset": ("adset_id",), "ad": ("ad_id",)}.get(level, ())
+
+        grupos = {}
+        for ent in self._entidades(level):
+            for combo in self._combinacoes(breakdowns):
+                for dia in dias:
+                    m = self._metricas(f"{ent.get('ad_id', ent['campaign_id'])}|{dia}|"
+                                       f"{sorted(combo.items())}")
+                    chave = (tuple(ent[k] for k in chave_nivel),
+                             tuple(sorted(combo.items())),
+                             dia if diario else None)
+                    g = grupos.setdefault(chave, {"ent": ent, "combo": combo,
+                                                  "dia": dia, "spend": 0.0,
+                                                  "impressions": 0, "reach": 0,
+                                                  "clicks": 0, "acoes": {}})
+                    g["spend"]       += m["spend"]
+                    g["impressions"] += m["impressions"]
+                    g["reach"]       += m["reach"]
+                    g["clicks"]      += m["clicks"]
+                    for t, v in m["acoes"].items():
+                        g["acoes"][t] = g["acoes"].get(t, 0) + v
+
+        return [self._formatar(g, fields, breakdowns, diario, inicio, fim)
+                for g in grupos.values()]
+
+    @staticmethod
+    def _formatar(g, fields, breakdowns, diario, inicio, fim):
+        ini = g["dia"] if diario else inicio
+        fin = g["dia"] if diario else fim
+        spend = g["spend"]
+        linha = {"date_start": ini.isoformat(), "date_stop": fin.isoformat()}
+        for f in fields:
+            if f in g["ent"]:
+                linha[f] = g["ent"][f]
+            elif f in ("spend",):
+                linha[f] = f"{spend:.2f}"
+            elif f in ("impressions", "reach", "clicks"):
+                linha[f] = str(g[f])
+            elif f == "ctr":
+                linha[f] = f"{g['clicks'] / g['impressions'] * 100:.6f}" if g["impressions"] else "0"
+            elif f == "website_ctr":
+                linha[f] = [{"action_type": "link_click",
+                             "value": f"{g['acoes'].get('link_click', 0) / (g['impressions'] or 1) * 100:.6f}"}]
+            elif f == "actions":
+                linha[f] = [{"action_type": t, "value": str(v)}
+                            for t, v in g["acoes"].items() if v > 0]
+            elif f == "cost_per_action_type":
+                linha[f] = [{"action_type": t, "value": f"{spend / v:.6f}"}
+                            for t, v in g["acoes"].items() if v > 0]
+        for b in breakdowns:
+            linha[b] = g["combo"].get(b, "")
+        return linha
+
+
+def _eixos(cardinalidades):
+    """(posicionamentos, {breakdown: valores}) com as cardinalidades pedidas."""
+    for nome, n in cardinalidades.items():
+        limite = LIMITES_CARDINALIDADE.get(nome)
+        if n is not None and (n < 1 or (limite and n > limite)):
+            raise ValueError(f"Cardinalidade de {nome} deve estar entre 1 e {limite or 'N'} (recebido {n}).")
+
+    n = cardinalidades.get("posicionamentos") or len(POSICIONAMENTOS)
+    posicionamentos = (POSICIONAMENTOS + [("facebook", f"posicao_{i}")
+                                          for i in range(len(POSICIONAMENTOS), n)])[:n]
+    breakdowns = dict(BREAKDOWNS)
+    for nome, chave, valores in (("idades", "age", IDADES), ("generos", "gender", GENEROS),
+                                 ("horarios", "hourly_stats_aggregated_by_advertiser_time_zone",
+                                  HORARIOS)):
+        breakdowns[chave] = valores[:cardinalidades.get(nome) or len(valores)]
+    return posicionamentos, breakdowns
+
+
+def intervalo_datas(params, hoje=None):
+    """Converte date_preset/time_range em (inicio, fim) como a API faz."""
+    hoje = hoje or date.today()
+    tr = params.get("time_range")
+    if isinstance(tr, dict) and tr.get("since"):
+        return date.fromisoformat(tr["since"]), date.fromisoformat(tr["until"])
+    preset = params.get("date_preset", "last_30d")
+    if preset == "today":
+        return hoje, hoje
+    if preset == "yesterday":
+        return hoje - timedelta(days=1), hoje - timedelta(days=1)
+    m = re.match(r"last_(\d+)d", preset)
+    n = int(m.group(1)) if m else 30
+    return hoje - timedelta(days=n), hoje - timedelta(days=1)
+
+
+# ─────────────────────────────────────────────
+# SERVIDOR HTTP
+# ─────────────────────────────────────────────
+
+def _decodificar(valores):
+    """Parâmetros chegam JSON-encodados pelo SDK (listas/dicts) ou CSV."""
+    params = {}
+    for k, v in valores.items():
+        v = v[-1]
+        try:
+            params[k] = json.loads(v)
+        except ValueError:
+            params[k] = v.split(",") if k == "fields" else v
+    if isinstance(params.get("fields"), str):
+        params["fields"] = params["fields"].split(",")
+    return params
+
+
+class EstadoFake:
+    """Relatórios assíncronos em andamento e contadores de chamadas."""
+
+    def __init__(self, gerador, polls=3, capacidade=0, falhas=0.0):
+        self.gerador    = gerador
+        self.polls      = max(1, polls)
+        self.capacidade = capacidade
+        self.falhas     = falhas
+        self.jobs       = {}
+        self.consultas  = {}
+        self.chamadas   = 0
+        self.erros      = 0
+        self._recentes  = deque()
+        self._lock      = threading.Lock()
+        self._proximo   = itertools.count(9_000_000)
+        self._rng       = random.Random(7)
+
+    def registrar_chamada(self):
+        """Conta a chamada e retorna (uso_pct, codigo_erro ou None)."""
+        agora = time.monotonic()
+        with self._lock:
+            self.chamadas += 1
+            self._recentes.append(agora)
+            while self._recentes and agora - self._recentes[0] > 60:
+                self._recentes.popleft()
+            uso = len(self._recentes) / self.capacidade * 100 if self.capacidade else 0.0
+            erro = None
+            if self.capacidade and uso > 100:
+                erro = 17
+            elif self.falhas and self._rng.random() < self.falhas:
+                erro = 80004
+            if erro:
+                self.erros += 1
+        return uso, erro
+
+    def linhas_consulta(self, params):
+        """
+        Linhas de uma consulta síncrona. As páginas seguintes da mesma
+        consulta reaproveitam a geração (só o cursor muda), para o custo do
+        fake não crescer com o quadrado do volume.
+        """
+        chave = json.dumps({k: v for k, v in params.items() if k not in PARAMS_PAGINA},
+                           sort_keys=True, default=str)
+        with self._lock:
+            linhas = self.consultas.get(chave)
+        if linhas is None:
+            linhas = self.gerador.linhas(params.get("fields", []), params)
+            with self._lock:
+                self.consultas[chave] = linhas
+                while len(self.consultas) > CONSULTAS_EM_MEMORIA:
+                    self.consultas.pop(next(iter(self.consultas)))
+        return linhas
+
+    def criar_job(self, params):
+        with self._lock:
+            job_id = str(next(self._proximo))
+            self.jobs[job_id] = {"params": params, "polls": 0, "linhas": None}
+        return job_id
+
+    def status_job(self, job_id):
+        with self._lock:
+            job = self.jobs[job_id]
+            job["polls"] += 1
+            pct = min(100, int(job["polls"] / self.polls * 100))
+        if pct >= 100 and job["linhas"] is None:
+            p = job["params"]
+            job["linhas"] = self.gerador.linhas(p.get("fields", []), p)
+        status = "Job Completed" if pct >= 100 else "Job Running"
+        return {"id": job_id, "async_status": status, "async_percent_completion": pct}
+
+
+class HandlerFake(BaseHTTPRequestHandler):
+    estado = None   # EstadoFake, definido em criar_servidor()
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _responder(self, corpo, status=200):
+        dados = json.dumps(corpo).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        if self.estado.capacidade:
+            pct = round(min(self.uso, 100), 2)
+            self.send_header("x-ad-account-usage", json.dumps(
+                {"acc_id_util_pct": pct, "reset_time_duration": 60 if pct >= 100 else 0}))
+            self.send_header("x-fb-ads-insights-throttle", json.dumps(
+                {"app_id_util_pct": pct, "acc_id_util_pct": pct}))
+            self.send_header("x-business-use-case-usage", json.dumps(
+                {"1": [{"type": "ads_insights", "call_count": pct, "total_cputime": pct / 2,
+                        "total_time": pct / 2,
+                        "estimated_time_to_regain_access": 1 if pct >= 100 else 0}]}))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _limitar(self):
+        """Aplica a simulação de limite; True se a chamada foi recusada."""
+        recusa = self._recusa()
+        if recusa:
+            self._responder(recusa[1], recusa[0])
+        return recusa is not None
+
+    def _recusa(self):
+        """Conta a chamada; (status, corpo) do erro simulado, ou None."""
+        self.uso, erro = self.estado.registrar_chamada()
+        if erro == 17:
+            return _corpo_erro("User request limit reached", 400, 17)
+        if erro:
+            return _corpo_erro("There have been too many calls from this ad-account.", 400, 80004)
+        return None
+
+    def _erro(self, msg, status=400, code=100):
+        status, corpo = _corpo_erro(msg, status, code)
+        self._responder(corpo, status)
+
+    def _partes(self):
+        url = urlsplit(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        if partes and re.fullmatch(r"v\d+\.\d+", partes[0]):
+            partes = partes[1:]
+        return url, partes
+
+    def _paginar(self, linhas, params, url):
+        return 200, self._pagina(linhas, params, url)
+
+    def _pagina(self, linhas, params, url):
+        limite = int(params.get("limit", 25))
+        offset = int(params.get("after", 0) or 0)
+        pagina = linhas[offset:offset + limite]
+        corpo  = {"data": pagina,
+                  "paging": {"cursors": {"before": str(offset),
+                                         "after": str(offset + len(pagina))}}}
+        if offset + limite < len(linhas):
+            q = parse_qs(url.query)
+            q["after"] = [str(offset + limite)]
+            host = self.headers.get("Host", "127.0.0.1")
+            corpo["paging"]["next"] = (f"http://{host}{url.path}?"
+                                       f"{urlencode({k: v[-1] for k, v in q.items()})}")
+        return corpo
+
+    def _get(self, url, partes, params):
+        """Resposta de um GET como (status, corpo)."""
+        if len(partes) == 2 and partes[0].startswith("act_") and partes[1] == "insights":
+            linhas = self.estado.linhas_consulta(params)
+            return self._paginar(linhas, params, url)
+
+        if partes and partes[0] in self.estado.jobs:
+            if len(partes) == 1:
+                return 200, self.estado.status_job(partes[0])
+            if partes[1] == "insights":
+                linhas = self.estado.jobs[partes[0]]["linhas"]
+                if linhas is None:
+                    return _corpo_erro("Relatorio ainda nao concluido")
+                return self._paginar(linhas, params, url)
+
+        if len(partes) == 1:
+            obj = self.estado.gerador.objeto(partes[0], params.get("fields", []))
+            if obj is not None:
+                return 200, obj
+
+        return _corpo_erro(f"Caminho nao suportado: {url.path}", 404, 803)
+
+    def do_GET(self):
+        if self._limitar():
+            return
+        url, partes = self._partes()
+        status, corpo = self._get(url, partes, _decodificar(parse_qs(url.query)))
+        self._responder(corpo, status)
+
+    def _lote(self, chamadas):
+        """Batch: cada chamada conta no limite e tem status/corpo próprios."""
+        respostas = []
+        for c in chamadas:
+            recusa = self._recusa()
+            if recusa:
+                status, corpo = recusa
+            elif c.get("method", "GET").upper() != "GET":
+                status, corpo = _corpo_erro("Fake suporta so GET em lotes")
+            else:
+                url = urlsplit("/" + c.get("relative_url", "").lstrip("/"))
+                partes = [p for p in url.path.split("/") if p]
+                if partes and re.fullmatch(r"v\d+\.\d+", partes[0]):
+                    partes = partes[1:]
+                status, corpo = self._get(url, partes, _decodificar(parse_qs(url.query)))
+            respostas.append({"code": status, "headers": [], "body": json.dumps(corpo)})
+        return respostas
+
+    def do_POST(self):
+        if self._limitar():
+            return
+        url, partes = self._partes()
+        tamanho = int(self.headers.get("Content-Length", 0) or 0)
+        corpo   = self.rfile.read(tamanho).decode("utf-8")
+        params  = _decodificar(parse_qs(corpo))
+
+        if not partes and isinstance(params.get("batch"), list):
+            if len(params["batch"]) > 50:
+                return self._erro("Too many requests in batch message. Maximum batch size is 50")
+            return self._responder(self._lote(params["batch"]))
+        if len(partes) == 2 and partes[0].startswith("act_") and partes[1] == "insights":
+            return self._responder({"report_run_id": self.estado.criar_job(params)})
+        self._erro(f"Caminho nao suportado: {url.path}", status=404, code=803)
+
+
+def _corpo_erro(msg, status=400, code=100):
+    return status, {"error": {"message": msg, "type": "OAuthException",
+                              "code": code, "fbtrace_id": "fake"}}
+
+
+def criar_servidor(porta=PORTA_PADRAO, host="127.0.0.1", gerador=None, polls=3,
+                   capacidade=0, falhas=0.0):
+    """Cria o servidor (sem iniciar). Use porta=0 para uma porta livre."""
+    estado  = EstadoFake(gerador or GeradorInsights(), polls=polls,
+                         capacidade=capacidade, falhas=falhas)
+    handler = type("HandlerFakeConfigurado", (HandlerFake,), {"estado": estado})
+    servidor = ThreadingHTTPServer((host, porta), handler)
+    servidor.estado = estado
+    return servidor
+
+
+def iniciar_em_thread(**kwargs):
+    """Sobe o servidor em uma thread daemon e retorna (servidor, url)."""
+    servidor = criar_servidor(**kwargs)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    host, porta = servidor.server_address[:2]
+    return servidor, f"http://{host}:{porta}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor fake da Insights API")
+    parser.add_argument("--porta",     type=int, default=PORTA_PADRAO)
+    parser.add_argument("--campanhas", type=int, default=6)
+    parser.add_argument("--anuncios",  type=int, default=4, help="Anuncios por campanha")
+    parser.add_argument("--dias",      type=int, default=None,
+                        help="Dias das janelas last_Nd (padrao: o do date_preset)")
+    parser.add_argument("--posicionamentos", type=int, default=None,
+                        help=f"Posicionamentos distintos (padrao: {len(POSICIONAMENTOS)})")
+    parser.add_argument("--idades",    type=int, default=None, help=f"Faixas etarias (1-{len(IDADES)})")
+    parser.add_argument("--generos",   type=int, default=None, help=f"Generos (1-{len(GENEROS)})")
+    parser.add_argument("--horarios",  type=int, default=None, help=f"Faixas horarias (1-{len(HORARIOS)})")
+    parser.add_argument("--polls",     type=int, default=3,
+                        help="Consultas de status ate o relatorio assincrono concluir")
+    parser.add_argument("--capacidade", type=int, default=0,
+                        help="Chamadas por minuto antes do erro #17 (0 = sem limite)")
+    parser.add_argument("--falhas", type=float, default=0.0,
+                        help="Fracao das chamadas que devolve erro #80004")
+    args = parser.parse_args()
+
+    try:
+        gerador = GeradorInsights(args.campanhas, args.anuncios, dias=args.dias, cardinalidades={
+            "posicionamentos": args.posicionamentos, "idades": args.idades,
+            "generos": args.generos, "horarios": args.horarios})
+    except ValueError as erro:
+        parser.error(str(erro))
+    servidor = criar_servidor(args.porta, gerador=gerador, polls=args.polls,
+                              capacidade=args.capacidade, falhas=args.falhas)
+    print(f"Fake Insights API em http://127.0.0.1:{args.porta} (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+formatos.py
+Leitura dos formatos de texto que se repetem no pipeline. Os padrões são
+compilados uma vez e o resultado fica guardado por valor distinto — os
+mesmos intervalos de hora e nomes de campanha aparecem em todas as páginas,
+dias e contas:
+
+  hora(intervalo)       "09:00:00 - 09:59:59" → 9  (-1 se não reconhecer)
+  imersao(nome)         "Imersao Jan/25 - LAL 1pct" → "Imersao Jan/25"
+                        (IMERSAO_PADRAO sem rótulo de imersão)
+  tipo_campanha(nome)   primeira regra de tipo com palavra-chave contida no
+                        nome → tipo (TIPO_PADRAO se nenhuma) — Classificador
+  lookalike(nome)       nome de público semelhante ("LAL", "Lal5", "Lookalike"...)?
+                        — o mesmo RE_LOOKALIKE da regra "Prospecting LAL"
+
+Variantes para colunas do pandas (horas, imersoes, tipos_campanha): a função
+roda uma vez por valor distinto e o resultado é espalhado de volta pelos
+códigos de pd.factorize — uma campanha com 365 linhas diárias é lida uma vez.
+
+Tipos de campanha: as regras (tipo → palavras-chave, em ordem de prioridade)
+vêm de tipos_campanha.txt, se existir, ou de REGRAS_TIPO. O Classificador
+avalia os nomes ainda não vistos de uma vez — um str.contains vetorizado por
+regra e np.select na ordem das regras — e guarda o tipo de cada nome; é o
+mesmo para o 07 e o 09.
+
+Numa regra, as palavras casam como substring do nome em minúsculas; a
+palavra especial "@lookalike" é o RE_LOOKALIKE, o mesmo do lookalike() — é o
+que a regra padrão "Prospecting LAL" usa, para que campanhas (07/09) e
+públicos (11) concordem sobre o que é lookalike.
+
+Formato do arquivo — uma regra por linha, "#" comenta:
+  Remarketing:      remarketing, retarget
+  Prospecting LAL:  @lookalike
+
+Variável de ambiente (.env):
+  TIPOS_CAMPANHA_ARQUIVO  regras de tipo (padrão: tipos_campanha.txt ao lado dos scripts)
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import numpy as np
+    import pandas as pd
+    PANDAS_OK = True
+except ImportError:
+    PANDAS_OK = False
+
+BASE_DIR     = Path(__file__).parent
+ARQUIVO_TIPOS = Path(os.getenv("TIPOS_CAMPANHA_ARQUIVO") or BASE_DIR / "tipos_campanha.txt")
+
+CACHE_NOMES = 65_536      # nomes distintos guardados por função / classificador
+
+RE_HORA      = re.compile(r"(\d{1,2}):\d{2}:\d{2}")
+RE_IMERSAO   = re.compile(r"(Imer[sS][aã][oO]\s+\S+)")
+# "lal" no início de uma palavra ou colado a números ("LAL 1pct", "Lal5",
+# "LAL1pct"), mas não dentro de outra palavra ("bilal")
+RE_LOOKALIKE = re.compile(r"lookalike|semelhante|(?<![a-z])lal", re.IGNORECASE)
+
+IMERSAO_PADRAO = "Campanha Atual"
+
+# Palavra de regra que representa o RE_LOOKALIKE
+PALAVRA_LOOKALIKE = "@lookalike"
+
+# Em ordem de prioridade: vale a primeira regra com alguma palavra no nome
+# (minúsculo, como substring; PALAVRA_LOOKALIKE casa pelo RE_LOOKALIKE)
+REGRAS_TIPO = [
+    ("Remarketing",     ("remarketing", "retarget")),
+    ("Prospecting LAL", (PALAVRA_LOOKALIKE,)),
+    ("Brand Awareness", ("brand", "awareness")),
+    ("Video Views",     ("video",)),
+    ("Lead Generation", ("lead",)),
+]
+TIPO_PADRAO = "Outros"
+
+
+# ─────────────────────────────────────────────
+# VALOR A VALOR
+# ─────────────────────────────────────────────
+
+@lru_cache(maxsize=256)
+def hora(intervalo):
+    """
+    Converte "09:00:00 - 09:59:00" → 9
+    Converte "18:00:00 - 18:59:00" → 18
+    """
+    m = RE_HORA.match(intervalo.strip()) if isinstance(intervalo, str) else None
+    return int(m.group(1)) if m else -1
+
+
+@lru_cache(maxsize=CACHE_NOMES)
+def imersao(nome):
+    """Rótulo "Imersao <mês>" contido no nome da campanha, ou IMERSAO_PADRAO."""
+    m = RE_IMERSAO.search(nome) if isinstance(nome, str) else None
+    return m.group(1) if m else IMERSAO_PADRAO
+
+
+def tipo_campanha(nome):
+    """Tipo da campanha pela primeira regra que casa com o nome (CLASSIFICADOR)."""
+    return CLASSIFICADOR.tipo(nome)
+
+
+@lru_cache(maxsize=CACHE_NOMES)
+def lookalike(nome):
+    """True se o nome do público indica um público semelhante (RE_LOOKALIKE)."""
+    return bool(RE_LOOKALIKE.search(nome or ""))
+
+
+# ─────────────────────────────────────────────
+# COLUNAS (pandas)
+# ─────────────────────────────────────────────
+
+def _por_distintos(serie, funcao, dtype=object):
+    """Aplica `funcao` uma vez por valor distinto de `serie` (nulos → funcao(None))."""
+    codigos, distintos = pd.factorize(serie)
+    valores = np.array([funcao(v) for v in distintos] + [funcao(None)], dtype=dtype)
+    return pd.Series(valores[codigos], index=serie.index, name=serie.name)
+
+
+def horas(serie):
+    """hora() de uma coluna de intervalos (int64, -1 onde não reconhecer)."""
+    return _por_distintos(serie, hora, dtype="int64")
+
+
+def imersoes(serie):
+    """imersao() de uma coluna de nomes de campanha."""
+    return _por_distintos(serie, imersao)
+
+
+def tipos_campanha(serie):
+    """tipo_campanha() de uma coluna de nomes de campanha (vetorizado)."""
+    return CLASSIFICADOR.classificar(serie)
+
+
+# ─────────────────────────────────────────────
+# TIPOS DE CAMPANHA
+# ─────────────────────────────────────────────
+
+class Classificador:
+    """
+    Tipo de campanha por palavras-chave: vale a primeira regra, na ordem de
+    `regras` ([(tipo, palavras)]), com alguma palavra contida no nome em
+    minúsculas (PALAVRA_LOOKALIKE casa pelo RE_LOOKALIKE). O resultado de
+    cada nome fica guardado (até CACHE_NOMES nomes), então cada nome é
+    avaliado uma vez por processo.
+    """
+
+    def __init__(self, regras, padrao=TIPO_PADRAO):
+        self.regras = [(tipo, tuple(p.lower() for p in palavras)) for tipo, palavras in regras]
+        self.padrao = padrao
+        self._padroes = [_padrao_regra(palavras) for _, palavras in self.regras]
+        self._tipos = {}
+
+    def tipo(self, nome):
+        """Tipo de um nome."""
+        if nome not in self._tipos:
+            n = str(nome).lower()
+            self._guardar({nome: next((tipo for (tipo, _), padrao in zip(self.regras, self._padroes)
+                                       if padrao.search(n)), self.padrao)})
+        return self._tipos[nome]
+
+    def classificar(self, serie):
+        """Tipos de uma coluna de nomes, avaliando de uma vez só os nomes novos."""
+        codigos, distintos = pd.factorize(serie)
+        nulo  = self.tipo(None)
+        mapa  = {n: self._tipos[n] for n in distintos if n in self._tipos}
+        novos = [n for n in distintos if n not in mapa]
+        if novos:
+            mapa.update(zip(novos, self._avaliar(novos)))
+            self._guardar({n: mapa[n] for n in novos})
+        valores = np.array([mapa[n] for n in distintos] + [nulo], dtype=object)
+        return pd.Series(valores[codigos], index=serie.index, name=serie.name)
+
+    def _avaliar(self, nomes):
+        """Tipos de `nomes`: um str.contains por regra e a primeira que casou."""
+        if not self.regras:
+            return [self.padrao] * len(nomes)
+        minusculos = pd.Series(nomes, dtype=object).astype(str).str.lower()
+        casou = [minusculos.str.contains(padrao, regex=True).to_numpy(dtype=bool)
+                 for padrao in self._padroes]
+        return np.select(casou, [tipo for tipo, _ in self.regras], default=self.padrao).tolist()
+
+    def _guardar(self, tipos):
+        if len(self._tipos) + len(tipos) > CACHE_NOMES:
+            self._tipos.clear()
+        self._tipos.update(tipos)
+
+
+def _padrao_regra(palavras):
+    """Regex de uma regra: as palavras escapadas e, com PALAVRA_LOOKALIKE, o RE_LOOKALIKE."""
+    if palavras == (PALAVRA_LOOKALIKE,):
+        return RE_LOOKALIKE
+    partes = [RE_LOOKALIKE.pattern if p == PALAVRA_LOOKALIKE else re.escape(p) for p in palavras]
+    return re.compile("|".join(partes))
+
+
+def ler_regras(arquivo):
+    """Regras [(tipo, palavras)] do arquivo, na ordem; ValueError se mal formado."""
+    regras = []
+    for n, linha in enumerate(Path(arquivo).read_text(encoding="utf-8").splitlines(), 1):
+        linha = linha.split("#", 1)[0].strip()
+        if not linha:
+            continue
+        tipo, sep, palavras = linha.partition(":")
+        palavras = [p.strip() for p in palavras.split(",") if p.strip()]
+        if not sep or not tipo.strip() or not palavras:
+            raise ValueError(f"{Path(arquivo).name}, linha {n}: use 'Tipo: palavra, palavra'")
+        regras.append((tipo.strip(), palavras))
+    return regras
+
+
+def _carregar_classificador():
+    if ARQUIVO_TIPOS.exists():
+        try:
+            return Classificador(ler_regras(ARQUIVO_TIPOS))
+        except (OSError, ValueError) as erro:
+            print(f"[AVISO] Regras de tipo ignoradas ({erro}) — usando as padrão.")
+    return Classificador(REGRAS_TIPO)
+
+
+CLASSIFICADOR = _carregar_classificador()
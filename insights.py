@@ -0,0 +1,270 @@
+"""
+insights.py
+Camada comum de consulta à Insights API usada pelos extratores 01-06.
+
+Modos:
+  síncrono   — account.get_insights(...) e iteração direta do cursor.
+  assíncrono — cria um relatório (AdReportRun), consulta o status com
+               backoff até "Job Completed" e então percorre as páginas do
+               resultado. Recomendado para level=ad e breakdowns, que estouram
+               o tempo limite da chamada síncrona em contas grandes.
+
+Toda chamada passa pelo ApiComLimite (limites.py), instalado em config.py:
+ritmo guiado pelos cabeçalhos de uso da API e repetição com backoff em erros
+de limite de taxa (#17, #80004...).
+
+Extração incremental (INSIGHTS_INCREMENTAL=1): para consultas com
+date_preset "last_Nd", só os dias posteriores ao último dia guardado em
+armazem.py (mais INSIGHTS_REPROCESSAR_DIAS dias, por causa da atribuição
+tardia de conversões) são pedidos à API, com time_increment=1. As linhas
+diárias da janela inteira são então lidas do armazém — por isso os
+extratores sempre somam linhas por chave. Campos não aditivos (NAO_ADITIVOS,
+o alcance) de consultas sem time_increment não vão para o armazém: chegam
+numa linha a mais por chave, de uma consulta do período inteiro.
+
+Cache (cache.py): a mesma consulta repetida dentro de CACHE_TTL é servida do
+disco, sem chamada à API — desligue com CACHE_INSIGHTS=0.
+
+Variáveis de ambiente (.env):
+  INSIGHTS_ASYNC          "auto" (padrão) → assíncrono quando há breakdowns ou
+                          level=ad; "1" sempre; "0" nunca
+  INSIGHTS_LIMITE_PAGINA  linhas por página (padrão 500)
+  INSIGHTS_ASYNC_TIMEOUT  segundos máximos aguardando um relatório (padrão 1800)
+  INSIGHTS_INCREMENTAL    "1" ativa a extração incremental (padrão "0")
+  INSIGHTS_REPROCESSAR_DIAS  dias finais rebuscados a cada execução (padrão 3)
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import date, timedelta
+from itertools import chain, islice
+
+from dotenv import load_dotenv
+from facebook_business.adobjects.adreportrun import AdReportRun
+
+# Antes dos módulos do projeto: armazem, cache e metricas leem o .env ao importar
+load_dotenv()
+
+import armazem
+import cache
+import metricas
+from config import account
+
+MODO_ASYNC     = os.getenv("INSIGHTS_ASYNC", "auto").strip().lower()
+LIMITE_PAGINA  = int(os.getenv("INSIGHTS_LIMITE_PAGINA", "500"))
+ASYNC_TIMEOUT  = float(os.getenv("INSIGHTS_ASYNC_TIMEOUT", "1800"))
+INCREMENTAL    = os.getenv("INSIGHTS_INCREMENTAL", "0").strip().lower() in ("1", "true", "sim")
+REPROCESSAR_DIAS = int(os.getenv("INSIGHTS_REPROCESSAR_DIAS", "3"))
+
+# Intervalo entre consultas de status do relatório (cresce até o máximo)
+POLL_INICIAL   = 2.0
+POLL_MAXIMO    = 30.0
+POLL_FATOR     = 1.5
+
+# Não se somam entre dias (alcance é de pessoas únicas): numa consulta de
+# período feita no modo incremental vêm de uma consulta à parte, sem
+# time_increment, em vez das linhas diárias do armazém
+NAO_ADITIVOS = ("reach",)
+
+STATUS_CONCLUIDO = "Job Completed"
+STATUS_FALHA     = ("Job Failed", "Job Skipped")
+
+
+class ErroRelatorio(Exception):
+    """O relatório assíncrono falhou ou não terminou dentro do tempo limite."""
+
+
+def usar_async(params):
+    """Decide o modo da consulta conforme INSIGHTS_ASYNC."""
+    if MODO_ASYNC in ("1", "true", "sim"):
+        return True
+    if MODO_ASYNC in ("0", "false", "nao"):
+        return False
+    return bool(params.get("breakdowns")) or params.get("level") == "ad"
+
+
+def aguardar_relatorio(job, timeout=ASYNC_TIMEOUT):
+    """
+    Consulta o status do relatório até ele concluir.
+    O intervalo entre consultas começa em POLL_INICIAL e cresce por
+    POLL_FATOR até POLL_MAXIMO.
+    """
+    inicio = time.monotonic()
+    espera = POLL_INICIAL
+    while True:
+        job.api_get(fields=[
+            AdReportRun.Field.async_status,
+            AdReportRun.Field.async_percent_completion,
+        ])
+        status = job.get(AdReportRun.Field.async_status, "")
+        pct    = int(job.get(AdReportRun.Field.async_percent_completion, 0) or 0)
+
+        if status == STATUS_CONCLUIDO:
+            return job
+        if status in STATUS_FALHA:
+            raise ErroRelatorio(f"Relatorio {job.get_id()} terminou com status '{status}'.")
+
+        decorrido = time.monotonic() - inicio
+        if decorrido > timeout:
+            raise ErroRelatorio(
+                f"Relatorio {job.get_id()} nao concluiu em {timeout:.0f}s ({pct}%)."
+            )
+
+        print(f"     relatorio {job.get_id()}: {status or 'aguardando'} {pct}% "
+              f"({decorrido:.0f}s)")
+        time.sleep(espera)
+        espera = min(espera * POLL_FATOR, POLL_MAXIMO)
+
+
+def buscar(fields, params, assincrono=None, consulta=None):
+    """
+    Executa a consulta e retorna um iterador sobre as linhas do Insights
+    (dicts). As páginas são buscadas sob demanda durante a iteração — ver
+    buscar_paginas().
+    """
+    return chain.from_iterable(buscar_paginas(fields, params, assincrono, consulta))
+
+
+def buscar_paginas(fields, params, assincrono=None, consulta=None):
+    """
+    Itera sobre a consulta página a página (listas de até LIMITE_PAGINA
+    dicts). Só uma página fica em memória por vez, então quem consome pode
+    transformar/agregar cada página e descartá-la, qualquer que seja o
+    tamanho da conta.
+    `assincrono=None` segue INSIGHTS_ASYNC. Com `consulta` (nome do
+    extrator) e INSIGHTS_INCREMENTAL ativo, usa buscar_incremental().
+    """
+    if consulta and INCREMENTAL and dias_do_preset(params.get("date_preset")):
+        paginas = _em_paginas(buscar_incremental(consulta, fields, params, assincrono))
+    else:
+        paginas = _paginas_api(fields, params, assincrono)
+    for pagina in paginas:
+        metricas.contar(linhas_lidas=len(pagina))
+        yield pagina
+
+
+def _em_paginas(linhas, tamanho=LIMITE_PAGINA):
+    """Agrupa um iterador de linhas em listas de até `tamanho` linhas."""
+    linhas = iter(linhas)
+    while pagina := list(islice(linhas, tamanho)):
+        yield pagina
+
+
+def _buscar_api(fields, params, assincrono=None):
+    """Cursor do SDK sobre o resultado da consulta (síncrona ou assíncrona)."""
+    params = dict(params)
+    params.setdefault("limit", LIMITE_PAGINA)
+
+    if assincrono is None:
+        assincrono = usar_async(params)
+
+    if not assincrono:
+        return account.get_insights(fields=list(fields), params=params)
+
+    job = account.get_insights(fields=list(fields), params=params, is_async=True)
+    print(f"     relatorio assincrono {job.get_id()} criado")
+    aguardar_relatorio(job)
+    return job.get_insights(params={"limit": params["limit"]})
+
+
+def _paginas_api(fields, params, assincrono=None):
+    """
+    Páginas da consulta: do cache em disco quando houver entrada válida;
+    senão da API (gravadas no cache ao longo do caminho).
+    """
+    k = cache.chave(account.get_id(), fields, params)
+    em_cache = cache.ler(k)
+    if em_cache is not None:
+        total = 0
+        for pagina in em_cache:
+            total += len(pagina)
+            metricas.contar(paginas_cache=1)
+            yield pagina
+        print(f"     cache: {total} linhas lidas do disco (CACHE_INSIGHTS=0 ignora)")
+        return
+    yield from cache.gravando(k, _paginas_cursor(fields, params, assincrono))
+
+
+def _paginas_cursor(fields, params, assincrono=None):
+    """
+    Páginas do cursor convertidas em dicts, com progresso por página. O
+    cursor do SDK guarda só a página corrente, e cada página é liberada
+    assim que quem consome passa para a próxima.
+    """
+    limite = params.get("limit", LIMITE_PAGINA)
+    linhas = (row.export_all_data() for row in _buscar_api(fields, params, assincrono))
+    total  = 0
+    for n, pagina in enumerate(_em_paginas(linhas, limite), 1):
+        total += len(pagina)
+        print(f"     pagina {n}: {len(pagina)} linhas (total {total})")
+        metricas.contar(paginas_api=1)
+        yield pagina
+
+
+def dias_do_preset(preset):
+    """"last_30d" → 30; None para presets que não são janelas móveis de dias."""
+    m = re.fullmatch(r"last_(\d+)d", preset or "")
+    return int(m.group(1)) if m else None
+
+
+def _chave(consulta, fields, params):
+    """Chave no armazém: extrator + conta + assinatura de campos/parâmetros."""
+    sem_data = {k: v for k, v in params.items()
+                if k not in ("date_preset", "time_range", "time_increment", "limit")}
+    assinatura = json.dumps([sorted(fields), sem_data], sort_keys=True, default=str)
+    return f"{consulta}:{account.get_id()}:{hashlib.sha1(assinatura.encode()).hexdigest()[:12]}"
+
+
+def buscar_incremental(consulta, fields, params, assincrono=None, hoje=None):
+    """
+    Atualiza o armazém só com os dias que faltam (mais a janela de
+    reprocessamento) e devolve as linhas diárias da janela do date_preset.
+    Se a consulta não pediu time_increment, os campos NAO_ADITIVOS vêm no
+    fim, em linhas do período inteiro (ver _linhas_periodo()).
+    """
+    hoje    = hoje or date.today()
+    dias    = dias_do_preset(params["date_preset"])
+    inicio  = hoje - timedelta(days=dias)
+    fim     = hoje - timedelta(days=1)
+    periodo = [] if "time_increment" in params else [f for f in fields if f in NAO_ADITIVOS]
+    fields  = [f for f in fields if f not in periodo]
+    chave   = _chave(consulta, fields, params)
+
+    ultimo = armazem.ultimo_dia(chave)
+    desde  = inicio
+    if ultimo:
+        desde = max(inicio, date.fromisoformat(ultimo) - timedelta(days=REPROCESSAR_DIAS - 1))
+
+    if desde <= fim:
+        p = {k: v for k, v in params.items() if k != "date_preset"}
+        p["time_range"]     = {"since": desde.isoformat(), "until": fim.isoformat()}
+        p["time_increment"] = 1
+        campos = list(fields) if "date_start" in fields else list(fields) + ["date_start"]
+        linhas = chain.from_iterable(_paginas_api(campos, p, assincrono))
+        n = armazem.substituir(chave, desde.isoformat(), fim.isoformat(), linhas)
+        print(f"     incremental: {(fim - desde).days + 1} dia(s) buscados "
+              f"({desde} a {fim}), {n} linhas atualizadas")
+    else:
+        print(f"     incremental: armazem ja atualizado ate {ultimo}")
+
+    diarias = armazem.ler(chave, inicio.isoformat(), fim.isoformat())
+    if not periodo:
+        return diarias
+    return chain(diarias, _linhas_periodo(periodo, fields, params, inicio, fim, assincrono))
+
+
+def _linhas_periodo(periodo, fields, params, inicio, fim, assincrono=None):
+    """
+    Linhas só com os campos `periodo` (e os nomes/ids do level) para a
+    janela inteira — somadas às diárias pelo extrator, dão o alcance único
+    do período em vez da soma dos alcances de cada dia.
+    """
+    ids = [f for f in fields if f.endswith(("_id", "_name"))]
+    p = {k: v for k, v in params.items() if k != "date_preset"}
+    p["time_range"] = {"since": inicio.isoformat(), "until": fim.isoformat()}
+    for pagina in _paginas_api(ids + list(periodo), p, assincrono):
+        for linha in pagina:
+            yield {k: v for k, v in linha.items() if k in ids or k in periodo}
@@ -0,0 +1,212 @@
+"""
+limites.py
+Controle de taxa das chamadas à Graph API.
+
+ApiComLimite substitui o FacebookAdsApi em config.py e passa por aqui em
+toda chamada (primeira página, paginação do cursor, status de relatórios):
+
+  • lê os cabeçalhos de uso devolvidos pela API
+      x-business-use-case-usage, x-ad-account-usage,
+      x-fb-ads-insights-throttle, x-app-usage
+    e reduz o ritmo quando o uso da conta/app se aproxima do limite;
+  • em erro de limite (#4, #17, #32, #613, #80000-#80014) ou erro
+    transitório, repete a chamada com backoff exponencial com jitter,
+    respeitando o tempo de recuperação informado pela API.
+
+Como o uso informado nos cabeçalhos é o da conta inteira, o ritmo se ajusta
+também quando vários processos consultam a mesma conta ao mesmo tempo.
+
+Variáveis de ambiente (.env):
+  API_TENTATIVAS       tentativas por chamada (padrão 6)
+  API_BACKOFF_BASE     espera base do backoff em segundos (padrão 2)
+  API_ESPERA_MAXIMA    teto de qualquer espera em segundos (padrão 300)
+  API_USO_REDUZIR      % de uso a partir do qual as chamadas são espaçadas (padrão 75)
+  API_USO_PAUSAR       % de uso a partir do qual a chamada espera a recuperação (padrão 95)
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from facebook_business.api import FacebookAdsApi
+from facebook_business.exceptions import FacebookRequestError
+
+import metricas
+
+TENTATIVAS     = int(os.getenv("API_TENTATIVAS", "6"))
+BACKOFF_BASE   = float(os.getenv("API_BACKOFF_BASE", "2"))
+ESPERA_MAXIMA  = float(os.getenv("API_ESPERA_MAXIMA", "300"))
+USO_REDUZIR    = float(os.getenv("API_USO_REDUZIR", "75"))
+USO_PAUSAR     = float(os.getenv("API_USO_PAUSAR", "95"))
+
+# Pausa aplicada entre USO_REDUZIR e USO_PAUSAR cresce linearmente até este valor
+PAUSA_REDUZIDA_MAX = 10.0
+
+CABECALHOS_USO = ("x-business-use-case-usage", "x-ad-account-usage",
+                  "x-fb-ads-insights-throttle", "x-app-usage")
+
+CODIGOS_LIMITE = {4, 17, 32, 613} | set(range(80000, 80015))
+CODIGOS_TRANSITORIOS = {1, 2}
+
+
+def _json(valor):
+    if not valor:
+        return None
+    try:
+        return json.loads(valor)
+    except ValueError:
+        return None
+
+
+def tem_uso(headers):
+    """True se a resposta trouxe algum dos cabeçalhos de uso (mesmo zerado)."""
+    return any(k.lower() in CABECALHOS_USO for k in (headers or {}))
+
+
+def ler_uso(headers):
+    """
+    Extrai dos cabeçalhos o maior percentual de uso e o tempo estimado
+    (segundos) até recuperar o acesso.
+    Retorna (uso_pct, recuperar_s); (0.0, 0.0) se não houver cabeçalhos.
+    """
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    uso, recuperar = 0.0, 0.0
+
+    buc = _json(headers.get("x-business-use-case-usage")) or {}
+    for registros in buc.values():
+        for r in registros if isinstance(registros, list) else []:
+            uso = max(uso, float(r.get("call_count", 0)),
+                      float(r.get("total_cputime", 0)), float(r.get("total_time", 0)))
+            recuperar = max(recuperar, float(r.get("estimated_time_to_regain_access", 0)) * 60)
+
+    conta = _json(headers.get("x-ad-account-usage")) or {}
+    uso = max(uso, float(conta.get("acc_id_util_pct", 0)))
+    recuperar = max(recuperar, float(conta.get("reset_time_duration", 0)))
+
+    throttle = _json(headers.get("x-fb-ads-insights-throttle")) or {}
+    uso = max(uso, float(throttle.get("app_id_util_pct", 0)),
+              float(throttle.get("acc_id_util_pct", 0)))
+
+    app = _json(headers.get("x-app-usage")) or {}
+    uso = max(uso, *(float(app.get(k, 0)) for k in ("call_count", "total_cputime", "total_time")))
+
+    return uso, recuperar
+
+
+class Limitador:
+    """
+    Guarda o último uso informado pela API e decide quanto esperar antes da
+    próxima chamada. Compartilhado entre threads.
+    """
+
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self.uso        = 0.0
+        self.recuperar  = 0.0
+        self.visto_em   = 0.0
+        self.esperas    = 0
+        self.repeticoes = 0
+
+    def registrar(self, headers):
+        # Sem cabeçalhos de uso a resposta não diz nada; com eles — mesmo em
+        # 0% — o estado anterior é substituído, senão uma pausa passada nunca sai
+        if not tem_uso(headers):
+            return
+        uso, recuperar = ler_uso(headers)
+        with self._lock:
+            self.uso, self.recuperar, self.visto_em = uso, recuperar, time.monotonic()
+
+    def _espera(self):
+        """(espera em segundos, uso) pelo último estado registrado."""
+        with self._lock:
+            uso, recuperar, visto_em = self.uso, self.recuperar, self.visto_em
+        if uso >= USO_PAUSAR:
+            restante = recuperar - (time.monotonic() - visto_em)
+            return min(max(restante, PAUSA_REDUZIDA_MAX), ESPERA_MAXIMA), uso
+        if uso >= USO_REDUZIR:
+            return PAUSA_REDUZIDA_MAX * (uso - USO_REDUZIR) / (USO_PAUSAR - USO_REDUZIR), uso
+        return 0.0, uso
+
+    def espera_necessaria(self):
+        return self._espera()[0]
+
+    def aguardar(self):
+        espera, uso = self._espera()
+        if espera > 0:
+            with self._lock:
+                self.esperas += 1
+            print(f"     [limite] uso da API em {uso:.0f}% — aguardando {espera:.1f}s")
+            time.sleep(espera)
+
+    def contar_repeticao(self):
+        with self._lock:
+            self.repeticoes += 1
+
+
+def backoff(tentativa, minimo=0.0):
+    """Espera da tentativa N: sorteada entre metade e o total de BACKOFF_BASE·2^N, nunca abaixo de `minimo`."""
+    teto = min(ESPERA_MAXIMA, BACKOFF_BASE * (2 ** tentativa))
+    return min(ESPERA_MAXIMA, max(minimo, random.uniform(teto / 2, teto)))
+
+
+def erro_repetivel(erro):
+    """True para erros de limite de taxa ou transitórios da API."""
+    if isinstance(erro, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(erro, FacebookRequestError):
+        return (erro.api_error_code() in CODIGOS_LIMITE
+                or erro.api_error_code() in CODIGOS_TRANSITORIOS
+                or erro.api_transient_error()
+                or (erro.http_status() or 0) >= 500)
+    return False
+
+
+class ApiComLimite(FacebookAdsApi):
+    """FacebookAdsApi com ritmo guiado pelos cabeçalhos de uso e repetição com backoff."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limitador = Limitador()
+
+    @classmethod
+    def set_default_api(cls, api_instance):
+        # Registra no FacebookAdsApi para que AdAccount & cia. usem esta instância
+        FacebookAdsApi.set_default_api(api_instance)
+
+    def call(self, *args, **kwargs):
+        for tentativa in range(TENTATIVAS):
+            # Nas repetições o ritmo já entra no backoff (minimo=) — esperar
+            # aqui de novo pagaria a mesma pausa duas vezes
+            if tentativa == 0:
+                self.limitador.aguardar()
+            inicio = time.perf_counter()
+            try:
+                resposta = super().call(*args, **kwargs)
+            except Exception as erro:
+                metricas.contar(chamadas_api=1, tempo_api_ms=_ms_desde(inicio))
+                if isinstance(erro, FacebookRequestError):
+                    self.limitador.registrar(erro.http_headers())
+                if not erro_repetivel(erro) or tentativa == TENTATIVAS - 1:
+                    raise
+                espera = backoff(tentativa, minimo=self.limitador.espera_necessaria())
+                self.limitador.contar_repeticao()
+                print(f"     [limite] {_descrever(erro)} — nova tentativa "
+                      f"{tentativa + 2}/{TENTATIVAS} em {espera:.1f}s")
+                time.sleep(espera)
+                continue
+            metricas.contar(chamadas_api=1, tempo_api_ms=_ms_desde(inicio))
+            self.limitador.registrar(resposta.headers())
+            return resposta
+
+
+def _ms_desde(inicio):
+    return round((time.perf_counter() - inicio) * 1000)
+
+
+def _descrever(erro):
+    if isinstance(erro, FacebookRequestError):
+        return f"erro #{erro.api_error_code()} ({erro.api_error_message()})"
+    return type(erro).__name__
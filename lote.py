@@ -0,0 +1,229 @@
+"""
+lote.py
+Chamadas em lote (Graph API batch) para consultas por objeto — campanhas,
+conjuntos de anúncios, públicos — sem uma ida e volta por objeto.
+
+Uso:
+    from lote import Lote
+
+    with Lote() as lote:
+        futuros = {i: lote.get(i, fields=["name", "targeting"]) for i in ids}
+    for i, f in futuros.items():
+        if f.ok():
+            print(f.resultado()["name"])
+        else:
+            print(f"[AVISO] {i}: {f.erro().api_error_message()}")
+
+Cada get() devolve um Futuro na hora; as chamadas pendentes vão à API em
+grupos de até 50 (limite da Graph API) ao sair do `with`, ao chamar
+executar() ou no primeiro Futuro.resultado().
+
+Falhas parciais: cada chamada do lote tem seu próprio resultado. Erros de
+limite ou transitórios (limites.erro_repetivel) e chamadas que a API deixou
+sem resposta são reenviadas em um novo lote, com backoff, até API_TENTATIVAS
+vezes; os demais erros ficam no Futuro sem afetar o resto do lote. O POST
+do lote passa pelo ApiComLimite (config.py), então ritmo e repetição do
+lote inteiro seguem limites.py.
+
+Os lotes de uma mesma execução são enviados em paralelo, até
+LOTE_CONCORRENCIA requisições simultâneas.
+
+Variáveis de ambiente (.env):
+  LOTE_TAMANHO       chamadas por lote (padrão e máximo 50)
+  LOTE_CONCORRENCIA  lotes enviados ao mesmo tempo (padrão 4)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from facebook_business.api import FacebookAdsApi, FacebookAdsApiBatch
+from facebook_business.exceptions import FacebookRequestError
+
+import config  # inicializa o ApiComLimite como API padrão
+import metricas
+from limites import TENTATIVAS, backoff, erro_repetivel
+
+TAMANHO_MAXIMO = 50
+TAMANHO_LOTE   = min(TAMANHO_MAXIMO, int(os.getenv("LOTE_TAMANHO", str(TAMANHO_MAXIMO))))
+CONCORRENCIA   = int(os.getenv("LOTE_CONCORRENCIA", "4"))
+
+
+class Futuro:
+    """Resultado de uma chamada agendada em um Lote."""
+
+    def __init__(self, lote):
+        self._lote  = lote
+        self._feito = False
+        self._valor = None
+        self._erro  = None
+
+    def feito(self):
+        return self._feito
+
+    def ok(self):
+        """True se a chamada terminou com sucesso (executa o lote se preciso)."""
+        self._aguardar()
+        return self._erro is None
+
+    def erro(self):
+        """FacebookRequestError da chamada, ou None."""
+        self._aguardar()
+        return self._erro
+
+    def resultado(self):
+        """Corpo JSON da resposta; levanta o erro da chamada se ela falhou."""
+        self._aguardar()
+        if self._erro is not None:
+            raise self._erro
+        return self._valor
+
+    def _aguardar(self):
+        if not self._feito:
+            self._lote.executar()
+
+    def _resolver(self, valor=None, erro=None):
+        self._valor, self._erro, self._feito = valor, erro, True
+
+
+class _Chamada:
+    __slots__ = ("futuro", "metodo", "caminho", "params", "erro")
+
+    def __init__(self, futuro, metodo, caminho, params):
+        self.futuro  = futuro
+        self.metodo  = metodo
+        self.caminho = caminho
+        self.params  = params
+        self.erro    = None
+
+
+class Lote:
+    """Agrupa chamadas à Graph API em requisições batch de até `tamanho` chamadas."""
+
+    def __init__(self, api=None, tamanho=TAMANHO_LOTE, concorrencia=CONCORRENCIA):
+        self.api          = api or FacebookAdsApi.get_default_api()
+        self.tamanho      = max(1, min(tamanho, TAMANHO_MAXIMO))
+        self.concorrencia = max(1, concorrencia)
+        self._pendentes   = []
+        self._lock        = threading.Lock()
+        self.requisicoes  = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, tb):
+        if tipo is None:
+            self.executar()
+
+    def __len__(self):
+        return len(self._pendentes)
+
+    def get(self, objeto_id, fields=None, params=None, aresta=None):
+        """
+        Agenda GET /<objeto_id>[/<aresta>]?fields=... e devolve o Futuro.
+        Com `aresta`, o resultado é a primeira página ({"data": [...]}).
+        """
+        params = dict(params or {})
+        if fields:
+            params["fields"] = ",".join(fields)
+        caminho = (str(objeto_id), aresta) if aresta else (str(objeto_id),)
+        return self.agendar("GET", caminho, params)
+
+    def agendar(self, metodo, caminho, params=None):
+        futuro = Futuro(self)
+        self._pendentes.append(_Chamada(futuro, metodo, caminho, params or {}))
+        return futuro
+
+    def executar(self):
+        """Envia todas as chamadas pendentes; repete as que falharam por limite."""
+        pendentes, self._pendentes = self._pendentes, []
+        for tentativa in range(TENTATIVAS):
+            grupos = [pendentes[i:i + self.tamanho] for i in range(0, len(pendentes), self.tamanho)]
+            if len(grupos) > 1 and self.concorrencia > 1:
+                with ThreadPoolExecutor(max_workers=min(self.concorrencia, len(grupos))) as pool:
+                    repetir = [c for r in pool.map(metricas.propagar(self._enviar), grupos) for c in r]
+            else:
+                repetir = [c for g in grupos for c in self._enviar(g)]
+            if not repetir:
+                return
+            if tentativa == TENTATIVAS - 1:
+                break
+            espera = backoff(tentativa)
+            print(f"     [lote] {len(repetir)} chamada(s) sem sucesso — nova tentativa "
+                  f"{tentativa + 2}/{TENTATIVAS} em {espera:.1f}s")
+            time.sleep(espera)
+            pendentes = repetir
+
+        for c in repetir:
+            c.futuro._resolver(erro=c.erro or FacebookRequestError(
+                "Chamada sem resposta no lote", {"relative_url": "/".join(c.caminho)},
+                None, {}, None))
+
+    def _enviar(self, grupo):
+        """Envia um lote; retorna as chamadas a repetir."""
+        repetir = []
+        batch = FacebookAdsApiBatch(self.api)
+
+        def sucesso(chamada):
+            return lambda resposta: chamada.futuro._resolver(valor=resposta.json())
+
+        def falha(chamada):
+            def tratar(resposta):
+                erro = resposta.error()
+                limitador = getattr(self.api, "limitador", None)
+                if limitador is not None:
+                    limitador.registrar(_cabecalhos(resposta.headers()))
+                if erro_repetivel(erro):
+                    chamada.erro = erro
+                    repetir.append(chamada)
+                else:
+                    chamada.futuro._resolver(erro=erro)
+            return tratar
+
+        for c in grupo:
+            batch.add(c.metodo, c.caminho, params=c.params,
+                      success=sucesso(c), failure=falha(c))
+
+        with self._lock:
+            self.requisicoes += 1
+        try:
+            batch.execute()
+        except FacebookRequestError as erro:
+            # O lote inteiro falhou (já repetido pelo ApiComLimite): erro em todas
+            for c in grupo:
+                c.futuro._resolver(erro=erro)
+            return []
+
+        # Sem resposta da API (ex.: tempo esgotado em uma das chamadas)
+        return repetir + [c for c in grupo if not c.futuro.feito() and c not in repetir]
+
+
+def _cabecalhos(headers):
+    """Cabeçalhos de uma resposta do lote ([{name, value}]) como dict."""
+    if isinstance(headers, dict):
+        return headers
+    return {h.get("name", ""): h.get("value", "") for h in headers or []}
+
+
+def buscar_objetos(ids, fields, tamanho=TAMANHO_LOTE, concorrencia=CONCORRENCIA):
+    """
+    Lê vários objetos pelo id em lotes. Retorna {id: dados}; ids que
+    falharam ficam de fora e são avisados no terminal.
+    """
+    lote = Lote(tamanho=tamanho, concorrencia=concorrencia)
+    futuros = {i: lote.get(i, fields=fields) for i in dict.fromkeys(ids)}
+    lote.executar()
+
+    resultado, falhas = {}, 0
+    for i, f in futuros.items():
+        if f.ok():
+            resultado[i] = f.resultado()
+        else:
+            falhas += 1
+            if falhas <= 5:
+                print(f"[AVISO] {i}: {f.erro().api_error_message() or 'falhou'}")
+    if falhas > 5:
+        print(f"[AVISO] ... e mais {falhas - 5} objeto(s) com falha")
+    print(f"     {len(resultado)}/{len(futuros)} objetos lidos em {lote.requisicoes} lote(s)")
+    return resultado
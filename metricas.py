@@ -0,0 +1,248 @@
+"""
+metricas.py
+Instrumentação das etapas do pipeline: tempo de parede e de CPU, pico de
+memória (RSS), chamadas à API, páginas do Insights, linhas lidas/gravadas e
+bytes gravados — para saber qual script é o gargalo em cada conta.
+
+Contadores (contar()), incrementados por quem faz o trabalho:
+  chamadas_api     limites.ApiComLimite.call — cada tentativa, lotes inclusive
+  tempo_api_ms     idem — tempo esperando as respostas (latência = tempo / chamadas)
+  paginas_api      insights — páginas vindas da API
+  paginas_cache    insights — páginas servidas pelo cache em disco (cache.py)
+  linhas_lidas     insights — linhas entregues aos extratores (API, cache ou armazém)
+  linhas_gravadas  dados.salvar e CSVs dos dashboards (gravado())
+  bytes_gravados   idem, mais os HTMLs
+
+Cada etapa do run_all.py roda num subprocesso que, ao terminar, grava seus
+números em METRICAS_ARQUIVO (CPU e RSS do próprio processo). No modo
+--em-processo, medir() isola os contadores da etapa na thread dela (e nas
+threads que ela abre via propagar(), que levam junto o desvio da saída);
+CPU é o tempo da thread e o RSS é o pico do processo inteiro.
+
+O run_all junta tudo em um manifesto JSON da execução (gravar_manifesto) e,
+com METRICAS_PROMETHEUS, num arquivo no formato texto do Prometheus (para o
+textfile collector do node_exporter, por exemplo).
+
+Variáveis de ambiente (.env):
+  METRICAS_MANIFESTO   manifesto da última execução (padrão execucao.json)
+  METRICAS_PROMETHEUS  arquivo .prom a gerar (padrão: não gera)
+  METRICAS_ARQUIVO     uso interno: onde o processo da etapa grava seus números
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+    RESOURCE_OK = True
+except ImportError:          # Windows
+    RESOURCE_OK = False
+
+BASE_DIR   = Path(__file__).parent
+MANIFESTO  = Path(os.getenv("METRICAS_MANIFESTO") or BASE_DIR / "execucao.json")
+PROMETHEUS = os.getenv("METRICAS_PROMETHEUS") or None
+ARQUIVO    = os.getenv("METRICAS_ARQUIVO") or None
+
+CONTADORES = ("chamadas_api", "tempo_api_ms", "paginas_api", "paginas_cache",
+              "linhas_lidas", "linhas_gravadas", "bytes_gravados")
+
+_processo = dict.fromkeys(CONTADORES, 0)
+_local    = threading.local()
+_lock     = threading.Lock()
+
+
+# ─────────────────────────────────────────────
+# CONTADORES
+# ─────────────────────────────────────────────
+
+def contar(**incrementos):
+    """Soma `incrementos` aos contadores da etapa atual (ou do processo)."""
+    alvo = getattr(_local, "contadores", None) or _processo
+    with _lock:
+        for nome, valor in incrementos.items():
+            alvo[nome] += valor
+
+
+def gravado(caminho, linhas=0):
+    """Registra um arquivo de saída recém-gravado (bytes e, se houver, linhas)."""
+    try:
+        tamanho = Path(caminho).stat().st_size
+    except OSError:
+        return
+    contar(bytes_gravados=tamanho, linhas_gravadas=linhas)
+
+
+def propagar(funcao):
+    """
+    `funcao` para rodar em outra thread contando na etapa da thread atual.
+    A saída também segue a etapa: se sys.stdout/sys.stderr estiverem
+    desviados por thread (run_all --em-processo), a thread nova escreve no
+    mesmo buffer da que a criou.
+    """
+    contadores = getattr(_local, "contadores", None)
+    saidas = [(s, s.desvio()) for s in (sys.stdout, sys.stderr) if hasattr(s, "desvio")]
+
+    def executar(*args, **kwargs):
+        _local.contadores = contadores
+        for saida, buffer in saidas:
+            saida.desviar(buffer)
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            _local.contadores = None
+            for saida, _ in saidas:
+                saida.desviar(None)
+    return executar
+
+
+def rss_pico():
+    """Pico de memória residente do processo em bytes (None sem `resource`)."""
+    if not RESOURCE_OK:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024   # Linux: KiB
+
+
+# ─────────────────────────────────────────────
+# MEDIÇÃO DE UMA ETAPA
+# ─────────────────────────────────────────────
+
+@contextmanager
+def medir():
+    """
+    Mede o bloco como uma etapa em processo: o dict entregue recebe, na
+    saída, os contadores do bloco, parede_s, cpu_s (thread) e rss_pico_bytes.
+    """
+    medidas = {}
+    _local.contadores = dict.fromkeys(CONTADORES, 0)
+    parede, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield medidas
+    finally:
+        medidas.update(_local.contadores)
+        medidas["parede_s"] = round(time.perf_counter() - parede, 3)
+        medidas["cpu_s"] = round(time.thread_time() - cpu, 3)
+        medidas["rss_pico_bytes"] = rss_pico()
+        _local.contadores = None
+
+
+def _gravar_processo():
+    """atexit do processo de uma etapa: contadores, CPU e RSS em METRICAS_ARQUIVO."""
+    medidas = dict(_processo, cpu_s=round(time.process_time(), 3), rss_pico_bytes=rss_pico())
+    try:
+        Path(ARQUIVO).write_text(json.dumps(medidas), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def ler_processo(caminho):
+    """Números gravados pelo processo de uma etapa ({} se ele não gravou)."""
+    try:
+        return json.loads(Path(caminho).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+if ARQUIVO:
+    atexit.register(_gravar_processo)
+
+
+# ─────────────────────────────────────────────
+# MANIFESTO E PROMETHEUS
+# ─────────────────────────────────────────────
+
+def montar_manifesto(etapas, resultados, inicio, total, modo):
+    """
+    Manifesto da execução: uma entrada por etapa (na ordem de `etapas`),
+    totais e a etapa mais lenta. `resultados` é {etapa: (sucesso, medidas)}.
+    """
+    linhas = []
+    for etapa, label, _ in etapas:
+        ok, medidas = resultados.get(etapa, (False, {}))
+        linhas.append({"etapa": etapa, "label": label, "ok": ok, **medidas})
+
+    totais = {c: sum(l.get(c) or 0 for l in linhas) for c in CONTADORES + ("cpu_s",)}
+    totais["cpu_s"] = round(totais["cpu_s"], 3)
+    picos = [l["rss_pico_bytes"] for l in linhas if l.get("rss_pico_bytes")]
+    totais["rss_pico_bytes"] = max(picos) if picos else None
+    lenta = max(linhas, key=lambda l: l.get("parede_s") or 0, default=None)
+
+    return {
+        "inicio":     inicio.isoformat(timespec="seconds"),
+        "duracao_s":  round(total, 3),
+        "modo":       modo,
+        "etapas_ok":  sum(1 for l in linhas if l["ok"]),
+        "etapas":     linhas,
+        "totais":     totais,
+        "mais_lenta": lenta and {"etapa": lenta["etapa"], "parede_s": lenta.get("parede_s")},
+    }
+
+
+def _gravar_atomico(caminho, texto):
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    tmp = caminho.with_name(caminho.name + ".tmp")
+    tmp.write_text(texto, encoding="utf-8")
+    os.replace(tmp, caminho)       # leitores (node_exporter, 08) nunca veem meio arquivo
+
+
+def _rotulo(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def texto_prometheus(manifesto):
+    """Manifesto no formato texto de exposição do Prometheus."""
+    por_etapa = [
+        ("parede_segundos",   "parede_s",        "Tempo de parede da etapa"),
+        ("cpu_segundos",      "cpu_s",           "Tempo de CPU da etapa"),
+        ("rss_pico_bytes",    "rss_pico_bytes",  "Pico de memoria residente da etapa"),
+        ("chamadas_api",      "chamadas_api",    "Chamadas a Graph API na etapa"),
+        ("tempo_api_ms",      "tempo_api_ms",    "Tempo esperando respostas da Graph API (ms)"),
+        ("paginas_api",       "paginas_api",     "Paginas do Insights vindas da API"),
+        ("paginas_cache",     "paginas_cache",   "Paginas do Insights vindas do cache em disco"),
+        ("linhas_lidas",      "linhas_lidas",    "Linhas do Insights processadas"),
+        ("linhas_gravadas",   "linhas_gravadas", "Linhas gravadas em CSV"),
+        ("bytes_gravados",    "bytes_gravados",  "Bytes gravados em arquivos de saida"),
+    ]
+    linhas = []
+    for nome, campo, ajuda in por_etapa:
+        linhas += [f"# HELP fbads_etapa_{nome} {ajuda}", f"# TYPE fbads_etapa_{nome} gauge"]
+        for e in manifesto["etapas"]:
+            if e.get(campo) is not None:
+                linhas.append(f'fbads_etapa_{nome}{{etapa="{_rotulo(e["etapa"])}"}} {e[campo]}')
+    linhas += ["# HELP fbads_etapa_sucesso 1 se a etapa terminou com sucesso",
+               "# TYPE fbads_etapa_sucesso gauge"]
+    linhas += [f'fbads_etapa_sucesso{{etapa="{_rotulo(e["etapa"])}"}} {int(e["ok"])}'
+               for e in manifesto["etapas"]]
+    inicio = datetime.fromisoformat(manifesto["inicio"]).timestamp()
+    linhas += [
+        "# HELP fbads_execucao_duracao_segundos Tempo de parede da execucao completa",
+        "# TYPE fbads_execucao_duracao_segundos gauge",
+        f"fbads_execucao_duracao_segundos {manifesto['duracao_s']}",
+        "# HELP fbads_execucao_inicio_timestamp Inicio da ultima execucao (epoch)",
+        "# TYPE fbads_execucao_inicio_timestamp gauge",
+        f"fbads_execucao_inicio_timestamp {inicio:.0f}",
+    ]
+    return "\n".join(linhas) + "\n"
+
+
+def gravar_manifesto(manifesto, caminho=MANIFESTO, prometheus=PROMETHEUS):
+    """Grava o manifesto JSON e, se configurado, o arquivo do Prometheus."""
+    _gravar_atomico(caminho, json.dumps(manifesto, ensure_ascii=False, indent=2))
+    if prometheus:
+        _gravar_atomico(prometheus, texto_prometheus(manifesto))
+
+
+def ler_manifesto(caminho=MANIFESTO):
+    """Manifesto da última execução, ou None."""
+    try:
+        return json.loads(Path(caminho).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,210 @@
+"""
+modelos.py
+Templates HTML dos dashboards (07, 09, 10) e os estáticos que eles
+compartilham, em modelos/:
+
+  base.html, base.css, graficos.js   — esqueleto, estilos e helpers comuns
+  <nome>.html, <nome>.css, <nome>.js — corpo, estilos e gráficos de cada
+                                       dashboard (dashboard, dashboard_ceo,
+                                       dashboard_contas)
+
+Sintaxe dos templates — só substituição, sem lógica:
+  {{ nome }}           valor escapado para HTML
+  {{ nome | seguro }}  valor inserido como está (HTML já montado)
+
+Cada template é compilado uma vez por processo em trechos literais + campos,
+então renderizar é um join — sem reprocessar centenas de linhas de HTML/CSS/JS
+a cada dashboard. O cache guarda uma entrada por arquivo com o mtime e o
+tamanho, como dados.ler_csv(): editar um template em modelos/ vale já na
+próxima página (inclusive no servidor.py, que compara assinatura() a cada
+recarga), sem reiniciar o processo.
+
+Os dados dos gráficos vão em um único bloco
+<script type="application/json" id="dados">, lido pelo graficos.js como DADOS;
+o JS dos gráficos é estático. O bloco sai compacto: arrays por coluna, números
+arredondados e séries longas já reduzidas (reducao.py).
+
+Páginas servidas pelo servidor.py levam também o aovivo.js (pagina(ao_vivo=...)).
+
+Estáticos: embutidos na página já compactados (padrão — um HTML
+autossuficiente) ou, com DASHBOARD_ASSETS=link, copiados uma vez para assets/
+ao lado do HTML e referenciados, o que deixa cada página de conta só com o
+corpo e os dados.
+
+Variável de ambiente (.env):
+  DASHBOARD_ASSETS  "inline" (padrão) | "link"
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from html import escape
+from pathlib import Path
+
+from reducao import compactar
+
+DIR_MODELOS = Path(__file__).parent / "modelos"
+MODO_ASSETS = os.getenv("DASHBOARD_ASSETS", "inline").strip().lower()
+
+RE_CAMPO = re.compile(r"\{\{\s*(\w+)\s*(\|\s*seguro\s*)?\}\}")
+RE_DECLARACOES = re.compile(r"\{[^{}]*\}")      # bloco mais interno: só declarações
+
+_cache = {}
+
+
+class Modelo:
+    """Template compilado: trechos literais intercalados com (campo, seguro)."""
+
+    def __init__(self, texto):
+        self.partes = []
+        pos = 0
+        for m in RE_CAMPO.finditer(texto):
+            self.partes.append(texto[pos:m.start()])
+            self.partes.append((m.group(1), bool(m.group(2))))
+            pos = m.end()
+        self.partes.append(texto[pos:])
+        self.campos = {p[0] for p in self.partes if isinstance(p, tuple)}
+
+    def renderizar(self, **valores):
+        faltando = self.campos - valores.keys()
+        if faltando:
+            raise KeyError(f"Campos sem valor no template: {', '.join(sorted(faltando))}")
+        return "".join(
+            p if isinstance(p, str)
+            else str(valores[p[0]]) if p[1] else escape(str(valores[p[0]]))
+            for p in self.partes
+        )
+
+
+def compilar(texto):
+    return Modelo(texto)
+
+
+def _assinatura_arquivo(p):
+    st = p.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _em_cache(tipo, nome, montar):
+    """
+    montar() guardado por (tipo, nome) enquanto modelos/<nome> não mudar;
+    quando muda, a entrada é substituída (nunca acumula versões antigas).
+    """
+    assinatura = _assinatura_arquivo(DIR_MODELOS / nome)
+    em_cache = _cache.get((tipo, nome))
+    if em_cache is None or em_cache[0] != assinatura:
+        em_cache = _cache[(tipo, nome)] = (assinatura, montar())
+    return em_cache[1]
+
+
+def assinatura():
+    """(nome, mtime, tamanho) de todos os arquivos de modelos/ — muda a cada edição."""
+    return tuple(sorted((p.name, *_assinatura_arquivo(p))
+                        for p in DIR_MODELOS.iterdir() if p.is_file()))
+
+
+def _arquivo(nome):
+    """Conteúdo de modelos/<nome>, em cache enquanto o arquivo não mudar."""
+    return _em_cache("texto", nome, lambda: (DIR_MODELOS / nome).read_text(encoding="utf-8"))
+
+
+def carregar(nome):
+    """Template compilado de modelos/<nome>."""
+    return _em_cache("modelo", nome, lambda: compilar(_arquivo(nome)))
+
+
+# ─────────────────────────────────────────────
+# DADOS
+# ─────────────────────────────────────────────
+
+def json_dados(dados):
+    """
+    JSON compacto para o bloco de dados: números arredondados
+    (reducao.compactar), sem espaços e com "</" escapado para não fechar o
+    <script>.
+    """
+    texto = json.dumps(compactar(dados), ensure_ascii=False, separators=(",", ":"))
+    return texto.replace("</", "<\\/")
+
+
+# ─────────────────────────────────────────────
+# ESTÁTICOS
+# ─────────────────────────────────────────────
+
+def _estaticos(nome, extensao):
+    arquivos = ["base.css" if extensao == ".css" else "graficos.js"]
+    if (DIR_MODELOS / f"{nome}{extensao}").exists():
+        arquivos.append(f"{nome}{extensao}")
+    return arquivos
+
+
+def _compacto(arquivo):
+    """
+    Estático reduzido para embutir na página: CSS sem comentários e espaços
+    supérfluos; JS sem indentação, linhas vazias e comentários de linha.
+    """
+    return _em_cache("compacto", arquivo, lambda: _compactar(arquivo))
+
+
+def _compactar(arquivo):
+    texto = _arquivo(arquivo)
+    if arquivo.endswith(".css"):
+        texto = re.sub(r"/\*.*?\*/", "", texto, flags=re.S)
+        texto = re.sub(r"\s+", " ", texto)
+        texto = re.sub(r"\s*([{};,>])\s*", r"\1", texto)
+        # "propriedade: valor" só dentro das declarações — num seletor o
+        # espaço antes de ":" importa (".a :hover" não é ".a:hover")
+        return RE_DECLARACOES.sub(lambda m: re.sub(r":\s+", ":", m.group()), texto).strip()
+    linhas = (l.strip() for l in texto.splitlines())
+    return "\n".join(l for l in linhas if l and not l.startswith("//"))
+
+
+def _publicar(arquivo, diretorio):
+    """Copia modelos/<arquivo> para <diretorio>/assets/ se mudou; devolve o href."""
+    texto = _arquivo(arquivo)
+    destino = Path(diretorio) / "assets" / arquivo
+    if not destino.exists() or destino.read_text(encoding="utf-8") != texto:
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(DIR_MODELOS / arquivo, destino)
+    versao = hashlib.sha1(texto.encode()).hexdigest()[:8]
+    return f"assets/{arquivo}?v={versao}"
+
+
+def _tags(nome, diretorio):
+    css, js = _estaticos(nome, ".css"), _estaticos(nome, ".js")
+    if MODO_ASSETS == "link" and diretorio is not None:
+        estilos = "\n".join(f'<link rel="stylesheet" href="{_publicar(a, diretorio)}">' for a in css)
+        scripts = "\n".join(f'<script src="{_publicar(a, diretorio)}"></script>' for a in js)
+    else:
+        estilos = "<style>" + "".join(_compacto(a) for a in css) + "</style>"
+        scripts = "<script>\n" + "\n;\n".join(_compacto(a) for a in js) + "\n</script>"
+    return estilos, scripts
+
+
+# ─────────────────────────────────────────────
+# PÁGINA
+# ─────────────────────────────────────────────
+
+def pagina(nome, titulo, dados, diretorio=None, ao_vivo=None, **campos):
+    """
+    HTML completo do dashboard `nome`: modelos/<nome>.html com `campos`,
+    dentro de base.html, com os estáticos e o bloco de dados. `diretorio` é
+    onde o HTML será gravado (usado por DASHBOARD_ASSETS=link).
+
+    `ao_vivo` ({"painel": ..., "versao": ...}) é usado pelo servidor.py: a
+    página ganha o aovivo.js e se recarrega quando o servidor anuncia outra
+    versão dos dados daquele painel.
+    """
+    estilos, scripts = _tags(nome, diretorio)
+    if ao_vivo is not None:
+        scripts += (f"\n<script>\nconst AO_VIVO = {json_dados(ao_vivo)};\n"
+                    f"{_compacto('aovivo.js')}\n</script>")
+    return carregar("base.html").renderizar(
+        titulo=titulo,
+        estilos=estilos,
+        corpo=carregar(f"{nome}.html").renderizar(**campos),
+        dados=json_dados(dados),
+        scripts=scripts,
+    )
@@ -0,0 +1,8 @@
+// Só nas páginas do servidor.py: recarrega quando o servidor anuncia, em
+// /eventos, uma versão dos dados deste painel diferente da que foi servida.
+if (window.EventSource) {
+  new EventSource('/eventos').addEventListener('versao', e => {
+    const versao = JSON.parse(e.data)[AO_VIVO.painel];
+    if (versao !== undefined && versao !== AO_VIVO.versao) location.reload();
+  });
+}
@@ -0,0 +1,281 @@
+// 07_dashboard.py — gráficos a partir de DADOS (graficos.js)
+const CORES_BAR   = ['#6366f1','#8b5cf6','#a78bfa','#c4b5fd','#ddd6fe'];
+const CORES_PIE   = ['#6366f1','#8b5cf6','#ec4899','#f59e0b','#10b981','#06b6d4'];
+const CORES_GEN   = ['#6366f1','#ec4899'];
+const CORES_FUNIL = ['#6366f1','#7c3aed','#9333ea','#a855f7','#c084fc','#e879f9'];
+const COR_OUTROS  = '#475569';
+
+// ── 1. Gasto por Campanha ─────────────────────────────────────
+(function() {
+  const d = DADOS.campanhas;
+  new Chart(document.getElementById('chartCampanhas').getContext('2d'), {
+    type: 'bar',
+    data: {
+      labels: d.labels,
+      datasets: [{
+        label: 'Gasto (R$)',
+        data: d.gasto,
+        // "Outros (k)" (reducao.top_n), quando existe, é a última barra
+        backgroundColor: d.labels.map((_, i) =>
+          d.outros && i === d.labels.length - 1 ? COR_OUTROS : CORES_BAR[i % CORES_BAR.length]),
+        borderRadius: 8,
+        borderSkipped: false,
+      }]
+    },
+    options: {
+      responsive: true,
+      plugins: { legend: { display: false } },
+      scales: {
+        x: { grid: { display: false } },
+        y: { ticks: { callback: REAIS } }
+      }
+    }
+  });
+})();
+
+// ── 2. Evolução CPV ───────────────────────────────────────────
+(function() {
+  const ctx = document.getElementById('chartCpv').getContext('2d');
+  new Chart(ctx, {
+    type: 'line',
+    data: {
+      labels: DADOS.cpv.datas,
+      datasets: [{
+        label: 'CPV (R$)',
+        data: DADOS.cpv.valores,
+        borderColor: '#6366f1',
+        backgroundColor: GRAD(ctx, 'rgba(99,102,241,.4)', 'rgba(99,102,241,0)'),
+        fill: true,
+        tension: 0.4,
+        pointRadius: DADOS.cpv.datas.length > 60 ? 0 : 4,
+        pointBackgroundColor: '#6366f1',
+      }]
+    },
+    options: {
+      responsive: true,
+      plugins: { legend: { display: false } },
+      scales: {
+        x: { grid: { display: false }, ticks: { maxTicksLimit: 8 } },
+        y: { ticks: { callback: v => 'R$ ' + v.toFixed(4) } }
+      }
+    }
+  });
+})();
+
+// ── 3. Distribuição por Posicionamento ────────────────────────
+(function() {
+  const d = DADOS.posicionamentos;
+  new Chart(document.getElementById('chartPosic').getContext('2d'), {
+    type: 'doughnut',
+    data: {
+      labels: d.labels,
+      datasets: [{
+        data: d.gasto,
+        backgroundColor: CORES_PIE.slice(0, d.labels.length),
+        borderWidth: 2,
+        borderColor: '#0f0f1a',
+        hoverOffset: 8,
+      }]
+    },
+    options: {
+      responsive: true,
+      cutout: '60%',
+      plugins: {
+        legend: { position: 'right', labels: { boxWidth: 12, padding: 12 } }
+      }
+    }
+  });
+})();
+
+// ── 4. Heatmap Idade × Gênero (grouped bar) ───────────────────
+(function() {
+  const d = DADOS.idade_genero;
+  new Chart(document.getElementById('chartIdadeGenero').getContext('2d'), {
+    type: 'bar',
+    data: {
+      labels: d.idades,
+      datasets: d.generos.map((genero, i) => ({
+        label: genero,
+        data: d.gasto[i],
+        backgroundColor: CORES_GEN[i % CORES_GEN.length] + 'cc',
+        borderColor:     CORES_GEN[i % CORES_GEN.length],
+        borderWidth: 1,
+      }))
+    },
+    options: {
+      responsive: true,
+      plugins: { legend: { position: 'top' } },
+      scales: {
+        x: { grid: { display: false } },
+        y: { ticks: { callback: REAIS } }
+      }
+    }
+  });
+})();
+
+// ── 5. Performance por Horário ────────────────────────────────
+(function() {
+  const { horas, cliques } = DADOS.horarios;
+  const maxVal = Math.max(...cliques);
+  const bgColors = cliques.map(v => {
+    const ratio = v / maxVal;
+    return `rgba(${Math.round(99 + (236-99)*ratio)}, ${Math.round(102 + (73-102)*ratio)}, ${Math.round(241 + (153-241)*ratio)}, 0.85)`;
+  });
+  new Chart(document.getElementById('chartHorario').getContext('2d'), {
+    type: 'bar',
+    data: {
+      labels: horas.map(h => h + 'h'),
+      datasets: [{
+        label: 'Cliques',
+        data: cliques,
+        backgroundColor: bgColors,
+        borderRadius: 5,
+        borderSkipped: false,
+      }]
+    },
+    options: {
+      responsive: true,
+      plugins: { legend: { display: false } },
+      scales: {
+        x: { grid: { display: false } },
+        y: { grid: { color: 'rgba(255,255,255,.05)' } }
+      }
+    }
+  });
+})();
+
+// ── 5b. Mapa de calor Dia × Hora (HTML customizado) ───────────
+(function() {
+  const m = DADOS.mapa_horario;
+  const el = document.getElementById('mapaHorario');
+  const estado = { visao: 'dia', metrica: 'cliques' };
+  const formatar = v => estado.metrica === 'gasto'
+    ? BRL(v)
+    : Number(v).toLocaleString('pt-BR', {maximumFractionDigits: 1}) + ' cliques';
+
+  function desenhar() {
+    const porDia  = estado.visao === 'dia';
+    const rotulos = porDia ? m.datas.map(d => d === m.hoje ? d + ' (hoje)' : d) : m.dias_semana;
+    const valores = (porDia ? m.dia : m.semana)[estado.metrica];
+    const maximo  = Math.max(1e-9, ...valores.map(linha => Math.max(...linha)));
+    const partes  = ['<div></div>'];
+    for (let h = 0; h < 24; h++) partes.push(`<div class="mapa-hora">${h}h</div>`);
+    rotulos.forEach((rotulo, i) => {
+      partes.push(`<div class="mapa-rotulo">${rotulo}</div>`);
+      valores[i].forEach((v, h) => {
+        const alfa = v > 0 ? 0.12 + 0.88 * v / maximo : 0.04;
+        partes.push(`<div class="mapa-celula" title="${rotulo} · ${h}h: ${formatar(v)}" ` +
+                    `style="background:rgba(99,102,241,${alfa.toFixed(2)})"></div>`);
+      });
+    });
+    el.innerHTML = partes.join('');
+  }
+
+  document.querySelectorAll('.mapa-botao').forEach(botao => {
+    botao.addEventListener('click', () => {
+      const chave = botao.dataset.visao ? 'visao' : 'metrica';
+      estado[chave] = botao.dataset[chave];
+      document.querySelectorAll(`.mapa-botao[data-${chave}]`)
+        .forEach(b => b.classList.toggle('ativo', b === botao));
+      desenhar();
+    });
+  });
+  desenhar();
+})();
+
+// ── 6. Funil (HTML customizado) ───────────────────────────────
+(function() {
+  const { labels, valores, pcts } = DADOS.funil;
+  const el = document.getElementById('funil');
+  labels.forEach((lbl, i) => {
+    const row = document.createElement('div');
+    row.className = 'funil-row';
+    row.innerHTML = `
+      <div class="funil-label">${lbl}</div>
+      <div class="funil-bar-wrap">
+        <div class="funil-bar" style="width:${pcts[i]}%; background:${CORES_FUNIL[i]};">
+          ${pcts[i]}%
+        </div>
+      </div>
+      <div class="funil-val">${valores[i].toLocaleString('pt-BR')}</div>
+    `;
+    el.appendChild(row);
+  });
+})();
+
+// ── 7. Scatter CTR vs CPV ─────────────────────────────────────
+(function() {
+  const s = DADOS.scatter;
+  const pts = s.campanhas.map((label, i) => ({ x: s.ctr[i], y: s.cpv[i], label }));
+  new Chart(document.getElementById('chartScatter').getContext('2d'), {
+    type: 'scatter',
+    data: {
+      datasets: [{
+        label: 'Campanhas',
+        data: pts,
+        backgroundColor: pts.map((_, i) => CORES_PIE[i % CORES_PIE.length] + 'cc'),
+        pointRadius: 10,
+        pointHoverRadius: 14,
+      }]
+    },
+    options: {
+      responsive: true,
+      plugins: {
+        legend: { display: false },
+        tooltip: {
+          callbacks: {
+            label: ctx => {
+              const p = ctx.raw;
+              return ` ${p.label}: CTR ${p.x}% | CPV R$ ${p.y}`;
+            }
+          }
+        }
+      },
+      scales: {
+        x: {
+          title: { display: true, text: 'CTR (%)', color: '#94a3b8' },
+          grid: { color: 'rgba(255,255,255,.05)' }
+        },
+        y: {
+          title: { display: true, text: 'CPV (R$)', color: '#94a3b8' },
+          grid: { color: 'rgba(255,255,255,.05)' },
+          ticks: { callback: v => 'R$ ' + v.toFixed(4) }
+        }
+      }
+    }
+  });
+})();
+
+// ── 8. Gasto por Tipo de Campanha ─────────────────────────────
+(function() {
+  const d = DADOS.tipos;
+  new Chart(document.getElementById('chartTipos').getContext('2d'), {
+    type: 'bar',
+    data: {
+      labels: d.labels,
+      datasets: [{
+        label: 'Gasto (R$)',
+        data: d.gasto,
+        backgroundColor: d.labels.map((_, i) => CORES_PIE[i % CORES_PIE.length] + 'cc'),
+        borderRadius: 8,
+        borderSkipped: false,
+      }]
+    },
+    options: {
+      indexAxis: 'y',
+      responsive: true,
+      plugins: {
+        legend: { display: false },
+        tooltip: {
+          callbacks: {
+            label: ctx => ` ${BRL(ctx.raw)} · ${d.conversoes[ctx.dataIndex].toLocaleString('pt-BR')} conversões`
+          }
+        }
+      },
+      scales: {
+        x: { ticks: { callback: REAIS } },
+        y: { grid: { display: false } }
+      }
+    }
+  });
+})();
@@ -0,0 +1,115 @@
+// 09_dashboard_ceo.py — gráficos a partir de DADOS (graficos.js)
+const nomes = DADOS.nomes;
+const META_CPV = DADOS.meta_cpv;
+const CORES_TIPOS = ['#6366f1','#8b5cf6','#ec4899','#f59e0b','#10b981'];
+const CORES_CEN   = ['#10b981','#6366f1','#ec4899'];
+
+// ── Chart 1: Spend vs Receita ───────────────────────────────
+new Chart('c1',{type:'bar',data:{labels:nomes,datasets:[
+  {label:'Gasto',data:DADOS.receita.gasto,backgroundColor:'rgba(99,102,241,.8)',borderRadius:5},
+  {label:'Receita Direta',data:DADOS.receita.direta,backgroundColor:'rgba(16,185,129,.8)',borderRadius:5},
+  {label:'Rec. Projetada (10%)',data:DADOS.receita.projetada,backgroundColor:'rgba(236,72,153,.8)',borderRadius:5},
+]},options:{responsive:true,plugins:{legend:{position:'top'}},
+  scales:{x:{grid:{display:false}},y:{ticks:{callback:BRL}}}
+}});
+
+// ── Chart 2: CPV + meta ─────────────────────────────────────
+new Chart('c2',{type:'line',data:{labels:nomes,datasets:[
+  {label:'CPV',data:DADOS.cpv,borderColor:'#6366f1',backgroundColor:'rgba(99,102,241,.15)',
+    fill:true,tension:.4,pointRadius:5,pointBackgroundColor:'#6366f1'},
+  {label:'Meta R$'+META_CPV,data:nomes.map(()=>META_CPV),
+    borderColor:'#f59e0b',borderDash:[6,4],borderWidth:2,pointRadius:0,fill:false},
+]},options:{responsive:true,plugins:{legend:{position:'top'}},
+  scales:{x:{grid:{display:false}},y:{ticks:{callback:BRL}}}
+}});
+
+// ── Chart 3: Funil agrupado ─────────────────────────────────
+new Chart('c3',{type:'bar',data:{labels:nomes,datasets:[
+  {label:'Leads',data:DADOS.funil.leads,backgroundColor:'rgba(99,102,241,.85)',borderRadius:4},
+  {label:'Page Views',data:DADOS.funil.page_views,backgroundColor:'rgba(139,92,246,.85)',borderRadius:4},
+  {label:'Checkouts',data:DADOS.funil.checkouts,backgroundColor:'rgba(236,72,153,.85)',borderRadius:4},
+  {label:'Compras',data:DADOS.funil.compras,backgroundColor:'rgba(16,185,129,.85)',borderRadius:4},
+]},options:{responsive:true,plugins:{legend:{position:'top'}},
+  scales:{x:{grid:{display:false}},y:{}}
+}});
+
+// ── Chart 4: Funil horizontal ───────────────────────────────
+new Chart('c4',{type:'bar',data:{labels:DADOS.funil_total.labels,datasets:[
+  {label:'Total',data:DADOS.funil_total.valores,
+    backgroundColor:['rgba(99,102,241,.85)','rgba(139,92,246,.85)','rgba(236,72,153,.85)','rgba(16,185,129,.85)'],
+    borderRadius:5}
+]},options:{indexAxis:'y',responsive:true,plugins:{legend:{display:false}},
+  scales:{x:{},y:{grid:{display:false}}}
+}});
+
+// ── Chart 5: Taxas de conversão ─────────────────────────────
+new Chart('c5',{type:'bar',data:{labels:DADOS.taxas.labels,datasets:[
+  {label:'Taxa (%)',data:DADOS.taxas.valores,
+    backgroundColor:['rgba(99,102,241,.8)','rgba(236,72,153,.8)','rgba(16,185,129,.8)'],
+    borderRadius:6}
+]},options:{responsive:true,plugins:{legend:{display:false}},
+  scales:{x:{grid:{display:false}},y:{ticks:{callback:v=>v+'%'}}}
+}});
+
+// ── Chart 6: Doughnut tipos ─────────────────────────────────
+new Chart('c6',{type:'doughnut',data:{labels:DADOS.tipos.labels,datasets:[
+  {data:DADOS.tipos.gasto,
+    backgroundColor:CORES_TIPOS,
+    borderWidth:2,borderColor:'#0f0f1e',hoverOffset:8}
+]},options:{cutout:'60%',responsive:true,
+  plugins:{legend:{position:'right',labels:{boxWidth:10,padding:10}}}
+}});
+
+// ── Chart 7: Stacked tipo × imersão ────────────────────────
+new Chart('c7',{type:'bar',data:{labels:nomes,datasets:DADOS.tipo_imersao.map((d,i)=>(
+  {label:d.label,data:d.data,backgroundColor:CORES_TIPOS[i%CORES_TIPOS.length]}))},
+  options:{responsive:true,plugins:{legend:{position:'top'}},
+    scales:{x:{stacked:true,grid:{display:false}},y:{stacked:true}}
+}});
+
+// ── Chart 8: Desperdício preview ────────────────────────────
+new Chart('c8',{type:'bar',data:{labels:DADOS.desperdicio_top5.nomes,datasets:[
+  {label:'Gasto sem conversao',data:DADOS.desperdicio_top5.gastos,
+    backgroundColor:'rgba(239,68,68,.8)',borderRadius:4}
+]},options:{indexAxis:'y',responsive:true,plugins:{legend:{display:false}},
+  scales:{x:{ticks:{callback:BRL}},y:{grid:{display:false}}}
+}});
+
+// ── Chart 9: Projeções 3 cenários ───────────────────────────
+new Chart('c9',{type:'bar',data:{labels:nomes,datasets:DADOS.projecoes.map((d,i)=>(
+  {label:d.label,data:d.data,backgroundColor:CORES_CEN[i]+'cc',borderColor:CORES_CEN[i],borderWidth:1}))},
+  options:{responsive:true,plugins:{legend:{position:'top'}},
+    scales:{x:{grid:{display:false}},y:{ticks:{callback:BRL}}}
+}});
+
+// ── Chart 10: Break-even ────────────────────────────────────
+new Chart('c10',{type:'bar',data:{labels:DADOS.break_even.labels,datasets:[
+  {label:'R$',data:DADOS.break_even.valores,
+    backgroundColor:['#6366f1','#f59e0b','#10b981','#10b981','#10b981','#10b981'],borderRadius:6}
+]},options:{responsive:true,plugins:{legend:{display:false}},
+  scales:{x:{grid:{display:false}},y:{ticks:{callback:BRL}}}
+}});
+
+// ── Chart 11: Taxa checkout → compra ────────────────────────
+new Chart('c11',{type:'bar',data:{labels:nomes,datasets:[
+  {label:'Taxa (%)',data:DADOS.checkout_compra,
+    backgroundColor:'rgba(16,185,129,.8)',borderRadius:6}
+]},options:{responsive:true,plugins:{legend:{display:false}},
+  scales:{x:{grid:{display:false}},y:{ticks:{callback:v=>v+'%'}}}
+}});
+
+// ── Chart 12: ROAS direto vs mentoria ───────────────────────
+new Chart('c12',{type:'bar',data:{labels:nomes,datasets:[
+  {label:'ROAS Direto',data:DADOS.roas.direto,backgroundColor:'rgba(99,102,241,.8)',borderRadius:4},
+  {label:'ROAS + Mentoria 10%',data:DADOS.roas.mentoria,backgroundColor:'rgba(16,185,129,.8)',borderRadius:4},
+]},options:{responsive:true,plugins:{legend:{position:'top'}},
+  scales:{x:{grid:{display:false}},y:{ticks:{callback:v=>v+'x'}}}
+}});
+
+// ── Chart 13: Top 15 desperdício ────────────────────────────
+new Chart('c13',{type:'bar',data:{labels:DADOS.desperdicio_top15.nomes,datasets:[
+  {label:'Gasto (R$)',data:DADOS.desperdicio_top15.gastos,
+    backgroundColor:'rgba(239,68,68,.75)',borderRadius:4}
+]},options:{indexAxis:'y',responsive:true,plugins:{legend:{display:false}},
+  scales:{x:{ticks:{callback:BRL}},y:{grid:{display:false},ticks:{font:{size:11}}}}
+}});
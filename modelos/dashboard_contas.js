@@ -0,0 +1,41 @@
+// 10_dashboard_contas.py — gráficos a partir de DADOS (graficos.js)
+const CORES = ['#6366f1','#ec4899','#10b981','#f59e0b','#06b6d4',
+               '#8b5cf6','#ef4444','#84cc16','#14b8a6','#f97316'];
+
+new Chart(document.getElementById('chartGasto'), {
+  type: 'bar',
+  data: { labels: DADOS.nomes, datasets: [{
+    label: 'Gasto (R$)', data: DADOS.gasto,
+    backgroundColor: '#6366f1', borderRadius: 6 }] },
+  options: { indexAxis: 'y', responsive: true, plugins: { legend: { display: false } },
+    scales: { x: { ticks: { callback: REAIS } } } }
+});
+
+new Chart(document.getElementById('chartConversoes'), {
+  data: { labels: DADOS.nomes, datasets: [
+    { type: 'bar', label: 'Conversões', data: DADOS.conversoes,
+      backgroundColor: '#10b981', borderRadius: 6, yAxisID: 'y' },
+    { type: 'line', label: 'CPA (R$)', data: DADOS.cpa,
+      borderColor: '#f59e0b', backgroundColor: '#f59e0b', yAxisID: 'y1' }
+  ] },
+  options: { responsive: true, scales: {
+    y:  { position: 'left' },
+    y1: { position: 'right', grid: { drawOnChartArea: false },
+          ticks: { callback: REAIS } } } }
+});
+
+// Uma linha por conta; a cor segue a posição da conta no ranking de gasto
+new Chart(document.getElementById('chartCpv'), {
+  type: 'line',
+  data: { labels: DADOS.cpv.datas, datasets: DADOS.cpv.series.map(s => ({
+    label: s.label,
+    data: s.data,
+    borderColor: CORES[s.indice % CORES.length],
+    backgroundColor: CORES[s.indice % CORES.length],
+    tension: 0.3,
+    spanGaps: true,
+    pointRadius: 0,
+  })) },
+  options: { responsive: true, interaction: { mode: 'index', intersect: false },
+    scales: { y: { ticks: { callback: v => 'R$ ' + v.toFixed(4) } } } }
+});
@@ -0,0 +1,16 @@
+// Base comum dos dashboards: tema do Chart.js, dados da página e formatação.
+Chart.defaults.color = '#94a3b8';
+Chart.defaults.borderColor = 'rgba(255,255,255,0.06)';
+Chart.defaults.font.family = "'Segoe UI', system-ui, sans-serif";
+
+// Bloco <script type="application/json" id="dados"> gerado pelo modelos.py
+const DADOS = JSON.parse(document.getElementById('dados').textContent);
+
+const REAIS = v => 'R$ ' + v.toLocaleString('pt-BR');
+const BRL   = v => 'R$ ' + Number(v).toLocaleString('pt-BR', {minimumFractionDigits: 2});
+
+const GRAD = (ctx, c1, c2) => {
+  const g = ctx.createLinearGradient(0, 0, 0, 320);
+  g.addColorStop(0, c1); g.addColorStop(1, c2);
+  return g;
+};
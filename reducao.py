@@ -0,0 +1,93 @@
+"""
+reducao.py
+Redução das séries grandes antes de irem para o bloco de dados dos
+dashboards (modelos.py), para páginas de contas grandes abrirem rápido:
+
+  lttb(xs, ys, limite)        — Largest-Triangle-Three-Buckets: escolhe
+                                `limite` pontos que preservam o desenho da
+                                linha (picos e vales), sempre com o primeiro
+                                e o último ponto
+  top_n(labels, valores, n)   — os n maiores valores + um item "Outros (k)"
+                                com a soma dos k restantes
+  compactar(valor)            — números arredondados a SIGNIFICATIVOS dígitos
+                                (mínimo de 2 casas decimais) e floats inteiros
+                                como int, recursivo em listas/dicts
+
+Variáveis de ambiente (.env):
+  DASHBOARD_MAX_PONTOS     pontos máximos por série temporal (padrão 120)
+  DASHBOARD_TOP_CAMPANHAS  barras de campanha antes de agrupar em "Outros" (padrão 15)
+"""
+
+import math
+import os
+
+MAX_PONTOS     = int(os.getenv("DASHBOARD_MAX_PONTOS", "120"))
+TOP_CAMPANHAS  = int(os.getenv("DASHBOARD_TOP_CAMPANHAS", "15"))
+SIGNIFICATIVOS = 7
+
+
+def lttb(xs, ys, limite=MAX_PONTOS):
+    """Índices dos pontos escolhidos (em ordem); todos se len(ys) <= limite."""
+    n = len(ys)
+    if limite >= n or limite < 3:
+        return list(range(n))
+
+    balde = (n - 2) / (limite - 2)
+    escolhidos = [0]
+    a = 0
+    for i in range(limite - 2):
+        # Média do balde seguinte: o terceiro vértice do triângulo
+        ini_prox = int((i + 1) * balde) + 1
+        fim_prox = min(int((i + 2) * balde) + 1, n)
+        qtd = fim_prox - ini_prox
+        media_x = sum(xs[ini_prox:fim_prox]) / qtd
+        media_y = sum(ys[ini_prox:fim_prox]) / qtd
+
+        # Ponto do balde atual com a maior área com `a` e a média seguinte
+        ini = int(i * balde) + 1
+        fim = int((i + 1) * balde) + 1
+        ax, ay = xs[a], ys[a]
+        melhor, maior = ini, -1.0
+        for j in range(ini, fim):
+            area = abs((ax - media_x) * (ys[j] - ay) - (ax - xs[j]) * (media_y - ay))
+            if area > maior:
+                melhor, maior = j, area
+        escolhidos.append(melhor)
+        a = melhor
+
+    escolhidos.append(n - 1)
+    return escolhidos
+
+
+def top_n(labels, valores, n=TOP_CAMPANHAS, rotulo="Outros"):
+    """
+    (labels, valores) com os n maiores valores em ordem decrescente e, se
+    sobrar algo, um último item f"{rotulo} (k)" com a soma dos k restantes.
+    Com até n itens devolve a entrada como está.
+    """
+    if len(valores) <= n:
+        return list(labels), list(valores)
+    ordem = sorted(range(len(valores)), key=lambda i: -valores[i])
+    topo, resto = ordem[:n], ordem[n:]
+    return ([labels[i] for i in topo] + [f"{rotulo} ({len(resto)})"],
+            [valores[i] for i in topo] + [sum(valores[i] for i in resto)])
+
+
+def _numero(v):
+    if not math.isfinite(v):
+        return None                       # JSON.parse não aceita NaN/inf
+    if v == int(v):
+        return int(v)
+    casas = SIGNIFICATIVOS - 1 - math.floor(math.log10(abs(v)))
+    return round(v, max(2, casas))
+
+
+def compactar(valor):
+    """Arredonda os floats de `valor` (listas, tuplas e dicts percorridos)."""
+    if isinstance(valor, float):
+        return _numero(valor)
+    if isinstance(valor, dict):
+        return {k: compactar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [compactar(v) for v in valor]
+    return valor
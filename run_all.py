@@ -1,57 +1,447 @@
 """
 run_all.py
-Executa os scripts 01-07 em sequência e abre o dashboard.html no navegador.
+Executa os scripts 01-07, 09 e 11 e abre o dashboard.html no navegador.
 
-Uso: python run_all.py
+Uso:
+  python run_all.py                        → execução sequencial (padrão)
+  python run_all.py --paralelo             → extratores 01-06 em paralelo
+  python run_all.py --paralelo --workers 3 → limita a 3 scripts simultâneos
+  python run_all.py --em-processo          → importa os scripts e chama main()
+                                             no mesmo interpretador
+  python run_all.py --consolidado          → 00_consolidado.py substitui 01, 02
+                                             e 06 (uma consulta em vez de três)
+  python run_all.py --incremental          → busca só os dias novos (+ janela de
+                                             reprocessamento) e lê o resto do
+                                             armazém local (armazem.py)
+  python run_all.py --contas [ARQUIVO]     → multi-conta: roda o pipeline para
+                                             cada conta (contas.py) num pool
+                                             único de --workers scripts e gera
+                                             o dashboard consolidado (10)
+  python run_all.py --sem-cache            → ignora o cache de respostas do
+                                             Insights nesta execução (cache.py)
+  python run_all.py --servir               → ao final, em vez de abrir o HTML,
+                                             sobe o servidor local dos
+                                             dashboards (servidor.py)
+  python run_all.py --etapas 02,05,07      → só as etapas cujos scripts começam
+                                             com esses prefixos (usado pelas
+                                             cadências do 08_agendamento.py)
+  python run_all.py --sem-abrir            → não abre o dashboard ao final
+
+No modo --em-processo o config.py (SDK, .env e FacebookAdsApi.init) é
+carregado uma única vez e o mesmo `account` é compartilhado por todas as
+etapas; uma exceção em uma etapa não interrompe as demais.
+
+No modo paralelo os dashboards (07 e 09) só começam depois que os
+extratores que geram os CSVs que eles leem terminaram.
+
+No modo --contas cada etapa roda como subprocesso com FACEBOOK_AD_ACCOUNT_ID
+e PIPELINE_SAIDA da conta; --workers é o limite global de scripts
+simultâneos (e portanto de consumidores do mesmo token/app), então o tempo
+total cresce com contas / workers, e não com o número de contas.
+
+Ao final, cada etapa tem tempo de parede e de CPU, pico de RSS, chamadas à
+API, páginas, linhas e bytes gravados (metricas.py), impressos na tabela de
+tempos e gravados no manifesto execucao.json (e, com METRICAS_PROMETHEUS, em
+formato Prometheus).
 """
 
+import argparse
+import importlib
+import io
 import subprocess
 import sys
 import os
+import threading
+import time
+import tempfile
+import traceback
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
 from pathlib import Path
 
 BASE = Path(__file__).parent
 PYTHON = sys.executable
 
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+import contas
+import metricas
+
+EXTRATORES = [
+    "01_campanhas.py",
+    "02_cpv_diario.py",
+    "03_posicionamentos.py",
+    "04_idade_genero.py",
+    "05_horarios.py",
+    "06_funil.py",
+]
+
+# (script, rótulo, dependências)
 SCRIPTS = [
-    ("01_campanhas.py",      "Campanhas"),
-    ("02_cpv_diario.py",     "CPV Diario"),
-    ("03_posicionamentos.py","Posicionamentos"),
-    ("04_idade_genero.py",   "Idade x Genero"),
-    ("05_horarios.py",       "Horarios"),
-    ("06_funil.py",          "Funil"),
-    ("07_dashboard.py",      "Dashboard"),
+    ("01_campanhas.py",      "Campanhas",       []),
+    ("02_cpv_diario.py",     "CPV Diario",      []),
+    ("03_posicionamentos.py","Posicionamentos", []),
+    ("04_idade_genero.py",   "Idade x Genero",  []),
+    ("05_horarios.py",       "Horarios",        []),
+    ("06_funil.py",          "Funil",           []),
+    ("11_publicos.py",       "Publicos",        []),
+    ("07_dashboard.py",      "Dashboard",       EXTRATORES),
+    ("09_dashboard_ceo.py",  "Dashboard CEO",   ["01_campanhas.py", "11_publicos.py"]),
 ]
 
-def run(script, label):
-    print(f"\n{'='*60}")
-    print(f"  [{label}] Executando {script}...")
-    print(f"{'='*60}")
-    result = subprocess.run([PYTHON, BASE / script], check=False)
+# Modo --consolidado: uma consulta diária por campanha gera os CSVs de 01, 02 e 06
+CONSOLIDADO  = ("00_consolidado.py", "Consolidado 01+02+06", [])
+SUBSTITUIDOS = {"01_campanhas.py", "02_cpv_diario.py", "06_funil.py"}
+
+WORKERS_PADRAO = len(EXTRATORES)
+
+# Modo --contas: dashboard comparativo entre contas, depois de todas elas
+DASHBOARD_CONTAS = ("10_dashboard_contas.py", "Dashboard Contas")
+
+
+def montar_etapas(consolidado=False):
+    """Lista de etapas do pipeline; no modo consolidado troca 01/02/06 pelo 00."""
+    if not consolidado:
+        return SCRIPTS
+    etapas = [CONSOLIDADO]
+    for script, label, deps in SCRIPTS:
+        if script in SUBSTITUIDOS:
+            continue
+        restantes = [d for d in deps if d not in SUBSTITUIDOS]
+        if len(restantes) != len(deps):
+            restantes = [CONSOLIDADO[0]] + restantes
+        etapas.append((script, label, restantes))
+    return etapas
+
+
+def filtrar_etapas(etapas, prefixos):
+    """
+    Só as etapas cujo script começa com um dos `prefixos` ("02", "07_dashboard").
+    Dependências fora da seleção são descartadas: a etapa usa os CSVs que já
+    estão gravados.
+    """
+    escolhidas = [e for e in etapas if any(e[0].startswith(p) for p in prefixos)]
+    nomes = {e[0] for e in escolhidas}
+    return [(script, label, [d for d in deps if d in nomes]) for script, label, deps in escolhidas]
+
+
+def etapas_por_conta(contas_lista, etapas):
+    """
+    Replica as etapas para cada conta (id "<conta>/<script>", dependências
+    dentro da mesma conta) e acrescenta o dashboard consolidado, que espera
+    todas as contas.
+    """
+    por_conta = []
+    for conta in contas_lista:
+        cid = conta["id"]
+        for script, label, deps in etapas:
+            por_conta.append((f"{cid}/{script}", f"{conta['nome']} · {label}",
+                              [f"{cid}/{d}" for d in deps]))
+    script, label = DASHBOARD_CONTAS
+    return por_conta + [(script, label, [e[0] for e in por_conta])]
+
+
+def run_conta(chave, label, capturar=False):
+    """Executor do modo --contas: "<conta>/<script>" roda com o ambiente da conta."""
+    if "/" not in chave:
+        return run(chave, label, capturar)
+    conta_id, script = chave.split("/", 1)
+    return run(script, label, capturar, env=contas.ambiente(conta_id))
+
+
+def run(script, label, capturar=False, env=None):
+    """
+    Executa um script em um processo separado.
+    Com `capturar`, a saída é impressa de uma vez ao final para não misturar
+    logs de scripts rodando em paralelo. `env` acrescenta variáveis de
+    ambiente ao processo (ex.: a conta no modo --contas).
+    Retorna (sucesso, medidas) — medidas da etapa (metricas.py), com parede_s.
+    """
+    cabecalho = (f"\n{'='*60}\n"
+                 f"  [{label}] Executando {script}...\n"
+                 f"{'='*60}")
+    if not capturar:
+        print(cabecalho)
+
+    # O processo da etapa grava seus contadores, CPU e RSS aqui ao terminar
+    fd, arquivo_metricas = tempfile.mkstemp(prefix="metricas_", suffix=".json")
+    os.close(fd)
+
+    inicio = time.perf_counter()
+    result = subprocess.run(
+        [PYTHON, BASE / script],
+        check=False,
+        capture_output=capturar,
+        text=capturar,
+        encoding="utf-8" if capturar else None,
+        errors="replace" if capturar else None,
+        env={**os.environ, **(env or {}), "METRICAS_ARQUIVO": arquivo_metricas},
+    )
+    duracao = time.perf_counter() - inicio
+    medidas = {**metricas.ler_processo(arquivo_metricas), "parede_s": round(duracao, 3)}
+    os.unlink(arquivo_metricas)
+
+    if capturar:
+        print(cabecalho)
+        if result.stdout:
+            print(result.stdout, end="")
+        if result.stderr:
+            print(result.stderr, end="", file=sys.stderr)
+
     if result.returncode != 0:
-        print(f"[ERRO] {script} falhou (codigo {result.returncode}). Continuando...")
-        return False
-    return True
+        print(f"[ERRO] {script} falhou (codigo {result.returncode}) em {duracao:.1f}s. Continuando...")
+        return False, medidas
+    print(f"[OK] {script} concluido em {duracao:.1f}s")
+    return True, medidas
+
+
+class _SaidaPorThread:
+    """
+    Substitui sys.stdout/sys.stderr no modo --em-processo: cada thread pode
+    desviar o que imprime para um buffer próprio, as demais continuam
+    escrevendo no stream original. Threads abertas por uma etapa herdam o
+    buffer dela via metricas.propagar().
+    """
+
+    def __init__(self, original):
+        self._original = original
+        self._local = threading.local()
+
+    def _destino(self):
+        buffer = self.desvio()
+        return self._original if buffer is None else buffer
+
+    def write(self, texto):
+        return self._destino().write(texto)
+
+    def flush(self):
+        self._destino().flush()
+
+    def __getattr__(self, nome):
+        return getattr(self._original, nome)
+
+    def desvio(self):
+        return getattr(self._local, "buffer", None)
+
+    def desviar(self, buffer):
+        self._local.buffer = buffer
+
+
+def _instalar_saida_por_thread():
+    if not isinstance(sys.stdout, _SaidaPorThread):
+        sys.stdout = _SaidaPorThread(sys.stdout)
+        sys.stderr = _SaidaPorThread(sys.stderr)
+
+
+def run_em_processo(script, label, capturar=False):
+    """
+    Importa o script como módulo (uma vez só) e chama seu main() neste
+    mesmo processo. Exceções e sys.exit() ficam isolados na etapa.
+    Retorna (sucesso, medidas) — ver metricas.medir().
+    """
+    cabecalho = (f"\n{'='*60}\n"
+                 f"  [{label}] Executando {script} (em processo)...\n"
+                 f"{'='*60}")
+    buffer = io.StringIO() if capturar else None
+    if not capturar:
+        print(cabecalho)
+
+    _instalar_saida_por_thread()
+    sys.stdout.desviar(buffer)
+    sys.stderr.desviar(buffer)
+
+    ok = True
+    with metricas.medir() as medidas:
+        try:
+            modulo = importlib.import_module(Path(script).stem)
+            modulo.main()
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                print(f"[ERRO] {script} chamou sys.exit({e.code!r})")
+                ok = False
+        except Exception:
+            traceback.print_exc(file=sys.stdout)
+            ok = False
+        finally:
+            sys.stdout.desviar(None)
+            sys.stderr.desviar(None)
+    duracao = medidas["parede_s"]
+
+    if capturar:
+        print(cabecalho)
+        print(buffer.getvalue(), end="")
+
+    if not ok:
+        print(f"[ERRO] {script} falhou em {duracao:.1f}s. Continuando...")
+        return False, medidas
+    print(f"[OK] {script} concluido em {duracao:.1f}s")
+    return True, medidas
+
+
+def executar_grafo(scripts, workers, executor=run):
+    """
+    Executa os scripts respeitando as dependências, com no máximo `workers`
+    simultâneos. Um script roda assim que todas as suas dependências
+    terminaram (com sucesso ou não — os dashboards usam dados de amostra
+    quando um CSV falta).
+    `executor` é run (subprocesso) ou run_em_processo.
+    Retorna {script: (sucesso, medidas)}.
+    """
+    capturar   = workers > 1
+    pendentes  = list(scripts)
+    concluidos = set()
+    resultados = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        em_execucao = {}
+        while pendentes or em_execucao:
+            prontos = [s for s in pendentes if all(d in concluidos for d in s[2])]
+            for s in prontos:
+                pendentes.remove(s)
+                em_execucao[pool.submit(executor, s[0], s[1], capturar)] = s
+
+            if not em_execucao:
+                for script, _, deps in pendentes:
+                    faltando = [d for d in deps if d not in concluidos]
+                    print(f"[ERRO] {script} ignorado — dependencias nao executadas: {', '.join(faltando)}")
+                    resultados[script] = (False, {"parede_s": 0.0})
+                break
+
+            feitos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for fut in feitos:
+                script = em_execucao.pop(fut)[0]
+                resultados[script] = fut.result()
+                concluidos.add(script)
+
+    return resultados
+
+
+def abrir(alvo):
+    """Abre um arquivo ou URL no aplicativo padrão (os.startfile só existe no Windows)."""
+    if hasattr(os, "startfile"):
+        os.startfile(str(alvo))
+        return True
+    url = alvo if isinstance(alvo, str) else Path(alvo).resolve().as_uri()
+    return webbrowser.open(url)
+
+
+def _mb(valor):
+    return f"{valor / 2**20:.0f}" if valor else "-"
+
+
+def imprimir_tempos(scripts, resultados, total):
+    largura = max([24] + [len(label) for _, label, _ in scripts])
+    print(f"\n  {'Etapa':<{largura}} {'Status':<8} {'Tempo':>9} {'CPU':>8} {'RSS MB':>7} "
+          f"{'API':>6} {'Pags':>6} {'Linhas':>9} {'Grav MB':>8}")
+    print(f"  {'-'*(largura + 67)}")
+    for script, label, _ in scripts:
+        ok, m = resultados.get(script, (False, {}))
+        print(f"  {label:<{largura}} {'OK' if ok else 'ERRO':<8} {m.get('parede_s', 0.0):>8.1f}s "
+              f"{m.get('cpu_s', 0.0):>7.1f}s {_mb(m.get('rss_pico_bytes')):>7} "
+              f"{m.get('chamadas_api', 0):>6} {m.get('paginas_api', 0) + m.get('paginas_cache', 0):>6} "
+              f"{m.get('linhas_lidas', 0):>9} {m.get('bytes_gravados', 0) / 2**20:>8.2f}")
+    print(f"  {'-'*(largura + 67)}")
+    print(f"  {'Total (parede)':<{largura + 9}} {total:>8.1f}s")
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Pipeline completo Facebook Ads")
+    parser.add_argument("--paralelo", action="store_true",
+                        help="Executa os extratores 01-06 simultaneamente")
+    parser.add_argument("--workers", type=int, default=WORKERS_PADRAO,
+                        help=f"Scripts simultaneos no modo paralelo (padrao: {WORKERS_PADRAO})")
+    parser.add_argument("--em-processo", action="store_true",
+                        help="Chama o main() de cada script neste processo em vez de abrir um interpretador por etapa")
+    parser.add_argument("--consolidado", action="store_true",
+                        help="Uma unica consulta gera campanhas, cpv_diario e funil (substitui 01, 02 e 06)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Busca na API so os dias que faltam no armazem local (INSIGHTS_INCREMENTAL=1)")
+    parser.add_argument("--contas", nargs="?", const="", default=None, metavar="ARQUIVO",
+                        help="Multi-conta: contas do ARQUIVO, de FACEBOOK_AD_ACCOUNT_IDS ou de contas.txt")
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="Consulta a API mesmo com resposta valida no cache em disco (CACHE_INSIGHTS=0)")
+    parser.add_argument("--servir", action="store_true",
+                        help="Ao final sobe o servidor local dos dashboards (servidor.py) em vez de abrir o HTML")
+    parser.add_argument("--etapas", metavar="PREFIXOS",
+                        help="So as etapas cujos scripts comecam com estes prefixos, separados por virgula (ex.: 02,05,07)")
+    parser.add_argument("--sem-abrir", action="store_true",
+                        help="Nao abre o dashboard ao final (execucoes agendadas)")
+    args = parser.parse_args()
+
+    # Repassado pelo ambiente aos subprocessos (e lido pelo insights.py no modo em processo)
+    if args.incremental:
+        os.environ["INSIGHTS_INCREMENTAL"] = "1"
+    if args.sem_cache:
+        os.environ["CACHE_INSIGHTS"] = "0"
+
+    multi    = args.contas is not None
+    workers  = max(1, args.workers) if args.paralelo or multi else 1
+    executor = run_em_processo if args.em_processo else run
+    etapas   = montar_etapas(args.consolidado)
+    if args.etapas:
+        etapas = filtrar_etapas(etapas, [p.strip() for p in args.etapas.split(",") if p.strip()])
+        if not etapas:
+            print(f"[ERRO] Nenhuma etapa corresponde a --etapas {args.etapas}.")
+            sys.exit(1)
+
+    if multi:
+        lista = contas.carregar(args.contas or None)
+        if not lista:
+            print("[ERRO] Nenhuma conta encontrada (arquivo, FACEBOOK_AD_ACCOUNT_IDS ou contas.txt).")
+            sys.exit(1)
+        if args.em_processo:
+            # config.py cria um único `account` por processo
+            print("[AVISO] --em-processo ignorado no modo --contas (uma conta por subprocesso).")
+        if args.servir:
+            print("[AVISO] --servir ignorado no modo --contas (o servidor atende 07 e 09 de uma conta).")
+            args.servir = False
+        contas.salvar_manifesto(lista)
+        etapas   = etapas_por_conta(lista, etapas)
+        executor = run_conta
+
+    modo = (f"{'paralelo (' + str(workers) + ' workers)' if workers > 1 else 'sequencial'}"
+            f"{' · em processo' if args.em_processo and not multi else ''}"
+            f"{' · consolidado' if args.consolidado else ''}"
+            f"{' · incremental' if args.incremental else ''}"
+            f"{' · sem cache' if args.sem_cache else ''}"
+            f"{' · etapas ' + args.etapas if args.etapas else ''}"
+            f"{f' · {len(lista)} contas' if multi else ''}")
     print("Facebook Ads — Pipeline completo")
-    print(f"Diretorio: {BASE}\n")
+    print(f"Diretorio: {BASE}")
+    print(f"Modo: {modo}\n")
+
+    comeco = datetime.now()
+    inicio = time.perf_counter()
+    resultados = executar_grafo(etapas, workers, executor)
+    total = time.perf_counter() - inicio
 
-    ok = 0
-    for script, label in SCRIPTS:
-        if run(script, label):
-            ok += 1
+    ok = sum(1 for sucesso, _ in resultados.values() if sucesso)
 
-    dashboard = BASE / "dashboard.html"
+    dashboard = contas.DIR_CONTAS / "dashboard_contas.html" if multi else BASE / "dashboard.html"
     print(f"\n{'='*60}")
-    print(f"  Concluido: {ok}/{len(SCRIPTS)} scripts com sucesso")
+    print(f"  Concluido: {ok}/{len(etapas)} scripts com sucesso")
     print(f"{'='*60}")
+    imprimir_tempos(etapas, resultados, total)
+
+    manifesto = metricas.montar_manifesto(etapas, resultados, comeco, total, modo)
+    metricas.gravar_manifesto(manifesto)
+    print(f"\n[OK] Manifesto da execucao: {metricas.MANIFESTO}"
+          f"{' · ' + metricas.PROMETHEUS if metricas.PROMETHEUS else ''}")
 
-    if dashboard.exists():
+    if args.servir:
+        import servidor
+        print()
+        servidor.servir(ao_iniciar=abrir)
+    elif args.sem_abrir:
+        pass
+    elif dashboard.exists():
         print(f"\nAbrindo {dashboard.name}...")
-        os.startfile(str(dashboard))
+        if not abrir(dashboard):
+            print(f"[AVISO] Nenhum navegador disponivel — abra {dashboard} manualmente.")
     else:
-        print("\n[AVISO] dashboard.html nao foi gerado.")
+        print(f"\n[AVISO] {dashboard.name} nao foi gerado.")
 
 if __name__ == "__main__":
     main()
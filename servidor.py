@@ -0,0 +1,335 @@
+"""
+servidor.py
+Servidor HTTP local dos dashboards 07 e 09. As páginas e os JSONs são
+montados em memória a partir dos CSVs (uma vez por versão dos dados) e
+compartilhados por todos os visitantes; quando os dados mudam, os
+navegadores abertos são avisados por Server-Sent Events e se recarregam —
+sem regravar dashboard.html / dashboard_ceo.html.
+
+Rotas:
+  GET  /dashboard, /ceo          página completa (com modelos/aovivo.js)
+  GET  /api/<painel>             KPIs + dados de todos os gráficos
+  GET  /api/<painel>/<grafico>   um gráfico só (ex.: /api/dashboard/cpv,
+                                 /api/ceo/funil_total) ou /kpis
+  GET  /eventos                  SSE: evento "versao" com {painel: versão}
+  POST /atualizar                relê os CSVs e avisa os navegadores (com
+                                 SERVIDOR_TOKEN, só com o cabeçalho
+                                 X-Servidor-Token; sem token, só quando o
+                                 servidor escuta em loopback)
+
+Respostas com ETag (304 quando o navegador já tem a versão) e gzip quando
+aceito. A versão leva um prefixo sorteado a cada início do servidor, então
+uma página ou ETag guardada de uma execução anterior nunca casa com a atual;
+o corpo gzip e o sem compressão têm ETags distintas. O 08_agendamento.py chama notificar() ao fim de cada execução; sem
+servidor no ar a chamada é ignorada.
+
+Uso:
+  python servidor.py                          → http://127.0.0.1:8780
+  python servidor.py --host 0.0.0.0 --porta 9000
+  python run_all.py --servir                  → pipeline e, em seguida, o servidor
+
+Variáveis de ambiente (.env):
+  SERVIDOR_HOST   interface de escuta (padrão 127.0.0.1)
+  SERVIDOR_PORTA  porta (padrão 8780)
+  SERVIDOR_URL    endereço usado por notificar() (padrão http://127.0.0.1:<porta>)
+  SERVIDOR_TOKEN  segredo exigido em POST /atualizar (obrigatório para aceitar
+                  POSTs fora de 127.0.0.1; notificar() o envia)
+"""
+
+import argparse
+import gzip
+import hashlib
+import importlib
+import ipaddress
+import json
+import os
+import secrets
+import sys
+import threading
+import traceback
+import urllib.error
+import urllib.request
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import modelos
+
+HOST  = os.getenv("SERVIDOR_HOST", "127.0.0.1")
+PORTA = int(os.getenv("SERVIDOR_PORTA", "8780"))
+URL   = os.getenv("SERVIDOR_URL") or f"http://127.0.0.1:{PORTA}"
+TOKEN = os.getenv("SERVIDOR_TOKEN") or None
+
+CABECALHO_TOKEN = "X-Servidor-Token"
+
+# painel → módulo com painel(ao_vivo) -> (kpis, gráficos, html)
+PAINEIS = {
+    "dashboard": "07_dashboard",
+    "ceo":       "09_dashboard_ceo",
+}
+
+PING_SEGUNDOS = 15        # comentário SSE para manter a conexão viva
+GZIP_MINIMO   = 1024      # bytes; respostas menores vão sem compressão
+
+
+# ─────────────────────────────────────────────
+# RESPOSTAS EM MEMÓRIA
+# ─────────────────────────────────────────────
+
+class Resposta:
+    """Corpo pronto de uma rota (e a versão gzip), montado uma vez por versão."""
+
+    def __init__(self, corpo, tipo, versao):
+        self.corpo = corpo.encode("utf-8")
+        self.gz    = gzip.compress(self.corpo, 6) if len(self.corpo) >= GZIP_MINIMO else None
+        self.tipo  = tipo
+        self.etag    = f'"{versao}"'
+        self.etag_gz = f'"{versao}-gz"'
+
+
+class Paineis:
+    """
+    Estado do servidor: {rota: Resposta} e a versão de cada painel. Uma
+    recarga monta tudo à parte e troca o dicionário de uma vez, então quem
+    está lendo nunca vê uma versão pela metade. Um painel cujos dados não
+    mudaram (nem os templates em modelos/), ou que falha na recarga, continua
+    com a versão anterior (e os navegadores dele não recarregam).
+    """
+
+    def __init__(self):
+        self.rotas   = {}
+        self.versoes = {}
+        self._assinaturas = {}
+        self._inicio   = secrets.token_hex(4)     # versões de outra execução nunca se repetem
+        self._contador = 0
+        self._recarga  = threading.Lock()
+        self._mudou    = threading.Condition()
+
+    def recarregar(self):
+        with self._recarga:
+            self._contador += 1
+            rotas, versoes = dict(self.rotas), dict(self.versoes)
+            for nome, modulo in PAINEIS.items():
+                versao = f"{self._inicio}-{self._contador}"
+                try:
+                    kpis, graficos, html = importlib.import_module(modulo).painel(
+                        ao_vivo={"painel": nome, "versao": versao})
+                except Exception:
+                    print(f"[ERRO] Falha ao montar o painel '{nome}' — mantida a versão anterior.")
+                    traceback.print_exc()
+                    continue
+                # Dados e templates: editar modelos/ também gera uma versão nova
+                assinatura = hashlib.sha1(
+                    (modelos.json_dados([kpis, graficos]) + repr(modelos.assinatura())).encode("utf-8")
+                ).hexdigest()
+                if assinatura == self._assinaturas.get(nome):
+                    continue
+                self._assinaturas[nome] = assinatura
+                rotas.update(_rotas(nome, kpis, graficos, html, versao))
+                versoes[nome] = versao
+
+            with self._mudou:
+                self.rotas, self.versoes = rotas, versoes
+                self._mudou.notify_all()
+            return versoes
+
+    def esperar(self, versoes, timeout):
+        """Bloqueia até as versões mudarem (ou `timeout`); devolve as atuais."""
+        with self._mudou:
+            self._mudou.wait_for(lambda: self.versoes != versoes, timeout)
+            return self.versoes
+
+
+def _rotas(nome, kpis, graficos, html, versao):
+    rotas = {f"/{nome}": Resposta(html, "text/html; charset=utf-8", versao)}
+    json_tipo = "application/json; charset=utf-8"
+    rotas[f"/api/{nome}"] = Resposta(
+        modelos.json_dados({"versao": versao, "kpis": kpis, "graficos": graficos}),
+        json_tipo, versao)
+    for chave, valor in {"kpis": kpis, **graficos}.items():
+        rotas[f"/api/{nome}/{chave}"] = Resposta(modelos.json_dados(valor), json_tipo, versao)
+    return rotas
+
+
+# ─────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────
+
+def _etags(cabecalho):
+    """ETags de um If-None-Match ("a", W/"b", ...); fracas comparadas pelo valor."""
+    return {e.strip().removeprefix("W/") for e in (cabecalho or "").split(",") if e.strip()}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version   = "FacebookAdsDashboards"
+    paineis = None        # Paineis, definido em servir()
+
+    def log_message(self, formato, *args):
+        pass              # uma linha por requisição seria ruído com vários navegadores
+
+    def do_GET(self):
+        rota = urlsplit(self.path).path.rstrip("/") or "/"
+        if rota == "/":
+            return self._redirecionar("/dashboard")
+        if rota == "/eventos":
+            return self._eventos()
+
+        resposta = self.paineis.rotas.get(rota)
+        if resposta is None:
+            return self._json(HTTPStatus.NOT_FOUND, {"erro": f"rota desconhecida: {rota}"})
+
+        usar_gz = resposta.gz is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = resposta.etag_gz if usar_gz else resposta.etag
+        if etag in _etags(self.headers.get("If-None-Match")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        corpo = resposta.corpo
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", resposta.tipo)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if usar_gz:
+            corpo = resposta.gz
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip("/") != "/atualizar":
+            return self._json(HTTPStatus.NOT_FOUND, {"erro": "use POST /atualizar"})
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        recusa = self._recusa_post()
+        if recusa:
+            return self._json(*recusa)
+        versoes = self.paineis.recarregar()
+        print(f"[OK] Dados recarregados — versões {versoes}")
+        self._json(HTTPStatus.OK, {"versoes": versoes})
+
+    def _recusa_post(self):
+        """(status, corpo) se o POST não pode ser aceito, senão None."""
+        if TOKEN:
+            enviado = self.headers.get(CABECALHO_TOKEN, "")
+            if not secrets.compare_digest(enviado.encode("utf-8"), TOKEN.encode("utf-8")):
+                return HTTPStatus.UNAUTHORIZED, {"erro": f"{CABECALHO_TOKEN} ausente ou inválido"}
+            return None
+        if not _loopback(self.server.server_address[0]):
+            return HTTPStatus.FORBIDDEN, {
+                "erro": "defina SERVIDOR_TOKEN para aceitar POST fora de 127.0.0.1"}
+        return None
+
+    def _json(self, status, valor):
+        corpo = json.dumps(valor, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _redirecionar(self, destino):
+        self.send_response(HTTPStatus.FOUND)
+        self.send_header("Location", destino)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _eventos(self):
+        """Stream SSE: as versões atuais na conexão e a cada recarga."""
+        self.close_connection = True
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        versoes = None
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            while True:
+                atuais = self.paineis.esperar(versoes, PING_SEGUNDOS)
+                if atuais != versoes:
+                    versoes = atuais
+                    texto = f"event: versao\ndata: {json.dumps(versoes)}\n\n"
+                else:
+                    texto = ": ping\n\n"
+                self.wfile.write(texto.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass            # navegador fechado
+
+
+# ─────────────────────────────────────────────
+# SERVIR / NOTIFICAR
+# ─────────────────────────────────────────────
+
+def _loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def servir(host=HOST, porta=PORTA, ao_iniciar=None):
+    """Monta os painéis e atende até Ctrl+C. `ao_iniciar(url)` roda já no ar."""
+    paineis = Paineis()
+    print("Montando os painéis...")
+    paineis.recarregar()
+
+    Handler.paineis = paineis
+    servidor = ThreadingHTTPServer((host, porta), Handler)
+    servidor.daemon_threads = True
+    url = f"http://{'127.0.0.1' if host in ('', '0.0.0.0') else host}:{porta}"
+    print(f"[OK] Servindo em {url}/dashboard e {url}/ceo  (Ctrl+C encerra)")
+    if not TOKEN and not _loopback(servidor.server_address[0]):
+        print(f"[AVISO] Escutando em {host or 'todas as interfaces'} sem SERVIDOR_TOKEN — "
+              "POST /atualizar recusado (as páginas seguem no ar).")
+    if ao_iniciar:
+        ao_iniciar(url + "/dashboard")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+    finally:
+        servidor.server_close()
+
+
+def notificar(url=URL, timeout=30):
+    """
+    Pede ao servidor em `url` que releia os dados. Devolve as versões novas,
+    ou None se não houver servidor no ar.
+    """
+    cabecalhos = {CABECALHO_TOKEN: TOKEN} if TOKEN else {}
+    pedido = urllib.request.Request(url.rstrip("/") + "/atualizar", data=b"",
+                                    headers=cabecalhos, method="POST")
+    try:
+        with urllib.request.urlopen(pedido, timeout=timeout) as resposta:
+            return json.loads(resposta.read())["versoes"]
+    except (urllib.error.URLError, OSError, ValueError, KeyError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local dos dashboards com recarga ao vivo")
+    parser.add_argument("--host", default=HOST, help=f"Interface (padrao: {HOST})")
+    parser.add_argument("--porta", type=int, default=PORTA, help=f"Porta (padrao: {PORTA})")
+    args = parser.parse_args()
+    servir(args.host, args.porta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+sessao.py
+Sessão HTTP do SDK ajustada para paginação longa: pool de conexões
+reaproveitadas (keep-alive, sem renegociar TLS a cada página), timeouts
+explícitos, respostas comprimidas e repetição de conexões que não abriram.
+
+instalar(api) é chamado em config.py sobre a instância do ApiComLimite, então
+vale para todos os extratores, para o cursor de paginação e para os lotes.
+
+Repetição: uma camada só, a do limites.py (erros da API, 5xx, timeouts e
+quedas de conexão), que conta cada tentativa nas métricas e no ritmo. O
+adaptador repete apenas falhas ao abrir a conexão — a requisição nem saiu,
+então não há chamada à API a contar nem risco de duplicar um POST.
+
+Variáveis de ambiente (.env):
+  SESSAO_POOL              conexões mantidas por host (padrão 16)
+  SESSAO_TIMEOUT_CONEXAO   segundos para conectar (padrão 10)
+  SESSAO_TIMEOUT_LEITURA   segundos aguardando resposta (padrão 120)
+  SESSAO_RETRIES           novas tentativas de abrir a conexão (padrão 3)
+  SESSAO_KEEPALIVE         "1" liga TCP keep-alive nos sockets (padrão "1")
+"""
+
+import os
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+POOL             = int(os.getenv("SESSAO_POOL", "16"))
+TIMEOUT_CONEXAO  = float(os.getenv("SESSAO_TIMEOUT_CONEXAO", "10"))
+TIMEOUT_LEITURA  = float(os.getenv("SESSAO_TIMEOUT_LEITURA", "120"))
+RETRIES          = int(os.getenv("SESSAO_RETRIES", "3"))
+KEEPALIVE        = os.getenv("SESSAO_KEEPALIVE", "1").strip().lower() in ("1", "true", "sim")
+
+TIMEOUT = (TIMEOUT_CONEXAO, TIMEOUT_LEITURA)
+
+# Sondas TCP para conexões ociosas entre páginas/consultas de status
+OPCOES_KEEPALIVE = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+for _nome, _valor in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+    if hasattr(socket, _nome):
+        OPCOES_KEEPALIVE.append((socket.IPPROTO_TCP, getattr(socket, _nome), _valor))
+
+
+class AdaptadorGraph(HTTPAdapter):
+    """HTTPAdapter com pool dimensionado e TCP keep-alive."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        if KEEPALIVE:
+            kwargs["socket_options"] = HTTPConnection.default_socket_options + OPCOES_KEEPALIVE
+        super().init_poolmanager(*args, **kwargs)
+
+
+def criar_adaptador(pool=POOL, retries=RETRIES):
+    # Só a abertura da conexão: leitura, status e o resto ficam com o
+    # limites.py, senão uma chamada com falha seria repetida nas duas camadas
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.5,
+        raise_on_status=False,
+    )
+    return AdaptadorGraph(pool_connections=pool, pool_maxsize=pool, max_retries=retry)
+
+
+def instalar(api, pool=POOL, retries=RETRIES):
+    """Monta o adaptador e os cabeçalhos na sessão requests do `api`."""
+    sessao = api._session.requests
+    adaptador = criar_adaptador(pool, retries)
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    sessao.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection":      "keep-alive",
+    })
+    api._session.timeout = TIMEOUT
+    return api
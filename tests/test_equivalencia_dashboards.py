@@ -0,0 +1,247 @@
+"""
+test_equivalencia_dashboards.py
+Equivalência entre a montagem de dados vetorizada dos dashboards (07 e 09) e
+as implementações originais com iterrows/apply, sobre os mesmos CSVs.
+
+As referências abaixo são cópias das versões anteriores à vetorização; cada
+teste grava os CSVs de um cenário num diretório temporário, aponta o
+dados.SAIDA_DIR para ele e compara os resultados.
+
+Rodar (na raiz do projeto):
+  python -m unittest discover tests
+"""
+
+import csv
+import importlib
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+try:
+    import pandas as pd
+    PANDAS_OK = True
+except ImportError:
+    PANDAS_OK = False
+
+if PANDAS_OK:
+    import dados
+    painel = importlib.import_module("07_dashboard")
+    ceo    = importlib.import_module("09_dashboard_ceo")
+
+
+# ─────────────────────────────────────────────
+# REFERÊNCIAS (implementações originais)
+# ─────────────────────────────────────────────
+
+def _ref_scatter(camp):
+    return [{"x": round(float(r["ctr"]), 3),
+             "y": round(float(r["cpv"]), 5),
+             "label": r["campanha"]}
+            for _, r in camp.iterrows()]
+
+
+def _ref_idade_genero(ig):
+    idades  = ig["idade"].unique().tolist()
+    generos = ig["genero"].unique().tolist()
+    series = []
+    for gen in generos:
+        sub = ig[ig["genero"] == gen].set_index("idade")
+        series.append([float(sub.loc[i, "gasto"]) if i in sub.index else 0 for i in idades])
+    return idades, generos, series
+
+
+def _ref_identificar_tipo(nome):
+    n = str(nome).lower()
+    if "remarketing" in n or "retarget" in n: return "Remarketing"
+    if "lal" in n or "lookalike" in n:        return "Prospecting LAL"
+    if "brand" in n or "awareness" in n:      return "Brand Awareness"
+    if "video" in n:                          return "Video Views"
+    if "lead" in n:                           return "Lead Generation"
+    return "Outros"
+
+
+def _ref_imersoes(df):
+    df = df.copy()
+    df["imersao"] = df["campanha"].str.extract(
+        r'(Imer[sS][aã][oO]\s+\S+)', expand=False
+    ).fillna("Campanha Atual")
+    g = df.groupby("imersao").agg(
+        gasto=("gasto", "sum"),
+        compras=("conversoes", "sum"),
+        cliques=("cliques", "sum"),
+    ).reset_index()
+    if g["gasto"].sum() > 100:
+        rows = []
+        for _, r in g.iterrows():
+            rows.append({
+                "imersao":        r["imersao"],
+                "gasto":          float(r["gasto"]),
+                "leads":          int(r["compras"] * 8.5),
+                "page_views":     int(r["compras"] * 3.8),
+                "checkouts":      int(r["compras"] * 1.3),
+                "compras":        int(r["compras"]),
+                "receita_direta": int(r["compras"]) * ceo.TICKET_MEDIO,
+            })
+        return rows
+    return ceo._amostra_imersoes()
+
+
+def _ref_tipos(df):
+    df = df.copy()
+    df["tipo"] = df["campanha"].apply(_ref_identificar_tipo)
+    g = df.groupby("tipo").agg(
+        gasto=("gasto", "sum"),
+        compras=("conversoes", "sum"),
+        leads=("cliques", "sum"),
+    ).reset_index()
+    return g.to_dict("records")
+
+
+def _ref_desperdicio(df):
+    waste = df[df["conversoes"] == 0].sort_values("gasto", ascending=False).head(15)
+    if len(waste) > 0:
+        return [
+            {"campanha": r["campanha"], "gasto": float(r["gasto"]),
+             "compras": 0, "leads": int(r.get("cliques", 0))}
+            for _, r in waste.iterrows()
+        ]
+    return ceo._amostra_desperdicio()
+
+
+# ─────────────────────────────────────────────
+# CENÁRIOS (CSVs)
+# ─────────────────────────────────────────────
+
+IDADES  = ["18-24", "25-34", "35-44", "45-54", "55-64", "65+"]
+GENEROS = ["male", "female", "unknown"]
+
+
+def _cenario_pequeno():
+    """Poucas campanhas, empates de arredondamento e combinações ausentes."""
+    campanhas = [
+        ("Imersao Jan/25 - Remarketing 7d", 2228.9, 82051, 1355, 1.6514, 0.087521, 68),
+        ("Imersao Jan/25 - LAL 1pct",       2060.55, 80334, 1404, 1.7475, 0.079675, 0),
+        ("ImersãO Fev/25 - Video Views",    1500.0, 60000, 300, 0.5, 0.0125, 3),
+        ("Brand Awareness - Wide",          980.125, 91000, 210, 0.2305, 0.000015, 0),
+        ("Lead Gen - Cadastro",             1250.0, 30000, 1200, 4.0, 0.049995, 90),
+        ("Retarget Carrinho",               0.0, 0, 0, 0.0, 0.0, 0),
+    ]
+    idade_genero = [
+        ("18-24", "male", 120.5, 4000, 80), ("18-24", "female", 99.0, 3800, 70),
+        ("25-34", "female", 340.25, 9000, 200),
+        ("35-44", "male", 210.0, 7000, 140), ("35-44", "unknown", 12.0, 300, 4),
+    ]
+    return campanhas, idade_genero
+
+
+def _cenario_sintetico(n=400, semente=7):
+    """Muitas campanhas com nomes, tipos e imersões variados (semente fixa)."""
+    rnd = random.Random(semente)
+    meses = ["Jan/25", "Fev/25", "Mar/25", "Abr/25"]
+    partes = ["Remarketing 7d", "LAL 1pct Compradores", "Lookalike 3pct", "Brand",
+              "Awareness Reels", "Video Views", "Lead Form", "Interesse Coaches",
+              "Broad 25-44", "Retargeting 30d"]
+    campanhas = []
+    for i in range(n):
+        prefixo = f"Imersao {rnd.choice(meses)} - " if rnd.random() < 0.7 else ""
+        impressoes = rnd.randint(0, 200_000)
+        cliques = rnd.randint(0, impressoes // 50 + 1)
+        campanhas.append((
+            f"{prefixo}{rnd.choice(partes)} #{i}",
+            round(rnd.uniform(0, 3000), 2), impressoes, cliques,
+            round(cliques / impressoes * 100, 4) if impressoes else 0.0,
+            round(rnd.uniform(0, 0.2), 6),
+            rnd.choice([0, 0, rnd.randint(1, 120)]),
+        ))
+    idade_genero = [
+        (i, g, round(rnd.uniform(0, 900), 2), rnd.randint(0, 40_000), rnd.randint(0, 800))
+        for i in IDADES for g in GENEROS if rnd.random() < 0.8
+    ]
+    return campanhas, idade_genero
+
+
+def _gravar(diretorio, nome, colunas, linhas):
+    with open(Path(diretorio) / nome, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(colunas)
+        writer.writerows(linhas)
+
+
+# ─────────────────────────────────────────────
+# TESTES
+# ─────────────────────────────────────────────
+
+@unittest.skipUnless(PANDAS_OK, "pandas não instalado")
+class EquivalenciaDashboards(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saida_original = dados.SAIDA_DIR
+        dados.SAIDA_DIR = Path(self._tmp.name)
+        dados.limpar_cache()
+
+    def tearDown(self):
+        dados.SAIDA_DIR = self._saida_original
+        dados.limpar_cache()
+        self._tmp.cleanup()
+
+    def _preparar(self, cenario):
+        campanhas, idade_genero = cenario
+        _gravar(self._tmp.name, "campanhas.csv", list(dados.SCHEMAS["campanhas.csv"]), campanhas)
+        _gravar(self._tmp.name, "idade_genero.csv", list(dados.SCHEMAS["idade_genero.csv"]),
+                idade_genero)
+
+    def _comparar_07(self):
+        entrada = painel.carregar_dados()
+        payload = painel.montar_dados(entrada)
+
+        scatter = payload["scatter"]
+        pontos = [{"x": x, "y": y, "label": label}
+                  for x, y, label in zip(scatter["ctr"], scatter["cpv"], scatter["campanhas"])]
+        self.assertEqual(pontos, _ref_scatter(entrada["campanhas"]))
+
+        idades, generos, series = _ref_idade_genero(entrada["idade_genero"])
+        ig = payload["idade_genero"]
+        self.assertEqual((ig["idades"], ig["generos"]), (idades, generos))
+        self.assertEqual(ig["gasto"], series)
+
+    def _comparar_09(self):
+        df = dados.ler_csv("campanhas.csv")
+        self.assertEqual(ceo.load_imersoes(), _ref_imersoes(df))
+        self.assertEqual(ceo.load_tipos(), _ref_tipos(df))
+        self.assertEqual(ceo.load_desperdicio(), _ref_desperdicio(df))
+
+    def test_07_cenario_pequeno(self):
+        self._preparar(_cenario_pequeno())
+        self._comparar_07()
+
+    def test_07_cenario_sintetico(self):
+        self._preparar(_cenario_sintetico())
+        self._comparar_07()
+
+    def test_07_amostra(self):
+        # Sem CSVs: os dados de amostra do próprio 07
+        self._comparar_07()
+
+    def test_09_cenario_pequeno(self):
+        self._preparar(_cenario_pequeno())
+        self._comparar_09()
+
+    def test_09_cenario_sintetico(self):
+        self._preparar(_cenario_sintetico())
+        self._comparar_09()
+
+    def test_09_sem_desperdicio(self):
+        campanhas, idade_genero = _cenario_pequeno()
+        self._preparar(([c[:-1] + (5,) for c in campanhas], idade_genero))
+        self._comparar_09()
+
+
+if __name__ == "__main__":
+    unittest.main()
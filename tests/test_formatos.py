@@ -0,0 +1,66 @@
+"""
+test_formatos.py
+Classificação de lookalike: o tipo de campanha (07/09) e o tipo de público
+(11_publicos.py) usam a mesma regra (formatos.RE_LOOKALIKE).
+
+Rodar (na raiz do projeto):
+  python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import formatos
+
+try:
+    import pandas as pd
+    PANDAS_OK = True
+except ImportError:
+    PANDAS_OK = False
+
+# nome → é lookalike?
+NOMES_LOOKALIKE = {
+    "LAL 1pct Compradores":      True,
+    "Lal5":                      True,
+    "LAL1pct":                   True,
+    "Prospecting - lal_3pct":    True,
+    "Lookalike 3pct Engajamento": True,
+    "Público semelhante 2%":     True,
+    "bilalXYZ":                  False,
+    "Campanha Bilal":            False,
+    "Interesse Empreendedorismo": False,
+    "Broad 25-44":               False,
+}
+
+
+class Lookalike(unittest.TestCase):
+
+    def test_lookalike(self):
+        for nome, esperado in NOMES_LOOKALIKE.items():
+            with self.subTest(nome=nome):
+                self.assertEqual(formatos.lookalike(nome), esperado)
+
+    def test_tipo_campanha_concorda_com_lookalike(self):
+        for nome, esperado in NOMES_LOOKALIKE.items():
+            with self.subTest(nome=nome):
+                self.assertEqual(formatos.tipo_campanha(nome) == "Prospecting LAL", esperado)
+
+    @unittest.skipUnless(PANDAS_OK, "pandas não instalado")
+    def test_tipos_campanha_vetorizado(self):
+        nomes = pd.Series(list(NOMES_LOOKALIKE))
+        tipos = formatos.Classificador(formatos.REGRAS_TIPO).classificar(nomes)
+        self.assertEqual((tipos == "Prospecting LAL").tolist(), list(NOMES_LOOKALIKE.values()))
+
+    def test_regra_de_arquivo_com_lookalike(self):
+        classificador = formatos.Classificador([("LAL", (formatos.PALAVRA_LOOKALIKE, "parecido"))])
+        self.assertEqual([classificador.tipo(n) for n in ("Lal5", "bilal", "Publico parecido")],
+                         ["LAL", formatos.TIPO_PADRAO, "LAL"])
+
+
+if __name__ == "__main__":
+    unittest.main()